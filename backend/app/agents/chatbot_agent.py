@@ -2,8 +2,12 @@
 LangGraph 챗봇 Agent
 워크플로우 조립 및 실행
 """
-from typing import Dict, Any, Iterator
+import asyncio
+import queue
+import threading
+from typing import Dict, Any, Iterator, AsyncIterator, Callable, Optional
 from langgraph.graph import StateGraph, END
+from langgraph.utils.runnable import RunnableCallable
 from app.agents.graph_state import GraphState
 from app.agents.nodes import (
     QueryAnalysisNode,
@@ -26,11 +30,15 @@ class ChatbotAgent:
         # StateGraph 생성
         workflow = StateGraph(GraphState)
 
-        # 노드 추가
-        workflow.add_node("query_analysis", QueryAnalysisNode.execute)
-        workflow.add_node("data_retrieval", DataRetrievalNode.execute)
-        workflow.add_node("response_generation", ResponseGenerationNode.execute)
-        workflow.add_node("quality_check", QualityCheckNode.execute)
+        # 노드 추가 (동기 execute / 비동기 aexecute 모두 등록 → invoke, ainvoke 공용 그래프)
+        nodes = {
+            "query_analysis": QueryAnalysisNode,
+            "data_retrieval": DataRetrievalNode,
+            "response_generation": ResponseGenerationNode,
+            "quality_check": QualityCheckNode
+        }
+        for name, node in nodes.items():
+            workflow.add_node(name, RunnableCallable(node.execute, node.aexecute, name=name))
 
         # 엣지 설정
         workflow.set_entry_point("query_analysis")
@@ -93,7 +101,60 @@ class ChatbotAgent:
         Returns:
             응답 데이터
         """
-        # 메모리 매니저 가져오기
+        memory_manager, memory_context = self._prepare_memory(query, user_id, conversation_id)
+        initial_state = self._build_initial_state(
+            query, user_id, conversation_id, custom_prompt, llm_config, memory_context
+        )
+
+        try:
+            # 워크플로우 실행
+            final_state = self.graph.invoke(initial_state)
+            return self._build_result(final_state, memory_manager)
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "progress": []
+            }
+
+    async def ainvoke(
+        self,
+        query: str,
+        user_id: str = None,
+        conversation_id: str = None,
+        custom_prompt: str = None,
+        llm_config: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        챗봇 실행 (비동기)
+        LLM / DB 호출을 await하므로 이벤트 루프 하나로 여러 요청을 동시에 처리
+
+        Returns:
+            응답 데이터 (invoke와 동일)
+        """
+        # 메모리 매니저는 동기 I/O를 사용하므로 스레드에서 실행
+        memory_manager, memory_context = await asyncio.to_thread(
+            self._prepare_memory, query, user_id, conversation_id
+        )
+        initial_state = self._build_initial_state(
+            query, user_id, conversation_id, custom_prompt, llm_config, memory_context
+        )
+
+        try:
+            final_state = await self.graph.ainvoke(initial_state)
+            return await asyncio.to_thread(self._build_result, final_state, memory_manager)
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "progress": []
+            }
+
+    @staticmethod
+    def _prepare_memory(query: str, user_id: Optional[str], conversation_id: Optional[str]) -> tuple:
+        """메모리 매니저 준비 및 사용자 메시지 추가 → (memory_manager, memory_context)"""
         memory_manager = None
         if user_id and conversation_id:
             memory_manager = get_memory_manager(user_id, conversation_id)
@@ -103,9 +164,20 @@ class ChatbotAgent:
 
         # 메모리 컨텍스트 생성
         memory_context = memory_manager.get_full_context() if memory_manager else None
+        return memory_manager, memory_context
 
-        # 초기 상태
-        initial_state: GraphState = {
+    @staticmethod
+    def _build_initial_state(
+        query: str,
+        user_id: Optional[str],
+        conversation_id: Optional[str],
+        custom_prompt: Optional[str],
+        llm_config: Optional[Dict[str, Any]],
+        memory_context: Optional[str] = None,
+        token_callback: Optional[Callable[[str], None]] = None
+    ) -> GraphState:
+        """그래프 초기 상태 생성"""
+        return {
             "query": query,
             "user_id": user_id,
             "conversation_id": conversation_id,
@@ -113,62 +185,55 @@ class ChatbotAgent:
             "llm_config": llm_config or {},
             "memory_context": memory_context,
             "classification": None,
+            "speculative_vectordb": None,
             "retrieved_documents": [],
             "mongodb_results": [],
             "vectordb_results": [],
             "response": None,
+            "token_callback": token_callback,
             "progress": [],
             "error": None
         }
 
-        try:
-            # 워크플로우 실행
-            final_state = self.graph.invoke(initial_state)
-
-            # 결과 추출
-            response_data = final_state.get("response")
+    @staticmethod
+    def _build_result(final_state: Dict[str, Any], memory_manager) -> Dict[str, Any]:
+        """최종 상태에서 응답 데이터 추출 (메모리 저장 포함)"""
+        response_data = final_state.get("response")
+
+        if response_data:
+            # Assistant 응답 메모리에 추가
+            if memory_manager:
+                memory_manager.add_message(
+                    "assistant",
+                    response_data.content,
+                    metadata={
+                        "sources": response_data.sources,
+                        "confidence_score": response_data.confidence_score
+                    }
+                )
+
+                # 주기적으로 중요 정보 저장 (메시지가 10개 이상일 때)
+                messages = memory_manager.conversation_memory.get_messages()
+                if len(messages) >= 10:
+                    saved_count = memory_manager.save_conversation_memories()
+                    if saved_count > 0:
+                        print(f"✓ {saved_count}개의 중요 정보를 장기 메모리에 저장했습니다")
 
-            if response_data:
-                # Assistant 응답 메모리에 추가
-                if memory_manager:
-                    memory_manager.add_message(
-                        "assistant",
-                        response_data.content,
-                        metadata={
-                            "sources": response_data.sources,
-                            "confidence_score": response_data.confidence_score
-                        }
-                    )
-
-                    # 주기적으로 중요 정보 저장 (메시지가 10개 이상일 때)
-                    messages = memory_manager.conversation_memory.get_messages()
-                    if len(messages) >= 10:
-                        saved_count = memory_manager.save_conversation_memories()
-                        if saved_count > 0:
-                            print(f"✓ {saved_count}개의 중요 정보를 장기 메모리에 저장했습니다")
-
-                return {
-                    "success": True,
-                    "content": response_data.content,
-                    "sources": response_data.sources,
-                    "confidence_score": response_data.confidence_score,
-                    "table_data": response_data.table_data,
-                    "chart_data": response_data.chart_data,
-                    "warnings": response_data.warnings,
-                    "progress": final_state.get("progress", [])
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "응답 생성 실패",
-                    "progress": final_state.get("progress", [])
-                }
-
-        except Exception as e:
+            return {
+                "success": True,
+                "content": response_data.content,
+                "sources": response_data.sources,
+                "confidence_score": response_data.confidence_score,
+                "table_data": response_data.table_data,
+                "chart_data": response_data.chart_data,
+                "warnings": response_data.warnings,
+                "progress": final_state.get("progress", [])
+            }
+        else:
             return {
                 "success": False,
-                "error": str(e),
-                "progress": []
+                "error": "응답 생성 실패",
+                "progress": final_state.get("progress", [])
             }
 
     def stream(
@@ -181,67 +246,143 @@ class ChatbotAgent:
     ) -> Iterator[Dict[str, Any]]:
         """
         챗봇 실행 (스트리밍)
-        진행 상황을 실시간으로 반환
+        진행 상황과 응답 토큰을 실시간으로 반환
+
+        이벤트 종류:
+            - progress: 노드 완료 시 진행 상황
+            - token: 답변 생성 중 LLM이 만들어내는 텍스트 조각
+            - final: 출처/그래프 등 구조화된 데이터를 포함한 최종 응답
+            - error: 처리 중 오류
 
         Yields:
             진행 상황 업데이트
         """
+        events: "queue.Queue" = queue.Queue()
+
+        def on_token(token: str):
+            events.put(self._token_event(token))
+
         # 초기 상태
-        initial_state: GraphState = {
-            "query": query,
-            "user_id": user_id,
-            "conversation_id": conversation_id,
-            "custom_prompt": custom_prompt,
-            "llm_config": llm_config or {},
-            "classification": None,
-            "retrieved_documents": [],
-            "mongodb_results": [],
-            "vectordb_results": [],
-            "response": None,
-            "progress": [],
-            "error": None
-        }
+        initial_state = self._build_initial_state(
+            query, user_id, conversation_id, custom_prompt, llm_config, token_callback=on_token
+        )
 
+        def run_graph():
+            """워크플로우를 별도 스레드에서 실행하고 이벤트를 큐에 전달"""
+            try:
+                for event in self.graph.stream(initial_state):
+                    for node_name, node_state in event.items():
+                        for node_event in self._node_events(node_name, node_state):
+                            events.put(node_event)
+            except Exception as e:
+                events.put(self._error_event(e))
+            finally:
+                events.put(None)  # 스트림 종료 표시
+
+        # 토큰 콜백이 노드 실행 중에 호출되므로 그래프는 별도 스레드에서 실행
+        threading.Thread(target=run_graph, daemon=True).start()
+
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            yield event
+
+    async def astream(
+        self,
+        query: str,
+        user_id: str = None,
+        conversation_id: str = None,
+        custom_prompt: str = None,
+        llm_config: Dict[str, Any] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        챗봇 실행 (비동기 스트리밍)
+        이벤트 종류는 stream과 동일
+        """
+        events: "asyncio.Queue" = asyncio.Queue()
+
+        def on_token(token: str):
+            # 같은 이벤트 루프에서 실행되는 노드가 호출
+            events.put_nowait(self._token_event(token))
+
+        initial_state = self._build_initial_state(
+            query, user_id, conversation_id, custom_prompt, llm_config, token_callback=on_token
+        )
+
+        async def run_graph():
+            """워크플로우를 태스크로 실행하고 이벤트를 큐에 전달"""
+            try:
+                async for event in self.graph.astream(initial_state):
+                    for node_name, node_state in event.items():
+                        for node_event in self._node_events(node_name, node_state):
+                            events.put_nowait(node_event)
+            except Exception as e:
+                events.put_nowait(self._error_event(e))
+            finally:
+                events.put_nowait(None)  # 스트림 종료 표시
+
+        task = asyncio.ensure_future(run_graph())
         try:
-            # 워크플로우 스트리밍 실행
-            for event in self.graph.stream(initial_state):
-                # 이벤트에서 진행 상황 추출
-                for node_name, node_state in event.items():
-                    progress = node_state.get("progress", [])
-                    if progress:
-                        latest_progress = progress[-1]
-                        yield {
-                            "type": "progress",
-                            "node": node_name,
-                            "data": latest_progress
-                        }
-
-                    # 최종 응답
-                    if node_name == "quality_check":
-                        response_data = node_state.get("response")
-                        if response_data:
-                            yield {
-                                "type": "final",
-                                "data": {
-                                    "success": True,
-                                    "content": response_data.content,
-                                    "sources": response_data.sources,
-                                    "confidence_score": response_data.confidence_score,
-                                    "table_data": response_data.table_data,
-                                    "chart_data": response_data.chart_data,
-                                    "warnings": response_data.warnings
-                                }
-                            }
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # 클라이언트 연결이 끊기면 그래프 실행 중단
+            if not task.done():
+                task.cancel()
+
+    @staticmethod
+    def _token_event(token: str) -> Dict[str, Any]:
+        """토큰 스트리밍 이벤트"""
+        return {
+            "type": "token",
+            "node": "response_generation",
+            "data": {"content": token}
+        }
 
-        except Exception as e:
+    @staticmethod
+    def _error_event(error: Exception) -> Dict[str, Any]:
+        """오류 이벤트"""
+        return {
+            "type": "error",
+            "data": {
+                "success": False,
+                "error": str(error)
+            }
+        }
+
+    @staticmethod
+    def _node_events(node_name: str, node_state: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """노드 실행 결과를 스트리밍 이벤트로 변환"""
+        progress = node_state.get("progress", [])
+        if progress:
+            latest_progress = progress[-1]
             yield {
-                "type": "error",
-                "data": {
-                    "success": False,
-                    "error": str(e)
-                }
+                "type": "progress",
+                "node": node_name,
+                "data": latest_progress
             }
 
+        # 최종 응답
+        if node_name == "quality_check":
+            response_data = node_state.get("response")
+            if response_data:
+                yield {
+                    "type": "final",
+                    "data": {
+                        "success": True,
+                        "content": response_data.content,
+                        "sources": response_data.sources,
+                        "confidence_score": response_data.confidence_score,
+                        "table_data": response_data.table_data,
+                        "chart_data": response_data.chart_data,
+                        "warnings": response_data.warnings
+                    }
+                }
+
 
 # 전역 Agent 인스턴스
 _agent = None
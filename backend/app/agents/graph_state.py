@@ -2,7 +2,7 @@
 LangGraph State 정의
 워크플로우 전체에서 공유되는 상태
 """
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, List, Dict, Any, Optional, Callable
 from dataclasses import dataclass, field
 
 
@@ -55,12 +55,14 @@ class GraphState(TypedDict):
     classification: Optional[QueryClassification]
 
     # Retrieval
+    speculative_vectordb: Optional[Any]  # 분류와 동시에 시작한 벡터 검색 Future (speculative 모드)
     retrieved_documents: List[RetrievedDocument]
     mongodb_results: List[Dict[str, Any]]
     vectordb_results: List[Dict[str, Any]]
 
     # Response Generation
     response: Optional[ResponseData]
+    token_callback: Optional[Callable[[str], None]]  # 스트리밍 시 토큰 전달용 (없으면 일괄 생성)
 
     # Progress Tracking (프론트엔드 진행 상태 표시용)
     progress: List[Dict[str, str]]  # [{"stage": "분석 중", "status": "completed"}]
@@ -2,11 +2,122 @@
 LangGraph 노드 구현
 각 노드는 GraphState를 입력받아 처리 후 업데이트된 State 반환
 """
+import asyncio
+import copy
 import json
-from typing import Dict, Any, List
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict, Any, List, Optional
+import pymongo
 from app.agents.graph_state import GraphState, QueryClassification, RetrievedDocument, ResponseData
+from app.agents.rule_classifier import get_rule_classifier, get_classification_path_stats
+from app.config import config
+from app.services.cache_service import get_classification_cache, normalize_query
 from app.services.llm_service import get_chat_llm, get_embedding_llm
-from app.services.database_service import get_mongodb, get_pgvector
+from app.services.database_service import (
+    get_mongodb, get_pgvector, get_async_mongodb, get_async_pgvector, normalize_embedding
+)
+
+
+# 부품 검색 결과 최대 개수
+MAX_PART_RESULTS = 10
+# 응답에 포함할 최근 출고 이력 개수
+RECENT_SHIPMENTS = 3
+# 부품 조회 필드 (_format_mongodb_result에서 쓰는 필드만, 출고 이력은 앞쪽 일부만)
+# 장착/검사 이력 등 계속 늘어나는 배열은 가져오지 않음
+PART_PROJECTION = {
+    "part_number": 1,
+    "part_name": 1,
+    "inventory": 1,
+    "shipment_history": {"$slice": RECENT_SHIPMENTS}
+}
+
+
+# 검색용 스레드 풀 (MongoDB / VectorDB 동시 검색)
+_retrieval_executor = None
+_retrieval_executor_lock = threading.Lock()
+
+
+def get_retrieval_executor() -> ThreadPoolExecutor:
+    """검색용 스레드 풀 반환 (싱글톤)"""
+    global _retrieval_executor
+    if _retrieval_executor is None:
+        with _retrieval_executor_lock:
+            if _retrieval_executor is None:
+                _retrieval_executor = ThreadPoolExecutor(
+                    max_workers=config.retrieval_max_workers,
+                    thread_name_prefix="retrieval"
+                )
+    return _retrieval_executor
+
+
+# 규칙 분류 shadow 비교용 스레드 풀 (LLM 호출, 동시 실행 수 제한)
+_shadow_executor = None
+_shadow_slots = None
+_shadow_executor_lock = threading.Lock()
+
+
+def submit_shadow_comparison(query: str, llm_config: Dict[str, Any], classification: QueryClassification) -> bool:
+    """
+    규칙 분류 결과를 백그라운드에서 LLM 분류와 비교
+    빈 슬롯이 없으면 대기열에 쌓지 않고 샘플을 버림 (LLM이 느려져도 스레드/요청이 늘지 않음)
+    """
+    global _shadow_executor, _shadow_slots
+    if _shadow_executor is None:
+        with _shadow_executor_lock:
+            if _shadow_executor is None:
+                workers = max(config.rule_shadow_max_concurrency, 1)
+                _shadow_slots = threading.BoundedSemaphore(workers)
+                _shadow_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rule-shadow")
+
+    if not _shadow_slots.acquire(blocking=False):
+        get_classification_path_stats().record_shadow_dropped()
+        return False
+    future = _shadow_executor.submit(QueryAnalysisNode._compare_with_llm, query, llm_config, classification)
+    future.add_done_callback(lambda _: _shadow_slots.release())
+    return True
+
+
+class SpeculativeRetrievalStats:
+    """Speculative 벡터 검색 통계 (사용 / 낭비)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = 0
+        self.used = 0
+        self.wasted = 0
+
+    def record(self, event: str):
+        """이벤트 기록 (started / used / wasted)"""
+        with self._lock:
+            setattr(self, event, getattr(self, event) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """통계 반환"""
+        with self._lock:
+            resolved = self.used + self.wasted
+            return {
+                "enabled": config.enable_speculative_retrieval,
+                "started": self.started,
+                "used": self.used,
+                "wasted": self.wasted,
+                "use_rate": self.used / resolved if resolved else 0.0
+            }
+
+
+_speculative_stats = SpeculativeRetrievalStats()
+
+
+def get_speculative_retrieval_stats() -> SpeculativeRetrievalStats:
+    """Speculative 벡터 검색 통계 반환"""
+    return _speculative_stats
+
+
+def _needs_vectordb(classification: QueryClassification) -> bool:
+    """분류 결과가 VectorDB 검색을 필요로 하는지 여부"""
+    return "vectordb" in classification.data_sources or "both" in classification.data_sources
 
 
 class QueryAnalysisNode:
@@ -17,20 +128,169 @@ class QueryAnalysisNode:
     - 필요한 데이터 소스 결정
     """
 
+    # 분류 경로별 진행 메시지
+    PATH_MESSAGES = {
+        "rule": "질문 분석 완료 (규칙)",
+        "cache": "질문 분석 완료 (캐시)",
+        "llm": "질문 분석 완료"
+    }
+
     @staticmethod
     def execute(state: GraphState) -> GraphState:
-        """쿼리 분석 실행"""
+        """
+        쿼리 분석 실행
+        규칙 기반 분류 → 캐시 → LLM 분류 순서로 시도
+        """
         query = state["query"]
         llm_config = state.get("llm_config", {})
+        started = time.perf_counter()
+
+        # Speculative 모드: 분류 결과를 기다리지 않고 벡터 검색 먼저 시작
+        speculative = None
+        if config.enable_speculative_retrieval:
+            speculative = get_retrieval_executor().submit(DataRetrievalNode._vector_search, query)
+            get_speculative_retrieval_stats().record("started")
+
+        # 규칙 / 캐시로 분류되지 않으면 LLM 분류
+        classification, path = QueryAnalysisNode._classify_fast(query, llm_config)
+        if classification is None:
+            path = "llm"
+            classification = QueryAnalysisNode._accept_llm_result(
+                query, llm_config, QueryAnalysisNode._classify_with_llm(query, llm_config)
+            )
 
+        return QueryAnalysisNode._update_state(state, classification, path, started, speculative)
+
+    @staticmethod
+    async def aexecute(state: GraphState) -> GraphState:
+        """쿼리 분석 실행 (비동기)"""
+        query = state["query"]
+        llm_config = state.get("llm_config", {})
+        started = time.perf_counter()
+
+        speculative = None
+        if config.enable_speculative_retrieval:
+            speculative = asyncio.ensure_future(DataRetrievalNode._avector_search(query))
+            get_speculative_retrieval_stats().record("started")
+
+        classification, path = QueryAnalysisNode._classify_fast(query, llm_config)
+        if classification is None:
+            path = "llm"
+            classification = QueryAnalysisNode._accept_llm_result(
+                query, llm_config, await QueryAnalysisNode._aclassify_with_llm(query, llm_config)
+            )
+
+        return QueryAnalysisNode._update_state(state, classification, path, started, speculative)
+
+    @staticmethod
+    def _classify_fast(query: str, llm_config: Dict[str, Any]) -> tuple:
+        """규칙 기반 분류 → 캐시 조회 (둘 다 실패하면 (None, None))"""
+        # 1. 규칙 기반 분류 (인사말, 부품번호 포함 질문)
+        if config.enable_rule_classifier:
+            classification = get_rule_classifier().classify(query)
+            if classification is not None:
+                if random.random() < config.rule_shadow_sample_rate:
+                    # 일부 샘플은 백그라운드에서 LLM 분류와 비교 (일치율 측정)
+                    submit_shadow_comparison(query, llm_config, copy.deepcopy(classification))
+                return classification, "rule"
+
+        # 2. 캐시 확인 (같은 모델 + 정규화된 질문)
+        if config.enable_cache:
+            cached = get_classification_cache().get(QueryAnalysisNode._cache_key(query, llm_config))
+            if cached is not None:
+                return copy.deepcopy(cached), "cache"
+
+        return None, None
+
+    @staticmethod
+    def _cache_key(query: str, llm_config: Dict[str, Any]) -> tuple:
+        """분류 캐시 키: (모델, 정규화된 질문)"""
+        return (llm_config.get("model") or config.llm.chat_model, normalize_query(query))
+
+    @staticmethod
+    def _accept_llm_result(
+        query: str,
+        llm_config: Dict[str, Any],
+        classification: Optional[QueryClassification]
+    ) -> QueryClassification:
+        """LLM 분류 결과 캐시 저장 (파싱 실패 시 기본값 반환)"""
+        if classification is None:
+            # 파싱 실패 시 기본값
+            return QueryClassification(
+                intent="general",
+                data_sources=["both"],
+                entities={},
+                requires_calculation=False,
+                response_format="text"
+            )
+
+        # 파싱 성공한 결과만 캐시
+        if config.enable_cache:
+            get_classification_cache().set(
+                QueryAnalysisNode._cache_key(query, llm_config), copy.deepcopy(classification)
+            )
+        return classification
+
+    @staticmethod
+    def _update_state(
+        state: GraphState,
+        classification: QueryClassification,
+        path: str,
+        started: float,
+        speculative: Optional[Any]
+    ) -> GraphState:
+        """분류 결과를 상태에 반영"""
+        get_classification_path_stats().record(path, time.perf_counter() - started)
+
+        # VectorDB가 필요 없거나 메타데이터 필터(부품번호)가 붙는 질문이면 speculative 검색 폐기
+        # (필터 없이 시작한 검색이라 재사용하면 필터가 빠짐 → 검색 단계에서 필터 검색을 새로 실행)
+        if speculative is not None and (
+            not _needs_vectordb(classification) or DataRetrievalNode._vector_filters(classification)
+        ):
+            speculative.cancel()
+            get_speculative_retrieval_stats().record("wasted")
+            speculative = None
+
+        # 상태 업데이트
+        state["classification"] = classification
+        state["speculative_vectordb"] = speculative
+        state["progress"] = state.get("progress", []) + [{
+            "stage": "query_analysis",
+            "status": "completed",
+            "message": QueryAnalysisNode.PATH_MESSAGES[path],
+            "path": path
+        }]
+
+        return state
+
+    @staticmethod
+    def _classify_with_llm(query: str, llm_config: Dict[str, Any]) -> Optional[QueryClassification]:
+        """LLM으로 쿼리 분류 (파싱 실패 시 None)"""
         # LLM 설정 적용
         llm = get_chat_llm(
             model=llm_config.get("model"),
             temperature=llm_config.get("temperature")
         )
 
-        # 분류 프롬프트
-        prompt = f"""
+        # LLM 호출
+        response = llm.invoke(QueryAnalysisNode._build_prompt(query))
+        return QueryAnalysisNode._parse_classification(response.content)
+
+    @staticmethod
+    async def _aclassify_with_llm(query: str, llm_config: Dict[str, Any]) -> Optional[QueryClassification]:
+        """LLM으로 쿼리 분류 (비동기)"""
+        llm = get_chat_llm(
+            model=llm_config.get("model"),
+            temperature=llm_config.get("temperature")
+        )
+
+        response = await llm.ainvoke(QueryAnalysisNode._build_prompt(query))
+        return QueryAnalysisNode._parse_classification(response.content)
+
+    @staticmethod
+    def _build_prompt(query: str) -> str:
+        """분류 프롬프트"""
+        return f"""
 다음 질문을 분석하여 JSON 형식으로 분류하세요:
 
 질문: {query}
@@ -64,31 +324,24 @@ data_sources:
 JSON만 출력하세요:
 """
 
-        # LLM 호출
-        response = llm.invoke(prompt)
+    @staticmethod
+    def _parse_classification(content: str) -> Optional[QueryClassification]:
+        """LLM 응답 JSON 파싱 (실패 시 None)"""
         try:
-            # JSON 파싱
-            classification_dict = json.loads(response.content)
-            classification = QueryClassification(**classification_dict)
-        except (json.JSONDecodeError, TypeError) as e:
-            # 파싱 실패 시 기본값
-            classification = QueryClassification(
-                intent="general",
-                data_sources=["both"],
-                entities={},
-                requires_calculation=False,
-                response_format="text"
-            )
+            classification_dict = json.loads(content)
+            return QueryClassification(**classification_dict)
+        except (json.JSONDecodeError, TypeError):
+            return None
 
-        # 상태 업데이트
-        state["classification"] = classification
-        state["progress"] = state.get("progress", []) + [{
-            "stage": "query_analysis",
-            "status": "completed",
-            "message": "질문 분석 완료"
-        }]
-
-        return state
+    @staticmethod
+    def _compare_with_llm(query: str, llm_config: Dict[str, Any], rule_result: QueryClassification):
+        """규칙 분류 결과를 LLM 분류 결과와 비교 (통계용)"""
+        try:
+            llm_result = QueryAnalysisNode._classify_with_llm(query, llm_config)
+            if llm_result is not None:
+                get_classification_path_stats().record_comparison(rule_result, llm_result)
+        except Exception as e:
+            print(f"규칙 분류 비교 오류: {e}")
 
 
 class DataRetrievalNode:
@@ -98,33 +351,131 @@ class DataRetrievalNode:
     - pgvector에서 문서 검색
     """
 
+    # 검색 단계별 진행 메시지
+    STAGE_MESSAGES = {
+        "mongodb": ("mongodb_search", "부품 정보 검색"),
+        "vectordb": ("vectordb_search", "문서 검색")
+    }
+
     @staticmethod
     def execute(state: GraphState) -> GraphState:
-        """데이터 검색 실행"""
+        """
+        데이터 검색 실행
+        MongoDB / VectorDB 검색을 동시에 실행하고, 각 검색은 개별 타임아웃 적용
+        """
+        classification = state["classification"]
+        query = state["query"]
+
+        # 필요한 검색 동시 실행
+        searches = {
+            "mongodb": DataRetrievalNode._search_mongodb,
+            "vectordb": DataRetrievalNode._search_vectordb
+        }
+        started = time.monotonic()
+        futures = {}
+        speculative = state.get("speculative_vectordb")
+        for name in DataRetrievalNode._plan(classification):
+            if name == "vectordb" and speculative is not None:
+                # 분류 단계에서 미리 시작한 벡터 검색 재사용
+                futures[name] = speculative
+                get_speculative_retrieval_stats().record("used")
+            else:
+                futures[name] = get_retrieval_executor().submit(searches[name], query, classification)
+        state["speculative_vectordb"] = None
+
+        outcomes = {}
+        for name, future in futures.items():
+            timeout = DataRetrievalNode._timeout(name)
+            remaining = max(started + timeout - time.monotonic(), 0)
+            try:
+                outcomes[name] = ("completed", future.result(timeout=remaining))
+            except FuturesTimeoutError:
+                # 느린 검색은 결과 없이 진행 (다른 검색 결과는 그대로 사용)
+                future.cancel()
+                outcomes[name] = ("timeout", timeout)
+            except Exception as e:
+                outcomes[name] = ("failed", e)
+
+        return DataRetrievalNode._update_state(state, outcomes)
+
+    @staticmethod
+    async def aexecute(state: GraphState) -> GraphState:
+        """데이터 검색 실행 (비동기)"""
         classification = state["classification"]
         query = state["query"]
 
-        mongodb_results = []
-        vectordb_results = []
+        searches = {
+            "mongodb": DataRetrievalNode._asearch_mongodb,
+            "vectordb": DataRetrievalNode._asearch_vectordb
+        }
+        names = DataRetrievalNode._plan(classification)
+        speculative = state.get("speculative_vectordb")
+        tasks = []
+        for name in names:
+            if name == "vectordb" and speculative is not None:
+                # 동기 경로에서 시작된 Future도 await 가능하도록 변환
+                task = speculative if asyncio.isfuture(speculative) else asyncio.wrap_future(speculative)
+                get_speculative_retrieval_stats().record("used")
+            else:
+                task = asyncio.ensure_future(searches[name](query, classification))
+            tasks.append(DataRetrievalNode._await_branch(task, DataRetrievalNode._timeout(name)))
+        state["speculative_vectordb"] = None
+
+        outcomes = dict(zip(names, await asyncio.gather(*tasks)))
+        return DataRetrievalNode._update_state(state, outcomes)
 
-        # MongoDB 검색
+    @staticmethod
+    async def _await_branch(task: Any, timeout: float) -> tuple:
+        """검색 결과 대기 (타임아웃 / 실패 시 결과 없음)"""
+        try:
+            return "completed", await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            return "timeout", timeout
+        except Exception as e:
+            return "failed", e
+
+    @staticmethod
+    def _plan(classification: QueryClassification) -> List[str]:
+        """분류 결과에 따라 실행할 검색 목록"""
+        names = []
         if "mongodb" in classification.data_sources or "both" in classification.data_sources:
-            mongodb_results = DataRetrievalNode._search_mongodb(query, classification)
-            state["progress"] = state.get("progress", []) + [{
-                "stage": "mongodb_search",
-                "status": "completed",
-                "message": f"부품 정보 검색 완료 ({len(mongodb_results)}건)"
-            }]
+            names.append("mongodb")
+        if _needs_vectordb(classification):
+            names.append("vectordb")
+        return names
+
+    @staticmethod
+    def _timeout(name: str) -> float:
+        """검색별 타임아웃 (초)"""
+        return config.mongodb_search_timeout if name == "mongodb" else config.vectordb_search_timeout
+
+    @staticmethod
+    def _update_state(state: GraphState, outcomes: Dict[str, tuple]) -> GraphState:
+        """검색 결과를 RetrievedDocument로 통합하여 상태에 반영"""
+        results = {"mongodb": [], "vectordb": []}
+        for name in ("mongodb", "vectordb"):
+            if name not in outcomes:
+                continue
+
+            stage, label = DataRetrievalNode.STAGE_MESSAGES[name]
+            status, value = outcomes[name]
+            if status == "completed":
+                results[name] = value
+                message = f"{label} 완료 ({len(value)}건)"
+            elif status == "timeout":
+                message = f"{label} 시간 초과 ({value}초)"
+            else:
+                message = f"{label} 실패: {value}"
 
-        # VectorDB 검색
-        if "vectordb" in classification.data_sources or "both" in classification.data_sources:
-            vectordb_results = DataRetrievalNode._search_vectordb(query, classification)
             state["progress"] = state.get("progress", []) + [{
-                "stage": "vectordb_search",
-                "status": "completed",
-                "message": f"문서 검색 완료 ({len(vectordb_results)}건)"
+                "stage": stage,
+                "status": status,
+                "message": message
             }]
 
+        mongodb_results = results["mongodb"]
+        vectordb_results = results["vectordb"]
+
         # 검색 결과 통합
         retrieved_documents = []
 
@@ -167,44 +518,170 @@ class DataRetrievalNode:
 
         results = []
 
-        # 부품 번호로 검색
-        for part_number in part_numbers:
-            result = mongodb.find_one("parts", {"part_number": part_number})
-            if result:
-                results.append(result)
-
-        # 부품명으로 검색
-        for part_name in part_names:
-            found = mongodb.find("parts", {"part_name": {"$regex": part_name}}, limit=5)
-            results.extend(found)
-
-        # 엔티티가 없으면 키워드 검색
-        if not part_numbers and not part_names:
-            # 간단한 키워드 검색 (실제로는 더 정교한 검색 필요)
-            keywords = query.split()
-            for keyword in keywords:
-                if len(keyword) > 2:
-                    found = mongodb.find("parts", {"part_name": {"$regex": keyword}}, limit=3)
-                    results.extend(found)
+        # 검색 타임아웃을 서버 쪽에도 적용 (남은 시간 → maxTimeMS / 소켓 타임아웃)
+        # future.cancel()은 실행 중인 조회를 멈추지 못하므로 타임아웃된 조회가 서버에 계속 남지 않도록
+        with pymongo.timeout(config.mongodb_search_timeout):
+            # 부품 번호로 검색 (한 번의 $in 조회)
+            if part_numbers:
+                found = mongodb.find(
+                    "parts", {"part_number": {"$in": part_numbers}},
+                    limit=MAX_PART_RESULTS, projection=PART_PROJECTION
+                )
+                results.extend(DataRetrievalNode._in_request_order(found, part_numbers))
+
+            # 부품명 검색 (엔티티가 없으면 쿼리 키워드로, 한 번의 인덱스 조회)
+            keywords = DataRetrievalNode._part_search_keywords(query, part_numbers, part_names)
+            results.extend(mongodb.search_parts(keywords, limit=MAX_PART_RESULTS, projection=PART_PROJECTION))
 
         # 중복 제거
         unique_results = {r.get("_id"): r for r in results}
-        return list(unique_results.values())[:10]
+        return list(unique_results.values())[:MAX_PART_RESULTS]
+
+    @staticmethod
+    def _in_request_order(parts: List[Dict[str, Any]], part_numbers: List[str]) -> List[Dict[str, Any]]:
+        """$in 조회 결과를 요청한 부품번호 순서로 정렬"""
+        order = {part_number: i for i, part_number in enumerate(part_numbers)}
+        return sorted(parts, key=lambda part: order.get(part.get("part_number"), len(order)))
+
+    @staticmethod
+    def _part_search_keywords(query: str, part_numbers: List[str], part_names: List[str]) -> List[str]:
+        """부품명 검색 키워드 (추출된 부품명, 엔티티가 없으면 쿼리의 3글자 이상 단어 중 불용어 제외)"""
+        if part_names:
+            return list(part_names)
+        if part_numbers:
+            return []
+        stopwords = set(config.database.part_search_stopwords)
+        return [
+            keyword for keyword in query.split()
+            if len(keyword) > 2 and keyword.strip("?!.,") not in stopwords
+        ]
+
+    @staticmethod
+    async def _asearch_mongodb(query: str, classification: QueryClassification) -> List[Dict[str, Any]]:
+        """MongoDB에서 부품 정보 검색 (비동기)"""
+        mongodb = get_async_mongodb()
+
+        part_numbers = classification.entities.get("part_numbers", [])
+        part_names = classification.entities.get("part_names", [])
+
+        keywords = DataRetrievalNode._part_search_keywords(query, part_numbers, part_names)
+
+        async def lookup_part_numbers() -> List[Dict[str, Any]]:
+            if not part_numbers:
+                return []
+            found = await mongodb.find(
+                "parts", {"part_number": {"$in": part_numbers}},
+                limit=MAX_PART_RESULTS, projection=PART_PROJECTION
+            )
+            return DataRetrievalNode._in_request_order(found, part_numbers)
+
+        # 부품번호 조회와 부품명 검색을 동시에 실행 (서버 쪽 타임아웃 적용, 동기 경로와 동일)
+        with pymongo.timeout(config.mongodb_search_timeout):
+            by_number, by_name = await asyncio.gather(
+                lookup_part_numbers(),
+                mongodb.search_parts(keywords, limit=MAX_PART_RESULTS, projection=PART_PROJECTION)
+            )
+        results = by_number + by_name
+
+        # 중복 제거
+        unique_results = {r.get("_id"): r for r in results}
+        return list(unique_results.values())[:MAX_PART_RESULTS]
 
     @staticmethod
     def _search_vectordb(query: str, classification: QueryClassification) -> List[Dict[str, Any]]:
-        """pgvector에서 문서 검색"""
+        """pgvector에서 문서 검색 (엔티티 기반 메타데이터 필터 적용)"""
+        return DataRetrievalNode._vector_search(query, DataRetrievalNode._vector_filters(classification))
+
+    @staticmethod
+    def _vector_filters(classification: QueryClassification) -> Optional[Dict[str, Any]]:
+        """
+        분류 엔티티 → 메타데이터 필터
+        부품번호가 있으면 part_numbers (적재 시 청크 본문에서 추출해 저장하는 키)로 필터
+        카테고리는 적재 시 채워지지 않는 키라 필터로 쓰지 않음
+        """
+        part_numbers = classification.entities.get("part_numbers") or []
+        if part_numbers:
+            return {"part_numbers": {"$in": [number.upper() for number in part_numbers]}}
+
+        return None
+
+    @staticmethod
+    def _document_search(pgvector, query: str, query_embedding: List[float], k: int,
+                         filter_metadata: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None):
+        """
+        설정에 따라 하이브리드(텍스트 + 벡터) 또는 벡터 검색 호출 (비동기 서비스면 코루틴 반환)
+        deadline: 검색 단계 마감 시각 (time.monotonic 기준), 남은 시간을 statement_timeout으로 적용
+        """
+        statement_timeout = max(deadline - time.monotonic(), 0.001) if deadline is not None else None
+        if config.enable_hybrid_search:
+            return pgvector.hybrid_search(
+                query_text=query,
+                query_embedding=query_embedding,
+                k=k,
+                filter_metadata=filter_metadata,
+                statement_timeout=statement_timeout
+            )
+        return pgvector.similarity_search(
+            query_embedding=query_embedding,
+            k=k,
+            filter_metadata=filter_metadata,
+            statement_timeout=statement_timeout
+        )
+
+    @staticmethod
+    def _merge_filtered(filtered: List[Dict[str, Any]], unfiltered: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        """필터 결과 우선, 부족한 만큼 필터 없는 결과로 채움"""
+        seen = {r["id"] for r in filtered}
+        return filtered + [r for r in unfiltered if r["id"] not in seen][:k - len(filtered)]
+
+    @staticmethod
+    def _vector_search(query: str, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        쿼리 임베딩 후 유사도 검색 (분류 결과 불필요 → speculative 검색에도 사용)
+        필터 결과가 k개 미만이면 (메타데이터가 없는 문서 등) 필터 없는 결과로 보충
+        검색 타임아웃(임베딩 포함) 중 남은 시간을 DB 쿼리의 statement_timeout으로 적용
+        """
+        deadline = time.monotonic() + config.vectordb_search_timeout
         embedding_llm = get_embedding_llm()
         pgvector = get_pgvector()
+        k = config.top_k_documents
 
         # 쿼리 임베딩
         query_embedding = embedding_llm.embed_query(query)
+        if config.database.vector_normalized:
+            query_embedding = normalize_embedding(query_embedding)
 
         # 유사도 검색
-        results = pgvector.similarity_search(
-            query_embedding=query_embedding,
-            k=5
-        )
+        results = DataRetrievalNode._document_search(pgvector, query, query_embedding, k, filter_metadata, deadline)
+
+        if filter_metadata and len(results) < k:
+            unfiltered = DataRetrievalNode._document_search(pgvector, query, query_embedding, k, deadline=deadline)
+            results = DataRetrievalNode._merge_filtered(results, unfiltered, k)
+
+        return results
+
+    @staticmethod
+    async def _asearch_vectordb(query: str, classification: QueryClassification) -> List[Dict[str, Any]]:
+        """pgvector에서 문서 검색 (비동기)"""
+        return await DataRetrievalNode._avector_search(query, DataRetrievalNode._vector_filters(classification))
+
+    @staticmethod
+    async def _avector_search(query: str, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """쿼리 임베딩 후 유사도 검색 (비동기)"""
+        deadline = time.monotonic() + config.vectordb_search_timeout
+        embedding_llm = get_embedding_llm()
+        pgvector = get_async_pgvector()
+        k = config.top_k_documents
+
+        query_embedding = await embedding_llm.aembed_query(query)
+        if config.database.vector_normalized:
+            query_embedding = normalize_embedding(query_embedding)
+
+        results = await DataRetrievalNode._document_search(pgvector, query, query_embedding, k, filter_metadata, deadline)
+
+        if filter_metadata and len(results) < k:
+            unfiltered = await DataRetrievalNode._document_search(pgvector, query, query_embedding, k, deadline=deadline)
+            results = DataRetrievalNode._merge_filtered(results, unfiltered, k)
 
         return results
 
@@ -228,7 +705,7 @@ class DataRetrievalNode:
         shipment_history = result.get("shipment_history", [])
         if shipment_history:
             text += "\n최근 출고 이력:\n"
-            for shipment in shipment_history[:3]:
+            for shipment in shipment_history[:RECENT_SHIPMENTS]:
                 text += f"- {shipment.get('date')}: {shipment.get('quantity')}개 → {shipment.get('destination')}\n"
 
         return text
@@ -245,19 +722,59 @@ class ResponseGenerationNode:
     @staticmethod
     def execute(state: GraphState) -> GraphState:
         """응답 생성 실행"""
-        query = state["query"]
-        retrieved_documents = state.get("retrieved_documents", [])
-        classification = state["classification"]
-        custom_prompt = state.get("custom_prompt", "")
-        llm_config = state.get("llm_config", {})
-        memory_context = state.get("memory_context", "")  # 메모리 컨텍스트 가져오기
+        llm = ResponseGenerationNode._get_llm(state)
+        prompt = ResponseGenerationNode._build_prompt(state)
+
+        # LLM 호출 (스트리밍 콜백이 있으면 토큰 단위로 전달)
+        token_callback = state.get("token_callback")
+        if token_callback:
+            tokens = []
+            for token in llm.stream(prompt):
+                tokens.append(token)
+                token_callback(token)
+            content = "".join(tokens)
+        else:
+            response = llm.invoke(prompt)
+            content = response.content
 
-        # LLM 설정
-        llm = get_chat_llm(
+        return ResponseGenerationNode._finalize(state, content)
+
+    @staticmethod
+    async def aexecute(state: GraphState) -> GraphState:
+        """응답 생성 실행 (비동기)"""
+        llm = ResponseGenerationNode._get_llm(state)
+        prompt = ResponseGenerationNode._build_prompt(state)
+
+        token_callback = state.get("token_callback")
+        if token_callback:
+            tokens = []
+            async for token in llm.astream(prompt):
+                tokens.append(token)
+                token_callback(token)
+            content = "".join(tokens)
+        else:
+            response = await llm.ainvoke(prompt)
+            content = response.content
+
+        return ResponseGenerationNode._finalize(state, content)
+
+    @staticmethod
+    def _get_llm(state: GraphState):
+        """상태의 LLM 설정으로 Chat LLM 반환"""
+        llm_config = state.get("llm_config", {})
+        return get_chat_llm(
             model=llm_config.get("model"),
             temperature=llm_config.get("temperature", 0.1)
         )
 
+    @staticmethod
+    def _build_prompt(state: GraphState) -> str:
+        """검색 결과 / 메모리 컨텍스트로 프롬프트 구성"""
+        query = state["query"]
+        retrieved_documents = state.get("retrieved_documents", [])
+        custom_prompt = state.get("custom_prompt", "")
+        memory_context = state.get("memory_context", "")  # 메모리 컨텍스트 가져오기
+
         # Context 구성
         context = ResponseGenerationNode._build_context(retrieved_documents)
 
@@ -504,9 +1021,12 @@ ABC-12345 부품의 최근 3개월 출고 데이터를 분석한 결과, **지
 답변:
 """
 
-        # LLM 호출
-        response = llm.invoke(prompt)
-        content = response.content
+        return prompt
+
+    @staticmethod
+    def _finalize(state: GraphState, content: str) -> GraphState:
+        """생성된 답변으로 ResponseData 구성 후 상태 업데이트"""
+        retrieved_documents = state.get("retrieved_documents", [])
 
         # 출처 수집
         sources = ResponseGenerationNode._collect_sources(retrieved_documents)
@@ -657,3 +1177,8 @@ class QualityCheckNode:
         }]
 
         return state
+
+    @staticmethod
+    async def aexecute(state: GraphState) -> GraphState:
+        """품질 검증 실행 (비동기, I/O 없음)"""
+        return QualityCheckNode.execute(state)
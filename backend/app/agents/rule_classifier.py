@@ -0,0 +1,173 @@
+"""
+규칙 기반 쿼리 분류기
+인사말, 부품번호가 포함된 질문 등 명확한 쿼리는 LLM 호출 없이 분류
+"""
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from app.agents.graph_state import QueryClassification
+from app.config import config
+
+
+_PART_NUMBER_REGEX = re.compile(config.rule_part_number_pattern)
+
+
+def extract_part_numbers(text: str) -> List[str]:
+    """
+    텍스트에서 부품번호 추출 (대문자 변환, 등장 순서 유지, 중복 제거)
+    문서 적재 시 청크 메타데이터(part_numbers)를 채울 때 사용 (분류기와 같은 패턴)
+    """
+    return list(dict.fromkeys(match.upper() for match in _PART_NUMBER_REGEX.findall(text or "")))
+
+
+class RuleBasedClassifier:
+    """
+    정규식 기반 사전 분류기
+    - 확실한 경우에만 QueryClassification 반환
+    - 애매하면 None 반환 (LLM 분류로 넘김)
+    """
+
+    def __init__(self, part_number_pattern: str, greeting_pattern: str, document_keywords: List[str]):
+        self.part_number_regex = re.compile(part_number_pattern)
+        self.greeting_regex = re.compile(greeting_pattern, re.IGNORECASE)
+        self.document_keywords = [kw.lower() for kw in document_keywords if kw]
+
+    def classify(self, query: str) -> Optional[QueryClassification]:
+        """쿼리 분류 (확신할 수 없으면 None)"""
+        text = (query or "").strip()
+        if not text:
+            return None
+
+        # 1. 인사말 → 데이터 불필요
+        if self.greeting_regex.fullmatch(text):
+            return QueryClassification(
+                intent="info_lookup",
+                data_sources=["none"],
+                entities={"part_numbers": [], "part_names": [], "date_ranges": [], "metrics": []},
+                requires_calculation=False,
+                response_format="text"
+            )
+
+        # 2. 부품번호 포함 → 부품 검색
+        part_numbers = list(dict.fromkeys(
+            match.upper() for match in self.part_number_regex.findall(text)
+        ))
+        if part_numbers:
+            lowered = text.lower()
+            needs_documents = any(kw in lowered for kw in self.document_keywords)
+            return QueryClassification(
+                intent="part_search",
+                data_sources=["both"] if needs_documents else ["mongodb"],
+                entities={"part_numbers": part_numbers, "part_names": [], "date_ranges": [], "metrics": []},
+                requires_calculation=False,
+                response_format="mixed"
+            )
+
+        return None
+
+
+class ClassificationPathStats:
+    """
+    분류 경로별 통계 (rule / cache / llm)
+    - 경로별 처리 건수, 평균 지연 시간
+    - 규칙 분류와 LLM 분류의 일치율 (샘플링 비교)
+    """
+
+    PATHS = ("rule", "cache", "llm")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {path: 0 for path in self.PATHS}
+        self.latency_sum = {path: 0.0 for path in self.PATHS}
+        self.shadow_comparisons = 0
+        self.shadow_agreements = 0
+        self.shadow_dropped = 0
+
+    def record(self, path: str, latency: float):
+        """분류 경로 및 지연 시간 기록 (초 단위)"""
+        with self._lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+            self.latency_sum[path] = self.latency_sum.get(path, 0.0) + latency
+
+    def record_comparison(self, rule_result: QueryClassification, llm_result: QueryClassification):
+        """규칙 분류 결과와 LLM 분류 결과 비교 기록"""
+        agreed = (
+            rule_result.intent == llm_result.intent
+            and self._sources(rule_result) == self._sources(llm_result)
+        )
+        with self._lock:
+            self.shadow_comparisons += 1
+            if agreed:
+                self.shadow_agreements += 1
+
+    def record_shadow_dropped(self):
+        """비교 슬롯이 모두 사용 중이라 버린 샘플 기록"""
+        with self._lock:
+            self.shadow_dropped += 1
+
+    @staticmethod
+    def _sources(classification: QueryClassification) -> set:
+        """data_sources 정규화 ("both" → mongodb + vectordb)"""
+        sources = set(classification.data_sources or [])
+        if "both" in sources:
+            sources = (sources - {"both"}) | {"mongodb", "vectordb"}
+        if not sources:
+            sources = {"none"}
+        return sources
+
+    def stats(self) -> Dict[str, Any]:
+        """통계 반환"""
+        with self._lock:
+            paths = {
+                path: {
+                    "count": count,
+                    "avg_latency_ms": round(self.latency_sum[path] / count * 1000, 2) if count else 0.0
+                }
+                for path, count in self.counts.items()
+            }
+            total = sum(self.counts.values())
+            llm_avg = paths["llm"]["avg_latency_ms"]
+
+            # LLM을 건너뛴 쿼리가 LLM 평균 지연만큼 걸렸다고 가정한 추정 절감량
+            latency_saved_ms = sum(
+                max(llm_avg - paths[path]["avg_latency_ms"], 0.0) * paths[path]["count"]
+                for path in ("rule", "cache")
+            ) if self.counts["llm"] else 0.0
+
+            return {
+                "paths": paths,
+                "total": total,
+                "llm_skip_rate": (total - self.counts["llm"]) / total if total else 0.0,
+                "estimated_latency_saved_ms": round(latency_saved_ms, 2),
+                "rule_vs_llm": {
+                    "comparisons": self.shadow_comparisons,
+                    "agreements": self.shadow_agreements,
+                    "dropped": self.shadow_dropped,
+                    "agreement_rate": (
+                        self.shadow_agreements / self.shadow_comparisons
+                        if self.shadow_comparisons else 0.0
+                    )
+                }
+            }
+
+
+# 전역 인스턴스
+_rule_classifier = None
+_path_stats = ClassificationPathStats()
+
+
+def get_rule_classifier() -> RuleBasedClassifier:
+    """규칙 기반 분류기 반환 (싱글톤)"""
+    global _rule_classifier
+    if _rule_classifier is None:
+        _rule_classifier = RuleBasedClassifier(
+            part_number_pattern=config.rule_part_number_pattern,
+            greeting_pattern=config.rule_greeting_pattern,
+            document_keywords=config.rule_document_keywords
+        )
+    return _rule_classifier
+
+
+def get_classification_path_stats() -> ClassificationPathStats:
+    """분류 경로 통계 반환"""
+    return _path_stats
@@ -19,10 +19,27 @@ class LLMConfig:
     embedding_model: str = os.getenv("LLM_EMBEDDING_MODEL", "text-embedding-ada-002")
     vision_model: str = os.getenv("LLM_VISION_MODEL", "gpt-4-vision")
 
+    # 임베딩 벡터 차원 (pgvector 컬럼 폭, 변경 시 문서 재임베딩 필요)
+    embedding_dimension: int = int(os.getenv("LLM_EMBEDDING_DIMENSION", "1536"))
+    # 임베딩 API에 dimensions 파라미터 전달 (단축 출력을 지원하는 모델만, 예: text-embedding-3-*)
+    embedding_request_dimension: bool = os.getenv("LLM_EMBEDDING_REQUEST_DIMENSION", "False") == "True"
+
     # 기본 파라미터
     temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.1"))
     max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "2000"))
 
+    # 클라이언트 풀 설정
+    client_pool_size: int = int(os.getenv("LLM_CLIENT_POOL_SIZE", "16"))  # (endpoint, model, temperature, max_tokens) 조합 최대 개수
+    http_max_connections: int = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive: int = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+    http_timeout: float = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))  # seconds
+
+    # 임베딩 마이크로 배칭 설정 (동시 embed_query 요청 병합)
+    embedding_batch_enabled: bool = os.getenv("LLM_EMBEDDING_BATCH_ENABLED", "True") == "True"
+    embedding_batch_window_ms: float = float(os.getenv("LLM_EMBEDDING_BATCH_WINDOW_MS", "5"))
+    embedding_batch_max_size: int = int(os.getenv("LLM_EMBEDDING_BATCH_MAX_SIZE", "64"))
+    embedding_batch_max_concurrency: int = int(os.getenv("LLM_EMBEDDING_BATCH_MAX_CONCURRENCY", "4"))
+
 
 @dataclass
 class DatabaseConfig:
@@ -30,6 +47,23 @@ class DatabaseConfig:
     # MongoDB
     mongodb_uri: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
     mongodb_database: str = os.getenv("MONGODB_DATABASE", "semiconductor_chatbot")
+    mongodb_ensure_indexes: bool = os.getenv("MONGODB_ENSURE_INDEXES", "True") == "True"  # 시작 시 인덱스 생성
+    mongodb_explain_queries: bool = os.getenv("MONGODB_EXPLAIN_QUERIES", "False") == "True"  # 조회/쓰기마다 explain → COLLSCAN 경고 (개발/테스트용)
+    # 부품명 검색: text (MongoDB 텍스트 인덱스) / ngram (문자 bigram 토큰 필드, 한국어 권장)
+    # ngram은 기존 부품에 search_tokens 백필 필요 (scripts/backfill_part_search_tokens.py) → 기본값 text
+    mongodb_part_search_mode: str = os.getenv("MONGODB_PART_SEARCH_MODE", "text")
+    # ngram 모드 최소 일치 비율: 키워드 토큰 중 이 비율 이상(올림)이 일치해야 결과에 포함
+    mongodb_part_search_min_overlap: float = float(os.getenv("MONGODB_PART_SEARCH_MIN_OVERLAP", "0.6"))
+    # 부품명 검색 키워드에서 제외할 단어 (질문 어미 등)
+    part_search_stopwords: list = field(default_factory=lambda: [
+        word.strip() for word in os.getenv(
+            "PART_SEARCH_STOPWORDS", "알려줘,알려주세요,보여줘,보여주세요,찾아줘,찾아주세요,궁금해요,어떻게,얼마나,있나요,있어요,무엇인가요"
+        ).split(",") if word.strip()
+    ])
+    # 대화 메시지: conversation_messages 컬렉션에 대화별 버킷(메시지 N개 묶음)으로 저장, 최신순 페이지 단위 조회
+    mongodb_message_bucket_size: int = int(os.getenv("MONGODB_MESSAGE_BUCKET_SIZE", "50"))
+    mongodb_message_page_size: int = int(os.getenv("MONGODB_MESSAGE_PAGE_SIZE", "30"))
+    mongodb_conversation_page_size: int = int(os.getenv("MONGODB_CONVERSATION_PAGE_SIZE", "50"))  # 대화 목록
 
     # PostgreSQL (pgvector)
     postgres_host: str = os.getenv("POSTGRES_HOST", "localhost")
@@ -37,6 +71,49 @@ class DatabaseConfig:
     postgres_database: str = os.getenv("POSTGRES_DATABASE", "vectordb")
     postgres_user: str = os.getenv("POSTGRES_USER", "postgres")
     postgres_password: str = os.getenv("POSTGRES_PASSWORD", "")
+    # 동기(psycopg2) 연결 풀
+    postgres_pool_min_size: int = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "1"))
+    postgres_pool_size: int = int(os.getenv("POSTGRES_POOL_SIZE", "20"))  # 최대 연결 수 (워커 스레드 수 이상 권장)
+    postgres_pool_timeout: float = float(os.getenv("POSTGRES_POOL_TIMEOUT", "10"))  # seconds (연결 대기 최대 시간)
+    postgres_pool_health_check_interval: float = float(os.getenv("POSTGRES_POOL_HEALTH_CHECK_INTERVAL", "30"))  # seconds (이보다 오래 유휴면 사용 전 확인)
+    # 문서 적재 (COPY BINARY)
+    postgres_bulk_copy: bool = os.getenv("POSTGRES_BULK_COPY", "True") == "True"
+    postgres_copy_batch_size: int = int(os.getenv("POSTGRES_COPY_BATCH_SIZE", "5000"))  # COPY 1회당 행 수
+    postgres_async_pool_size: int = int(os.getenv("POSTGRES_ASYNC_POOL_SIZE", "10"))  # 비동기(asyncpg) 연결 풀 크기
+
+    # HNSW 인덱스 (빌드 파라미터 변경 후 scripts/manage_pgvector.py reindex로 재생성)
+    hnsw_m: int = int(os.getenv("HNSW_M", "16"))
+    hnsw_ef_construction: int = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+    hnsw_ef_search: int = int(os.getenv("HNSW_EF_SEARCH", "40"))  # 검색 기본값 (호출별 ef_search로 변경 가능)
+    hnsw_maintenance_work_mem: str = os.getenv("HNSW_MAINTENANCE_WORK_MEM", "")  # 재생성 시 메모리 (예: 2GB)
+
+    # 임베딩 저장/인덱스 모드 (pgvector 0.7+ 필요: halfvec, binary_quantize)
+    # full: float32 인덱스 / halfvec: float16 인덱스 (1/2) / binary: 비트 인덱스 (1/32)
+    # 양자화 모드는 인덱스로 후보를 찾고 float32 embedding 컬럼으로 재정렬
+    vector_storage_mode: str = os.getenv("VECTOR_STORAGE_MODE", "full")
+    vector_rerank_factor: int = int(os.getenv("VECTOR_RERANK_FACTOR", "8"))  # 재정렬 후보 수 = k × 배수
+    # 인덱스 차원 (0이면 전체 차원). 임베딩 앞부분 N차원을 재정규화해 인덱스에 사용하고
+    # 전체 벡터로 재정렬 (Matryoshka 방식으로 학습된 모델 전용, 예: 256 / 512)
+    vector_index_dimension: int = int(os.getenv("VECTOR_INDEX_DIMENSION", "0"))
+    # 정규화 모드: 적재/검색 임베딩을 L2 정규화하고 내적(<#>, vector_ip_ops)으로 검색
+    # 기존 데이터 전환: python scripts/manage_pgvector.py normalize
+    vector_normalized: bool = os.getenv("VECTOR_NORMALIZED", "False") == "True"
+
+    # 벡터 검색 메타데이터 필터
+    vector_filter_keys: list = field(default_factory=lambda: [
+        key.strip() for key in os.getenv(
+            "VECTOR_FILTER_KEYS", "part_numbers,part_number,category,file_name,section,source,page_number,language"
+        ).split(",") if key.strip()
+    ])
+    vector_filter_overfetch: int = int(os.getenv("VECTOR_FILTER_OVERFETCH", "10"))  # 필터 검색 시 ef_search = k × 배수
+    pgvector_iterative_scan: str = os.getenv("PGVECTOR_ITERATIVE_SCAN", "off")  # off / relaxed_order / strict_order (pgvector 0.8+)
+
+    # 하이브리드 검색 (텍스트 + 벡터, RRF)
+    hybrid_text_mode: str = os.getenv("HYBRID_TEXT_MODE", "trigram")  # trigram (한국어 권장) / fts
+    hybrid_fts_config: str = os.getenv("HYBRID_FTS_CONFIG", "simple")  # fts 모드 사전
+    hybrid_trigram_threshold: float = float(os.getenv("HYBRID_TRIGRAM_THRESHOLD", "0.3"))
+    hybrid_candidates: int = int(os.getenv("HYBRID_CANDIDATES", "50"))  # 검색별 RRF 후보 수
+    hybrid_rrf_k: int = int(os.getenv("HYBRID_RRF_K", "60"))
 
     @property
     def postgres_uri(self) -> str:
@@ -51,6 +128,18 @@ class AppConfig:
     flask_debug: bool = os.getenv("FLASK_DEBUG", "True") == "True"
     flask_port: int = int(os.getenv("FLASK_PORT", "5000"))
 
+    # 운영 서버 설정 (serve.py)
+    server_host: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    server_workers: int = int(os.getenv("SERVER_WORKERS", str((os.cpu_count() or 1) * 2 + 1)))
+    server_worker_class: str = os.getenv("SERVER_WORKER_CLASS", "gthread")  # sync / gthread / gevent / uvicorn
+    server_threads: int = int(os.getenv("SERVER_THREADS", "8"))  # gthread 워커당 스레드 수
+    server_worker_connections: int = int(os.getenv("SERVER_WORKER_CONNECTIONS", "1000"))  # gevent 워커당 동시 연결
+    server_preload: bool = os.getenv("SERVER_PRELOAD", "True") == "True"
+    server_timeout: int = int(os.getenv("SERVER_TIMEOUT", "120"))  # seconds (워커 무응답 시 재시작)
+    server_graceful_timeout: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "120"))  # seconds (SIGTERM 후 진행 중 스트림 대기)
+    server_keepalive: int = int(os.getenv("SERVER_KEEPALIVE", "5"))  # seconds
+    server_max_requests: int = int(os.getenv("SERVER_MAX_REQUESTS", "0"))  # 0이면 워커 재시작 안 함
+
     # 테스트 모드 (DB, LLM을 Mock으로 대체)
     test_mode: bool = os.getenv("TEST_MODE", "False") == "True"
 
@@ -64,12 +153,58 @@ class AppConfig:
     chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "200"))
     top_k_documents: int = int(os.getenv("TOP_K_DOCUMENTS", "5"))
 
+    # 검색 동시 실행 설정
+    retrieval_max_workers: int = int(os.getenv("RETRIEVAL_MAX_WORKERS", "16"))
+    mongodb_search_timeout: float = float(os.getenv("MONGODB_SEARCH_TIMEOUT", "5"))  # seconds
+    vectordb_search_timeout: float = float(os.getenv("VECTORDB_SEARCH_TIMEOUT", "10"))  # seconds (임베딩 포함)
+    # 쿼리 분류와 동시에 벡터 검색 시작 (분류 결과가 vectordb를 쓰지 않으면 버림)
+    enable_speculative_retrieval: bool = os.getenv("ENABLE_SPECULATIVE_RETRIEVAL", "False") == "True"
+    # 문서 검색 시 텍스트 검색과 벡터 검색을 RRF로 결합 (부품 코드, 규격명 등 정확 일치 보완)
+    # 켜면 시작 시 텍스트 GIN 인덱스를 생성하고 검색마다 텍스트 검색이 추가되므로 기본값은 끔
+    enable_hybrid_search: bool = os.getenv("ENABLE_HYBRID_SEARCH", "False") == "True"
+
     # Hallucination 검증 임계값
     confidence_threshold: float = float(os.getenv("CONFIDENCE_THRESHOLD", "0.7"))
 
+    # 규칙 기반 사전 분류 (명확한 쿼리는 LLM 분류 생략)
+    enable_rule_classifier: bool = os.getenv("ENABLE_RULE_CLASSIFIER", "True") == "True"
+    rule_part_number_pattern: str = os.getenv("RULE_PART_NUMBER_PATTERN", r"(?<![A-Za-z0-9])[A-Za-z]{3}-\d{5}(?!\d)")
+    rule_greeting_pattern: str = os.getenv(
+        "RULE_GREETING_PATTERN",
+        r"(안녕|안녕하세요|반가워요?|반갑습니다|고마워요?|감사합니다|hi|hello|hey|thanks?)[\s!.~?]*"
+    )
+    rule_document_keywords: list = field(default_factory=lambda: [
+        kw.strip() for kw in os.getenv(
+            "RULE_DOCUMENT_KEYWORDS", "사양,매뉴얼,절차,규격,데이터시트,spec,manual,datasheet"
+        ).split(",")
+    ])
+    rule_shadow_sample_rate: float = float(os.getenv("RULE_SHADOW_SAMPLE_RATE", "0.0"))  # 규칙 분류 중 LLM과 비교할 비율
+    rule_shadow_max_concurrency: int = int(os.getenv("RULE_SHADOW_MAX_CONCURRENCY", "2"))  # 동시 LLM 비교 수 (초과 샘플은 버림)
+
     # 캐시 설정
     enable_cache: bool = os.getenv("ENABLE_CACHE", "True") == "True"
     cache_ttl: int = int(os.getenv("CACHE_TTL", "3600"))  # seconds
+    cache_max_size: int = int(os.getenv("CACHE_MAX_SIZE", "1000"))  # 최대 항목 수
+
+    # 임베딩 캐시 설정 (로컬 디스크, 워커 프로세스 간 공유)
+    enable_embedding_cache: bool = os.getenv("ENABLE_EMBEDDING_CACHE", "True") == "True"
+    embedding_cache_path: str = os.getenv("EMBEDDING_CACHE_PATH", "./cache/embeddings.sqlite3")
+    embedding_cache_max_mb: int = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "1024"))
+
+    # 대화 턴 write-behind 저장 (응답 반환 후 백그라운드 큐에서 저장 / 제목 생성)
+    enable_chat_write_behind: bool = os.getenv("ENABLE_CHAT_WRITE_BEHIND", "True") == "True"
+    # 가득 차면 요청 스레드에서 바로 저장 (그 대화의 턴이 큐에 있으면 순서 유지를 위해 빈자리 대기)
+    chat_write_queue_size: int = int(os.getenv("CHAT_WRITE_QUEUE_SIZE", "1000"))
+    chat_write_enqueue_timeout: float = float(os.getenv("CHAT_WRITE_ENQUEUE_TIMEOUT", "10"))  # seconds (큐 빈자리 대기)
+    chat_write_max_retries: int = int(os.getenv("CHAT_WRITE_MAX_RETRIES", "3"))
+    chat_write_retry_backoff: float = float(os.getenv("CHAT_WRITE_RETRY_BACKOFF", "0.5"))  # seconds (재시도마다 2배)
+    chat_write_flush_timeout: float = float(os.getenv("CHAT_WRITE_FLUSH_TIMEOUT", "10"))  # seconds (종료 시 남은 턴 저장 대기)
+    chat_title_event_timeout: float = float(os.getenv("CHAT_TITLE_EVENT_TIMEOUT", "10"))  # seconds (SSE title 이벤트 대기)
+    # 첫 턴 제목 일괄 생성 (대기 중인 대화를 모아 LLM 한 번 호출, 제목은 bulk write 한 번으로 저장)
+    chat_title_batch_window_ms: float = float(os.getenv("CHAT_TITLE_BATCH_WINDOW_MS", "500"))
+    chat_title_batch_max_size: int = int(os.getenv("CHAT_TITLE_BATCH_MAX_SIZE", "20"))
+    chat_title_batch_max_concurrency: int = int(os.getenv("CHAT_TITLE_BATCH_MAX_CONCURRENCY", "2"))
+    chat_title_batch_timeout: float = float(os.getenv("CHAT_TITLE_BATCH_TIMEOUT", "8"))  # seconds (초과 시 첫 메시지 앞부분 사용)
 
     # LLM & DB 설정
     llm: LLMConfig = field(default_factory=LLMConfig)
@@ -3,10 +3,28 @@
 """
 from flask import Blueprint, request, jsonify, Response
 import json
+from datetime import datetime
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
 from app.agents.chatbot_agent import get_chatbot_agent
+from app.config import config
+from app.services.conversation_service import (
+    CONVERSATION_LIST_SORT,
+    CONVERSATION_SUMMARY_PROJECTION,
+    DEFAULT_TITLE,
+    build_conversation_list_query,
+    encode_list_cursor,
+    get_chat_turn_writer,
+    get_message_store,
+    parse_timestamp,
+    persist_chat_turn
+)
 from app.services.database_service import get_mongodb
+from app.services.llm_service import TITLE_CONTEXT_MESSAGES
 
 bp = Blueprint("chat", __name__)
+# 대화 목록 한 페이지 최대 크기
+MAX_CONVERSATION_PAGE_SIZE = 100
 
 
 @bp.route("/chat", methods=["POST"])
@@ -36,6 +54,9 @@ def chat():
             "chart_data": {...},
             "warnings": [...]
         }
+
+    대화 저장은 응답 반환 후 백그라운드에서 처리 (ENABLE_CHAT_WRITE_BEHIND)
+    첫 턴 자동 생성 제목은 GET /conversations/<id>/title 로 확인
     """
     data = request.get_json()
 
@@ -60,62 +81,7 @@ def chat():
 
     # 대화 저장 (MongoDB)
     if result.get("success") and conversation_id:
-        from datetime import datetime
-        from app.services.llm_service import generate_title
-
-        mongodb = get_mongodb()
-
-        # 사용자 메시지 추가
-        mongodb.update_one(
-            "conversations",
-            {"conversation_id": conversation_id},
-            {
-                "$push": {
-                    "messages": {
-                        "role": "user",
-                        "content": message,
-                        "timestamp": datetime.utcnow()
-                    }
-                },
-                "$set": {
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
-
-        # 봇 응답 추가
-        mongodb.update_one(
-            "conversations",
-            {"conversation_id": conversation_id},
-            {
-                "$push": {
-                    "messages": {
-                        "role": "assistant",
-                        "content": result.get("content"),
-                        "sources": result.get("sources"),
-                        "confidence_score": result.get("confidence_score"),
-                        "timestamp": datetime.utcnow()
-                    }
-                },
-                "$set": {
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
-
-        # 첫 메시지 후 자동으로 제목 생성
-        conversation = mongodb.find_one("conversations", {"conversation_id": conversation_id})
-        if conversation:
-            messages = conversation.get("messages", [])
-            # 첫 번째 사용자 메시지 후 (총 2개 메시지) 제목 자동 생성
-            if len(messages) == 2 and conversation.get("title") == "새 대화":
-                title = generate_title(messages)
-                mongodb.update_one(
-                    "conversations",
-                    {"conversation_id": conversation_id},
-                    {"$set": {"title": title}}
-                )
-                result["conversation_title"] = title
+        save_chat_turn(conversation_id, message, result)
 
     return jsonify(result)
 
@@ -125,6 +91,13 @@ def chat_stream():
     """
     채팅 메시지 처리 (스트리밍)
     Server-Sent Events (SSE) 방식
+
+    Events:
+        {"type": "progress", "node": "...", "data": {...}}  # 단계 완료
+        {"type": "token", "node": "response_generation", "data": {"content": "..."}}  # 답변 조각
+        {"type": "final", "data": {"content": ..., "sources": [...], "chart_data": {...}}}
+        {"type": "title", "data": {"conversation_id": "...", "title": "..."}}  # 첫 턴 저장 후 자동 생성 제목
+        {"type": "error", "data": {"error": "..."}}
     """
     data = request.get_json()
 
@@ -140,6 +113,7 @@ def chat_stream():
     def generate():
         """SSE 이벤트 스트림 생성"""
         agent = get_chatbot_agent()
+        final = None
 
         for event in agent.stream(
             query=message,
@@ -148,40 +122,142 @@ def chat_stream():
             custom_prompt=custom_prompt,
             llm_config=llm_config
         ):
+            if event["type"] == "final":
+                final = event["data"]
             yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
 
-    return Response(generate(), mimetype="text/event-stream")
+        # 답변 전송 후 대화 저장, 첫 턴이면 생성된 제목을 title 이벤트로 전달
+        if final and conversation_id:
+            title = wait_for_title(save_chat_turn(conversation_id, message, final), final)
+            if title:
+                yield f"data: {json.dumps(title_event(conversation_id, title), ensure_ascii=False)}\n\n"
+
+    # 프록시 버퍼링을 끄지 않으면 token 이벤트가 모였다가 한꺼번에 전달됨
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 
 @bp.route("/conversations", methods=["GET"])
 def get_conversations():
-    """사용자의 대화 목록 조회"""
+    """
+    사용자의 대화 목록 조회 (요약 필드만, 최근 갱신순)
+
+    Query:
+        user_id: 사용자 ID (필수)
+        limit: 대화 수 (1 ~ 100, 기본: MONGODB_CONVERSATION_PAGE_SIZE)
+        cursor: 다음 페이지 조회 시 이전 응답의 next_cursor
+        since: 이 시각(ISO 8601) 이후 갱신된 대화만 - 이전 응답의 latest_updated_at으로 증분 갱신
+
+    Response:
+        {
+            "success": true,
+            "conversations": [{"conversation_id", "title", "message_count", "created_at", "updated_at"}],
+            "next_cursor": "..." | null,
+            "latest_updated_at": "2026-01-01T00:00:00.123000" | null
+        }
+    """
     user_id = request.args.get("user_id")
 
     if not user_id:
         return jsonify({"success": False, "error": "user_id가 필요합니다."}), 400
 
+    limit = request.args.get("limit", type=int)
+    if limit is not None and limit < 1:
+        # find(limit=0)은 전체 조회가 되므로 0 이하는 거부
+        return jsonify({"success": False, "error": "limit은 1 이상이어야 합니다."}), 400
+    limit = min(limit or config.database.mongodb_conversation_page_size, MAX_CONVERSATION_PAGE_SIZE)
+    since = request.args.get("since")
+    try:
+        since = parse_timestamp(since) if since else None
+        query = build_conversation_list_query(user_id, cursor=request.args.get("cursor"), since=since)
+    except ValueError as e:
+        return jsonify({"success": False, "error": f"잘못된 페이지 파라미터: {e}"}), 400
+
+    # 한 개 더 조회해서 다음 페이지 존재 여부 판단
     mongodb = get_mongodb()
-    conversations = mongodb.find("conversations", {"user_id": user_id}, limit=50)
+    conversations = mongodb.find(
+        "conversations",
+        query,
+        limit=limit + 1,
+        projection=CONVERSATION_SUMMARY_PROJECTION,
+        sort=CONVERSATION_LIST_SORT
+    )
+    next_cursor = encode_list_cursor(conversations[limit - 1]) if len(conversations) > limit else None
+    conversations = conversations[:limit]
 
+    latest = conversations[0]["updated_at"] if conversations else since
     return jsonify({
         "success": True,
-        "conversations": conversations
+        "conversations": conversations,
+        "next_cursor": next_cursor,
+        "latest_updated_at": latest.isoformat() if latest else None
     })
 
 
 @bp.route("/conversations/<conversation_id>", methods=["GET"])
 def get_conversation(conversation_id):
-    """특정 대화 조회"""
-    mongodb = get_mongodb()
-    conversation = mongodb.find_one("conversations", {"conversation_id": conversation_id})
+    """
+    특정 대화 조회 (메시지는 최신 페이지만 포함)
+
+    Query:
+        limit: 메시지 수 (기본: MONGODB_MESSAGE_PAGE_SIZE)
+
+    Response:
+        {"success": true, "conversation": {..., "messages": [...]}, "next_cursor": 123 | null}
+        이전 메시지는 GET /conversations/<id>/messages?before=<next_cursor>
+    """
+    store = get_message_store()
+    conversation = store.get_conversation(conversation_id)
 
     if not conversation:
         return jsonify({"success": False, "error": "대화를 찾을 수 없습니다."}), 404
 
+    page = store.page(conversation, limit=request.args.get("limit", type=int))
+    conversation["messages"] = page["messages"]
+
     return jsonify({
         "success": True,
-        "conversation": conversation
+        "conversation": conversation,
+        "next_cursor": page["next_cursor"]
+    })
+
+
+@bp.route("/conversations/<conversation_id>/messages", methods=["GET"])
+def get_conversation_messages(conversation_id):
+    """
+    대화 메시지 페이지 조회 (커서 기반, 최신 → 이전 방향)
+
+    Query:
+        before: 이 순번 이전 메시지만 (이전 응답의 next_cursor, 생략 시 최신 페이지)
+        limit: 메시지 수 (기본: MONGODB_MESSAGE_PAGE_SIZE)
+
+    Response:
+        {"success": true, "messages": [...오래된 순], "next_cursor": 93 | null}
+    """
+    store = get_message_store()
+    conversation = store.get_conversation(
+        conversation_id,
+        projection={"conversation_id": 1, "message_count": 1, "bucket_size": 1}
+    )
+
+    if not conversation:
+        return jsonify({"success": False, "error": "대화를 찾을 수 없습니다."}), 404
+
+    page = store.page(
+        conversation,
+        before=request.args.get("before", type=int),
+        limit=request.args.get("limit", type=int)
+    )
+
+    return jsonify({
+        "success": True,
+        **page
     })
 
 
@@ -202,8 +278,9 @@ def create_conversation():
     mongodb.insert_one("conversations", {
         "conversation_id": conversation_id,
         "user_id": user_id,
-        "title": "새 대화",  # 기본 제목
-        "messages": [],
+        "title": DEFAULT_TITLE,  # 첫 턴 저장 후 자동 생성 제목으로 교체
+        "message_count": 0,  # 메시지는 conversation_messages 컬렉션에 저장
+        "bucket_size": get_message_store().bucket_size,  # 이후 설정이 바뀌어도 이 대화는 같은 버킷 크기 사용
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     })
@@ -211,7 +288,7 @@ def create_conversation():
     return jsonify({
         "success": True,
         "conversation_id": conversation_id,
-        "title": "새 대화"
+        "title": DEFAULT_TITLE
     })
 
 
@@ -225,8 +302,9 @@ def delete_conversation(conversation_id):
     if not conversation:
         return jsonify({"success": False, "error": "대화를 찾을 수 없습니다."}), 404
 
-    # 삭제
+    # 삭제 (메시지 버킷 포함)
     mongodb.delete_one("conversations", {"conversation_id": conversation_id})
+    get_message_store().delete(conversation_id)
 
     return jsonify({
         "success": True,
@@ -269,6 +347,32 @@ def update_conversation_title(conversation_id):
     })
 
 
+@bp.route("/conversations/<conversation_id>/title", methods=["GET"])
+def get_conversation_title(conversation_id):
+    """
+    대화 제목 조회 (첫 턴 후 백그라운드 제목 생성 확인용 polling)
+
+    Response:
+        {"success": true, "title": "...", "title_pending": true | false}
+    """
+    mongodb = get_mongodb()
+    conversation = mongodb.find_one(
+        "conversations",
+        {"conversation_id": conversation_id},
+        projection={"title": 1, "message_count": 1}
+    )
+    if not conversation:
+        return jsonify({"success": False, "error": "대화를 찾을 수 없습니다."}), 404
+
+    title = conversation.get("title", DEFAULT_TITLE)
+    return jsonify({
+        "success": True,
+        "title": title,
+        # 저장 대기 중이거나 첫 턴 제목 생성 중
+        "title_pending": title == DEFAULT_TITLE and conversation.get("message_count", 0) <= 2
+    })
+
+
 @bp.route("/conversations/<conversation_id>/generate-title", methods=["POST"])
 def generate_conversation_title(conversation_id):
     """
@@ -284,17 +388,19 @@ def generate_conversation_title(conversation_id):
 
     mongodb = get_mongodb()
 
-    # 대화 조회
-    conversation = mongodb.find_one("conversations", {"conversation_id": conversation_id})
+    # 대화 조회 (이전 방식 대화면 메시지 버킷 이전 후)
+    conversation = get_message_store().get_conversation(
+        conversation_id,
+        projection={"message_count": 1}
+    )
     if not conversation:
         return jsonify({"success": False, "error": "대화를 찾을 수 없습니다."}), 404
 
-    messages = conversation.get("messages", [])
-    if len(messages) == 0:
+    if not conversation.get("message_count"):
         return jsonify({"success": False, "error": "메시지가 없어 제목을 생성할 수 없습니다."}), 400
 
-    # 제목 생성
-    title = generate_title(messages)
+    # 제목 생성 (처음 3턴만 사용)
+    title = generate_title(get_message_store().first_messages(conversation_id, TITLE_CONTEXT_MESSAGES))
 
     # 제목 업데이트
     mongodb.update_one(
@@ -312,3 +418,57 @@ def generate_conversation_title(conversation_id):
         "success": True,
         "title": title
     })
+
+
+def chat_turn_messages(message: str, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """저장할 사용자 메시지 / 봇 응답"""
+    now = datetime.utcnow()
+    return [
+        {
+            "role": "user",
+            "content": message,
+            "timestamp": now
+        },
+        {
+            "role": "assistant",
+            "content": result.get("content"),
+            "sources": result.get("sources"),
+            "confidence_score": result.get("confidence_score"),
+            "timestamp": now
+        }
+    ]
+
+
+def save_chat_turn(conversation_id: str, message: str, result: Dict[str, Any]) -> Optional[Future]:
+    """
+    사용자 메시지와 봇 응답을 대화에 저장
+
+    - write-behind (기본): 저장 큐에 넣고 바로 반환, 저장/제목 생성 완료 시 제목(또는 None)으로 완료되는 Future 반환
+    - ENABLE_CHAT_WRITE_BEHIND=False: 바로 저장하고 첫 턴이면 제목을 result["conversation_title"]에 반영, None 반환
+    """
+    messages = chat_turn_messages(message, result)
+    if config.enable_chat_write_behind:
+        return get_chat_turn_writer().submit(conversation_id, messages)
+
+    title = persist_chat_turn(conversation_id, messages)
+    if title:
+        result["conversation_title"] = title
+    return None
+
+
+def wait_for_title(future: Optional[Future], result: Dict[str, Any]) -> Optional[str]:
+    """save_chat_turn 결과에서 첫 턴 제목 대기 (CHAT_TITLE_EVENT_TIMEOUT, 실패/시간 초과면 None)"""
+    if future is None:
+        return result.get("conversation_title")
+    try:
+        return future.result(timeout=config.chat_title_event_timeout)
+    except Exception:
+        return None
+
+
+def title_event(conversation_id: str, title: str) -> Dict[str, Any]:
+    """SSE title 이벤트"""
+    return {
+        "type": "title",
+        "data": {"conversation_id": conversation_id, "title": title}
+    }
@@ -3,6 +3,13 @@
 """
 from flask import Blueprint, request, jsonify
 from app.config import config
+from app.services.llm_service import get_chat_llm_pool_stats, get_embedding_batch_stats
+from app.services.cache_service import get_classification_cache
+from app.services.embedding_cache import get_embedding_cache
+from app.services.database_service import get_pgvector_pool_stats, get_mongodb_query_plan_stats
+from app.services.conversation_service import get_chat_turn_write_stats, get_title_batch_stats
+from app.agents.rule_classifier import get_classification_path_stats
+from app.agents.nodes import get_speculative_retrieval_stats
 
 bp = Blueprint("settings", __name__)
 
@@ -89,3 +96,23 @@ def get_available_models():
             ]
         }
     })
+
+
+@bp.route("/settings/stats", methods=["GET"])
+def get_runtime_stats():
+    """런타임 통계 조회 (클라이언트 풀, 캐시 등)"""
+    return jsonify({
+        "success": True,
+        "stats": {
+            "chat_llm_pool": get_chat_llm_pool_stats(),
+            "embedding_batching": get_embedding_batch_stats(),
+            "classification_cache": get_classification_cache().stats(),
+            "classification_paths": get_classification_path_stats().stats(),
+            "speculative_retrieval": get_speculative_retrieval_stats().stats(),
+            "embedding_cache": get_embedding_cache().stats() if config.enable_embedding_cache else None,
+            "pgvector_pool": get_pgvector_pool_stats(),
+            "mongodb_query_plans": get_mongodb_query_plan_stats(),
+            "chat_turn_writes": get_chat_turn_write_stats(),
+            "title_batching": get_title_batch_stats()
+        }
+    })
@@ -0,0 +1,114 @@
+"""
+캐시 서비스
+- TTL + 크기 제한(LRU) 인메모리 캐시
+- 쿼리 정규화 (공백, 대소문자, 한글 띄어쓰기)
+"""
+import re
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from app.config import config
+
+
+# 한글 앞뒤 공백 (띄어쓰기 차이 무시용)
+_HANGUL_SPACE_PATTERN = re.compile(r"\s+(?=[가-힣])|(?<=[가-힣])\s+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 쿼리 정규화
+
+    - 유니코드 정규화 (NFKC: 전각 문자 → 반각)
+    - 소문자 변환
+    - 연속 공백 → 단일 공백
+    - 한글 앞뒤 공백 제거 ("오늘 출고 현황" == "오늘출고현황")
+    """
+    normalized = unicodedata.normalize("NFKC", query or "").lower().strip()
+    normalized = _WHITESPACE_PATTERN.sub(" ", normalized)
+    normalized = _HANGUL_SPACE_PATTERN.sub("", normalized)
+    return normalized
+
+
+class TTLCache:
+    """
+    TTL + LRU 캐시 (스레드 안전)
+    - 항목은 ttl초 후 만료
+    - max_size 초과 시 가장 오래 사용되지 않은 항목 제거
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """캐시 저장"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+# 전역 캐시 인스턴스
+_classification_cache = None
+
+
+def get_classification_cache() -> TTLCache:
+    """쿼리 분류 결과 캐시 반환 (싱글톤)"""
+    global _classification_cache
+    if _classification_cache is None:
+        _classification_cache = TTLCache(
+            max_size=config.cache_max_size,
+            ttl=config.cache_ttl
+        )
+    return _classification_cache
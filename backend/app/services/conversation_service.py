@@ -0,0 +1,764 @@
+"""
+대화 서비스
+- 대화 문서(conversations)에는 제목, message_count 등 메타데이터만 저장
+- 메시지는 conversation_messages 컬렉션에 대화별 버킷(메시지 N개 묶음)으로 저장
+  → 대화가 길어져도 문서 크기(16MB 제한)와 턴당 쓰기 비용이 일정
+- 메시지마다 대화 내 순번(seq, 0부터)을 부여하고 seq 기준 커서로 페이지 조회
+- 버킷 크기는 대화 생성/이전 시 대화 문서(bucket_size)에 기록 (설정을 바꿔도 기존 대화의 버킷 계산은 그대로)
+- 이전 방식(대화 문서에 messages 배열 내장)의 대화는 처음 조회/저장할 때 버킷으로 이전
+- 대화 목록은 요약 필드만, updated_at 최신순 키셋(커서) 페이지 조회
+- 대화 턴 저장 / 첫 턴 제목 생성은 write-behind 큐에서 응답 반환 후 처리 (ChatTurnWriter)
+- 첫 턴 제목은 여러 대화를 모아 LLM 한 번 호출로 생성, bulk write 한 번으로 저장 (TitleBatcher)
+"""
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pymongo.errors import DuplicateKeyError
+from app.config import config
+from app.services.database_service import get_mongodb
+from app.services.llm_service import fallback_title, generate_title, generate_titles
+
+
+CONVERSATIONS_COLLECTION = "conversations"
+MESSAGES_COLLECTION = "conversation_messages"
+
+# 턴 저장 후 확인하는 대화 필드 (제목 자동 생성 여부 판단, 버킷 계산용)
+_TURN_PROJECTION = {"title": 1, "message_count": 1, "bucket_size": 1}
+# 내장 메시지 이전 선점 후 이 시간(초)이 지나면 다른 프로세스가 다시 선점 (이전 중 프로세스 종료 대비)
+MIGRATION_CLAIM_TIMEOUT = 60
+# 다른 프로세스가 이전 중인 대화를 기다리는 횟수 (0.1초, 0.2초, ... 간격)
+MIGRATION_WAIT_ATTEMPTS = 10
+# 새 대화 기본 제목 (첫 턴 저장 후 자동 생성 제목으로 교체)
+DEFAULT_TITLE = "새 대화"
+
+# 대화 목록(사이드바) 요약 필드
+CONVERSATION_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "conversation_id": 1,
+    "title": 1,
+    "message_count": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+# 대화 목록 정렬 (MONGODB_INDEXES의 (user_id, updated_at, conversation_id) 인덱스 순서와 동일)
+CONVERSATION_LIST_SORT = [("updated_at", -1), ("conversation_id", -1)]
+_CURSOR_SEPARATOR = "|"
+
+
+def parse_timestamp(value: str) -> datetime:
+    """ISO 8601 시각 → naive UTC datetime (MongoDB 저장 형식), 형식이 잘못되면 ValueError"""
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def encode_list_cursor(conversation: Dict[str, Any]) -> str:
+    """대화 목록 커서 (마지막 항목의 updated_at + conversation_id)"""
+    return f"{conversation['updated_at'].isoformat()}{_CURSOR_SEPARATOR}{conversation['conversation_id']}"
+
+
+def parse_list_cursor(cursor: str) -> Tuple[datetime, str]:
+    """대화 목록 커서 해석, 형식이 잘못되면 ValueError"""
+    updated_at, separator, conversation_id = cursor.partition(_CURSOR_SEPARATOR)
+    if not separator or not conversation_id:
+        raise ValueError(f"잘못된 커서: {cursor}")
+    return parse_timestamp(updated_at), conversation_id
+
+
+def build_conversation_list_query(user_id: str, cursor: Optional[str] = None,
+                                  since: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    대화 목록 조회 조건
+
+    Args:
+        cursor: 이전 페이지의 next_cursor (이 항목 이후, 즉 더 오래된 대화만)
+        since: 이 시각 이후 갱신된 대화만 (사이드바 증분 갱신)
+    """
+    query: Dict[str, Any] = {"user_id": user_id}
+    if since:
+        query["updated_at"] = {"$gt": since}
+    if cursor:
+        # 정렬 키 (updated_at, conversation_id) 기준 키셋: 같은 시각이면 conversation_id로 구분
+        updated_at, conversation_id = parse_list_cursor(cursor)
+        query["$or"] = [
+            {"updated_at": {"$lt": updated_at}},
+            {"updated_at": updated_at, "conversation_id": {"$lt": conversation_id}}
+        ]
+    return query
+
+
+class ConversationMessageStore:
+    """
+    대화 메시지 버킷 저장소
+
+    버킷 문서: {"conversation_id", "bucket": seq // bucket_size, "messages": [...], "count"}
+    bucket_size는 대화 문서에 기록된 값 사용 (기록이 없는 대화는 현재 설정값)
+    """
+
+    def __init__(self, bucket_size: Optional[int] = None):
+        self.mongodb = get_mongodb()
+        # 새 대화 / 이전하는 대화에 기록할 버킷 크기
+        self.bucket_size = bucket_size or config.database.mongodb_message_bucket_size
+
+    def bucket_size_of(self, conversation: Dict[str, Any]) -> int:
+        """대화의 버킷 크기"""
+        return conversation.get("bucket_size") or self.bucket_size
+
+    def get_conversation(self, conversation_id: str,
+                         projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """대화 조회 (내장 메시지가 남은 이전 방식 대화면 먼저 버킷으로 이전)"""
+        query = {"conversation_id": conversation_id, "messages": {"$exists": False}}
+        conversation = self.mongodb.find_one(CONVERSATIONS_COLLECTION, query, projection)
+        if conversation is None and self._migrate_lazily(conversation_id):
+            conversation = self.mongodb.find_one(CONVERSATIONS_COLLECTION, query, projection)
+        return conversation
+
+    def append(self, conversation_id: str, messages: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        메시지 추가
+
+        대화의 message_count를 먼저 증가시켜 순번 구간을 확보한 뒤 버킷에 $push
+        (동시에 저장해도 순번이 겹치지 않음)
+
+        Returns:
+            갱신된 대화 {"title", "message_count"} (대화가 없으면 None, 메시지도 저장하지 않음)
+        """
+        conversation = self.reserve(conversation_id, len(messages))
+        if conversation:
+            self.write_messages(
+                conversation_id, conversation["message_count"] - len(messages), messages,
+                self.bucket_size_of(conversation)
+            )
+        return conversation
+
+    def reserve(self, conversation_id: str, count: int) -> Optional[Dict[str, Any]]:
+        """
+        순번 count개 확보 (message_count 증가)
+        내장 메시지가 남은 대화는 갱신하지 않고 먼저 버킷으로 이전 (이전 메시지 뒤로 순번 확보)
+
+        Returns:
+            갱신된 대화 {"title", "message_count", "bucket_size"} 또는 None (대화 없음)
+        """
+        while True:
+            conversation = self.mongodb.find_one_and_update(
+                CONVERSATIONS_COLLECTION,
+                {"conversation_id": conversation_id, "messages": {"$exists": False}},
+                {
+                    "$inc": {"message_count": count},
+                    "$set": {"updated_at": datetime.utcnow()}
+                },
+                projection=_TURN_PROJECTION
+            )
+            if conversation is not None or not self._migrate_lazily(conversation_id):
+                return conversation
+
+    def write_messages(self, conversation_id: str, start: int, messages: List[Dict[str, Any]],
+                       bucket_size: int):
+        """
+        확보한 순번(start부터)으로 메시지를 버킷에 추가 (bucket_size: 대화의 버킷 크기)
+        같은 순번이 이미 있는 버킷에는 추가하지 않으므로 재시도해도 중복되지 않음
+        """
+        buckets: Dict[int, List[Dict[str, Any]]] = {}
+        for seq, message in enumerate(messages, start=start):
+            buckets.setdefault(seq // bucket_size, []).append({**message, "seq": seq})
+
+        # 한 턴은 대부분 한 버킷에 들어가므로 쓰기 1회
+        for bucket, bucket_messages in buckets.items():
+            query = {
+                "conversation_id": conversation_id,
+                "bucket": bucket,
+                "messages.seq": {"$ne": bucket_messages[0]["seq"]}
+            }
+            update = {
+                "$push": {"messages": {"$each": bucket_messages}},
+                "$inc": {"count": len(bucket_messages)}
+            }
+            try:
+                self.mongodb.update_one(MESSAGES_COLLECTION, query, update, upsert=True)
+            except DuplicateKeyError:
+                # 버킷이 이미 있음: 이미 추가된 순번(재시도)이거나 다른 턴이 동시에 버킷을 생성
+                # → upsert 없이 다시 (이미 추가됐으면 조건 불일치로 무시)
+                self.mongodb.update_one(MESSAGES_COLLECTION, query, update)
+
+    def page(self, conversation: Dict[str, Any], before: Optional[int] = None,
+             limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        메시지 페이지 조회 (최신 메시지부터 거슬러 올라감)
+
+        Args:
+            conversation: 대화 {"conversation_id", "message_count", "bucket_size"}
+            before: 이 순번 이전 메시지만 (이전 페이지의 next_cursor, None이면 최신 페이지)
+            limit: 페이지 크기 (기본: MONGODB_MESSAGE_PAGE_SIZE)
+
+        Returns:
+            {"messages": 오래된 순 메시지, "next_cursor": 더 이전 페이지의 before 값 (없으면 None)}
+        """
+        conversation_id = conversation["conversation_id"]
+        message_count = conversation.get("message_count", 0)
+        bucket_size = self.bucket_size_of(conversation)
+        limit = limit or config.database.mongodb_message_page_size
+        end = message_count if before is None else max(0, min(before, message_count))
+        start = max(0, end - limit)
+        if start >= end:
+            return {"messages": [], "next_cursor": None}
+
+        # 순번이 연속이므로 필요한 버킷 구간을 바로 계산
+        first_bucket, last_bucket = start // bucket_size, (end - 1) // bucket_size
+        buckets = self.mongodb.find(
+            MESSAGES_COLLECTION,
+            {"conversation_id": conversation_id, "bucket": {"$gte": first_bucket, "$lte": last_bucket}},
+            limit=last_bucket - first_bucket + 1,
+            projection={"messages": 1}
+        )
+        # 재시도로 같은 메시지가 두 번 추가된 경우 순번 기준으로 하나만
+        messages = {
+            message["seq"]: message
+            for bucket in buckets for message in bucket.get("messages", [])
+            if start <= message["seq"] < end
+        }
+        return {"messages": [messages[seq] for seq in sorted(messages)], "next_cursor": start if start > 0 else None}
+
+    def first_messages(self, conversation_id: str, count: int) -> List[Dict[str, Any]]:
+        """대화의 처음 count개 메시지 (제목 생성용)"""
+        bucket = self.mongodb.find_one(
+            MESSAGES_COLLECTION,
+            {"conversation_id": conversation_id, "bucket": 0},
+            projection={"messages": {"$slice": count}}
+        )
+        # 순번 기준으로 하나만 (이전 버전의 재시도로 중복 추가된 메시지 대비)
+        messages = {message["seq"]: message for message in (bucket.get("messages", []) if bucket else [])}
+        return [messages[seq] for seq in sorted(messages)][:count]
+
+    def delete(self, conversation_id: str) -> int:
+        """대화의 모든 메시지 버킷 삭제"""
+        return self.mongodb.delete_many(MESSAGES_COLLECTION, {"conversation_id": conversation_id})
+
+    def _migrate_lazily(self, conversation_id: str) -> bool:
+        """
+        내장 메시지가 남은 대화를 버킷으로 이전 (다른 프로세스가 이전 중이면 끝날 때까지 대기)
+
+        Returns:
+            대화가 있으면 True (없으면 False)
+
+        Raises:
+            RuntimeError: 다른 프로세스의 이전이 대기 시간 안에 끝나지 않음
+        """
+        for attempt in range(MIGRATION_WAIT_ATTEMPTS):
+            legacy = self.mongodb.find_one(
+                CONVERSATIONS_COLLECTION,
+                {"conversation_id": conversation_id, "messages": {"$exists": True}},
+                projection={"conversation_id": 1}
+            )
+            if legacy is None:
+                # 이전 방식이 아니거나 그 사이 이전 완료
+                return self.mongodb.find_one(
+                    CONVERSATIONS_COLLECTION, {"conversation_id": conversation_id}, projection={"_id": 1}
+                ) is not None
+            if self.migrate_embedded(legacy) is not None:
+                return True
+            time.sleep(0.1 * (attempt + 1))
+        raise RuntimeError(f"대화 메시지 이전 대기 시간 초과: {conversation_id}")
+
+    def migrate_embedded(self, conversation: Dict[str, Any]) -> Optional[int]:
+        """
+        대화 문서에 내장된 messages 배열을 버킷으로 이전 (이전 저장 방식 → 현재 방식)
+
+        - migrating 표시를 원자적으로 선점한 프로세스만 이전 (재실행 / 동시 실행해도 안전)
+        - 이전 전에 버킷으로 저장된 턴이 있으면(message_count > 0) 내장 메시지 뒤로 순번을 옮김
+        - 버킷을 다시 쓰기 전에 모든 메시지를 대화 문서에 모아 두므로 중간에 중단돼도 유실 없음
+        - 이전이 끝날 때까지 새 턴은 순번을 확보하지 않음 (reserve는 messages가 없는 대화만 갱신)
+
+        Returns:
+            이전한 메시지 수 (이미 이전됐거나 다른 프로세스가 이전 중이면 None)
+        """
+        conversation_id = conversation["conversation_id"]
+        claimed_at = datetime.utcnow()
+        claim = {"conversation_id": conversation_id, "migrating": claimed_at}
+        claimed = self.mongodb.find_one_and_update(
+            CONVERSATIONS_COLLECTION,
+            {
+                "conversation_id": conversation_id,
+                "messages": {"$exists": True},
+                "$or": [
+                    {"migrating": {"$exists": False}},
+                    {"migrating": {"$lt": claimed_at - timedelta(seconds=MIGRATION_CLAIM_TIMEOUT)}}
+                ]
+            },
+            {"$set": {"migrating": claimed_at}},
+            projection={"messages": 1, "message_count": 1}
+        )
+        if claimed is None:
+            return None
+
+        messages = list(claimed.get("messages") or [])
+        bucketed_count = claimed.get("message_count") or 0
+        if bucketed_count:
+            # 버킷에 먼저 저장된 턴을 내장 메시지 뒤에 붙여 대화 문서에 보관
+            buckets = self.mongodb.find(
+                MESSAGES_COLLECTION, {"conversation_id": conversation_id},
+                limit=bucketed_count, projection={"messages": 1}
+            )
+            bucketed = {message["seq"]: message for bucket in buckets for message in bucket.get("messages", [])}
+            messages += [bucketed[seq] for seq in sorted(bucketed)]
+            if not self.mongodb.update_one(
+                CONVERSATIONS_COLLECTION, claim, {"$set": {"messages": messages, "message_count": 0}}
+            ):
+                return None
+
+        # 남아 있던 버킷 정리 후 순번대로 다시 작성
+        self.delete(conversation_id)
+        for bucket_start in range(0, len(messages), self.bucket_size):
+            bucket_messages = [
+                {**message, "seq": seq}
+                for seq, message in enumerate(messages[bucket_start:bucket_start + self.bucket_size], start=bucket_start)
+            ]
+            self.mongodb.insert_one(MESSAGES_COLLECTION, {
+                "conversation_id": conversation_id,
+                "bucket": bucket_start // self.bucket_size,
+                "messages": bucket_messages,
+                "count": len(bucket_messages)
+            })
+
+        migrated = self.mongodb.update_one(
+            CONVERSATIONS_COLLECTION,
+            claim,
+            {
+                "$set": {"message_count": len(messages), "bucket_size": self.bucket_size},
+                "$unset": {"messages": "", "migrating": ""}
+            }
+        )
+        return len(messages) if migrated else None
+
+
+def needs_title(conversation: Optional[Dict[str, Any]]) -> bool:
+    """첫 질문/답변(총 2개 메시지) 저장 직후이고 제목이 기본값이면 자동 생성 대상"""
+    return bool(conversation) and conversation.get("message_count") == 2 and conversation.get("title") == DEFAULT_TITLE
+
+
+def assign_title(conversation_id: str, messages: List[Dict[str, Any]]) -> str:
+    """제목 생성 후 저장 (그 사이 사용자가 제목을 바꿨으면 덮어쓰지 않음, updated_at 갱신으로 since 목록 조회에 반영)"""
+    title = generate_title(messages)
+    get_mongodb().update_one(
+        CONVERSATIONS_COLLECTION,
+        {"conversation_id": conversation_id, "title": DEFAULT_TITLE},
+        {"$set": {"title": title, "updated_at": datetime.utcnow()}}
+    )
+    return title
+
+
+def persist_chat_turn(conversation_id: str, messages: List[Dict[str, Any]]) -> Optional[str]:
+    """대화 턴 저장 (동기), 첫 턴이면 생성한 제목 반환"""
+    conversation = get_message_store().append(conversation_id, messages)
+    return assign_title(conversation_id, messages) if needs_title(conversation) else None
+
+
+class TitleBatcher:
+    """
+    첫 턴 제목 일괄 생성
+    - batch_window_ms 동안 모인 대화(최대 max_batch_size개)를 LLM 한 번 호출로 처리 (generate_titles)
+    - LLM 응답이 timeout을 넘기거나 실패하면 첫 메시지 앞부분을 제목으로 사용
+    - 배치의 제목은 bulk write 한 번으로 저장 (그 사이 사용자가 바꾼 제목은 덮어쓰지 않음)
+    """
+
+    def __init__(
+        self,
+        mongodb: Any,
+        batch_window_ms: float,
+        max_batch_size: int,
+        max_concurrent_batches: int,
+        timeout: float
+    ):
+        self.mongodb = mongodb
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        # (대화 ID, 메시지, Future, 요청 시각)
+        self._pending: List[Tuple[str, List[Dict[str, Any]], Future, float]] = []
+        self._running = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches,
+            thread_name_prefix="title-batch"
+        )
+        self.requests = 0
+        self.batches = 0
+        self.batched = 0
+        self.largest_batch = 0
+        self.llm_calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.write_failures = 0
+        self.total_llm_ms = 0.0
+        self.total_latency_ms = 0.0
+
+        threading.Thread(target=self._collect_loop, name="title-batcher", daemon=True).start()
+
+    def submit(self, conversation_id: str, messages: List[Dict[str, Any]], future: Optional[Future] = None) -> Future:
+        """제목 생성 요청 (저장 완료 시 제목으로 완료되는 Future)"""
+        future = future or Future()
+        item = (conversation_id, messages, future, time.monotonic())
+        with self._cond:
+            self.requests += 1
+            if not self._closed:
+                self._pending.append(item)
+                self._cond.notify()
+                return future
+            self._running += 1
+
+        # 종료 중: LLM 없이 바로 저장
+        self._run_batch([item], use_llm=False)
+        return future
+
+    def _collect_loop(self):
+        """대기 중인 대화를 모아서 배치 실행"""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+
+                # 배치 윈도우 동안 추가 요청 대기 (최대 크기에 도달하면 즉시 실행)
+                deadline = time.monotonic() + self.batch_window
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._pending[:self.max_batch_size]
+                self._pending = self._pending[self.max_batch_size:]
+                if not batch:
+                    continue
+                self._running += 1
+
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[Tuple[str, List[Dict[str, Any]], Future, float]], use_llm: bool = True):
+        """배치 제목 생성 → bulk write 1회 → 요청자에게 제목 전달"""
+        try:
+            conversations = {conversation_id: messages for conversation_id, messages, _, _ in batch}
+            llm_started = time.perf_counter()
+            if use_llm:
+                titles, outcome = generate_titles(conversations, timeout=self.timeout)
+            else:
+                titles, outcome = {cid: fallback_title(messages) for cid, messages in conversations.items()}, "skipped"
+            llm_ms = (time.perf_counter() - llm_started) * 1000
+
+            try:
+                # updated_at도 갱신해야 since 목록 조회(사이드바 증분 갱신)에 제목이 반영됨
+                saved_at = datetime.utcnow()
+                self.mongodb.bulk_update(CONVERSATIONS_COLLECTION, [
+                    (
+                        {"conversation_id": conversation_id, "title": DEFAULT_TITLE},
+                        {"$set": {"title": title, "updated_at": saved_at}}
+                    )
+                    for conversation_id, title in titles.items()
+                ])
+            except Exception as e:
+                print(f"제목 저장 실패 ({len(titles)}개 대화): {e}")
+                with self._cond:
+                    self.write_failures += 1
+                for _, _, future, _ in batch:
+                    future.set_exception(e)
+                return
+
+            finished = time.monotonic()
+            with self._cond:
+                self.batches += 1
+                self.batched += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+                if outcome != "skipped":
+                    self.llm_calls += 1
+                    self.total_llm_ms += llm_ms
+                self.timeouts += outcome == "timeout"
+                self.errors += outcome == "error"
+                self.total_latency_ms += sum((finished - requested) * 1000 for _, _, _, requested in batch)
+
+            for conversation_id, _, future, _ in batch:
+                future.set_result(titles[conversation_id])
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        종료: 대기 중인 요청은 LLM 없이(첫 메시지 앞부분) 바로 저장,
+        실행 중인 배치는 timeout까지 대기 (시간 내 완료 여부 반환)
+        """
+        with self._cond:
+            self._closed = True
+            batch, self._pending = self._pending, []
+            if batch:
+                self._running += 1
+            self._cond.notify_all()
+        if batch:
+            self._run_batch(batch, use_llm=False)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """제목 일괄 생성 통계"""
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "pending": len(self._pending),
+                "running_batches": self._running,
+                "batches": self.batches,
+                "avg_batch_size": self.batched / self.batches if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "llm_calls": self.llm_calls,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "write_failures": self.write_failures,
+                "avg_llm_ms": self.total_llm_ms / self.llm_calls if self.llm_calls else 0.0,
+                # 요청부터 제목 저장까지 (배치 대기 포함)
+                "avg_latency_ms": self.total_latency_ms / self.batched if self.batched else 0.0
+            }
+
+
+class ChatTurnWriter:
+    """
+    대화 턴 write-behind 저장
+    - 요청 스레드는 큐에 넣고 바로 반환, 백그라운드 스레드가 순서대로 저장 (턴당 버킷 $push 1회)
+    - 메시지 추가는 실패 시 지수 백오프 재시도 (순번 조건으로 중복 추가 없음)
+    - 순번 확보($inc)는 재시도하지 않음 (재시도하면 순번이 두 번 증가, 일시 장애는 드라이버의 retryable write가 처리)
+    - 큐가 가득 차면 역압: 그 대화의 턴이 큐에 없으면 요청 스레드에서 바로 저장,
+      있으면 순서가 바뀌지 않도록 빈자리가 날 때까지 대기 (enqueue_timeout 초과 시 실패 처리)
+    - 첫 턴 제목 생성은 TitleBatcher에 위임 (LLM 호출이 저장 큐를 막지 않도록)
+    - 종료 시 flush()로 남은 턴 저장
+    """
+
+    def __init__(self, store: ConversationMessageStore, title_batcher: TitleBatcher,
+                 queue_size: int, max_retries: int, retry_backoff: float, enqueue_timeout: float):
+        self.store = store
+        self.title_batcher = title_batcher
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: "queue.Queue[Tuple[str, List[Dict[str, Any]], Future]]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        # 대화별 저장 대기 중인 턴 수 (큐 + 요청 스레드 저장 중)
+        self._pending_turns: Dict[str, int] = {}
+        self._closed = False
+        self.submitted = 0
+        self.written = 0
+        self.overflow = 0
+        self.blocked = 0
+        self.retries = 0
+        self.failed = 0
+        self.total_write_ms = 0.0
+
+        threading.Thread(target=self._write_loop, name="chat-turn-writer", daemon=True).start()
+
+    def submit(self, conversation_id: str, messages: List[Dict[str, Any]]) -> Future:
+        """
+        턴 저장 요청
+
+        Returns:
+            저장(첫 턴이면 제목 생성까지) 완료 시 생성된 제목 또는 None으로 완료되는 Future
+        """
+        future: Future = Future()
+        item = (conversation_id, messages, future)
+        with self._lock:
+            self.submitted += 1
+            closed = self._closed
+            queued = self._pending_turns.get(conversation_id, 0)
+            self._pending_turns[conversation_id] = queued + 1
+
+        try:
+            if not closed:
+                self._queue.put_nowait(item)
+                return future
+        except queue.Full:
+            pass
+
+        if not queued:
+            # 이 대화의 앞선 턴이 없으므로 바로 저장해도 순서가 유지됨
+            with self._lock:
+                self.overflow += 1
+            try:
+                self._write(conversation_id, messages, future)
+            finally:
+                self._turn_done(conversation_id)
+            return future
+
+        # 앞선 턴이 큐에 있음: 뒤에 넣어야 순서가 유지되므로 빈자리 대기
+        with self._lock:
+            self.blocked += 1
+        try:
+            self._queue.put(item, timeout=self.enqueue_timeout)
+        except queue.Full:
+            error = RuntimeError(f"대화 저장 큐 대기 시간 초과 ({self.enqueue_timeout}초)")
+            with self._lock:
+                self.failed += 1
+            print(f"대화 저장 실패 ({conversation_id}): {error}")
+            self._turn_done(conversation_id)
+            future.set_exception(error)
+        return future
+
+    def _turn_done(self, conversation_id: str):
+        """대화별 대기 턴 수 감소"""
+        with self._lock:
+            remaining = self._pending_turns.get(conversation_id, 1) - 1
+            if remaining:
+                self._pending_turns[conversation_id] = remaining
+            else:
+                self._pending_turns.pop(conversation_id, None)
+
+    def _write_loop(self):
+        """큐에 쌓인 턴 저장"""
+        while True:
+            conversation_id, messages, future = self._queue.get()
+            try:
+                self._write(conversation_id, messages, future)
+            finally:
+                self._turn_done(conversation_id)
+                self._queue.task_done()
+
+    def _write(self, conversation_id: str, messages: List[Dict[str, Any]], future: Future):
+        """턴 저장 후 첫 턴이면 제목 생성 예약"""
+        started = time.perf_counter()
+        try:
+            # 순번 확보는 멱등이 아니므로 재시도하지 않음
+            conversation = self.store.reserve(conversation_id, len(messages))
+            if conversation:
+                start = conversation["message_count"] - len(messages)
+                bucket_size = self.store.bucket_size_of(conversation)
+                self._retry(lambda: self.store.write_messages(conversation_id, start, messages, bucket_size))
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            print(f"대화 저장 실패 ({conversation_id}): {e}")
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self.written += 1
+            self.total_write_ms += (time.perf_counter() - started) * 1000
+
+        if needs_title(conversation):
+            self.title_batcher.submit(conversation_id, messages, future)
+        else:
+            future.set_result(None)
+
+    def _retry(self, operation: Callable[[], Any]) -> Any:
+        """지수 백오프 재시도 (max_retries회까지)"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return operation()
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """큐에 남은 턴이 모두 저장될 때까지 대기 (시간 내 완료 여부 반환)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """종료: 이후 요청은 바로 저장 (그 대화의 턴이 큐에 있으면 뒤에 추가), 남은 턴 flush 후 제목 생성 마무리 (timeout은 둘을 합친 시간)"""
+        with self._lock:
+            self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        flushed = self.flush(timeout)
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        return self.title_batcher.close(remaining) and flushed
+
+    def stats(self) -> Dict[str, Any]:
+        """write-behind 저장 통계"""
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "written": self.written,
+                "pending": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "overflow": self.overflow,
+                "blocked": self.blocked,
+                "retries": self.retries,
+                "failed": self.failed,
+                "avg_write_ms": self.total_write_ms / self.written if self.written else 0.0
+            }
+
+
+# 전역 인스턴스
+_message_store = None
+
+
+def get_message_store() -> ConversationMessageStore:
+    """대화 메시지 저장소 반환"""
+    global _message_store
+    if _message_store is None:
+        _message_store = ConversationMessageStore()
+    return _message_store
+
+
+_chat_turn_writer = None
+_chat_turn_writer_lock = threading.Lock()
+
+
+def get_chat_turn_writer() -> ChatTurnWriter:
+    """
+    대화 턴 write-behind 저장기 반환
+    스레드를 가지므로 처음 사용할 때 생성 (serve.py preload 시 fork 전에 만들지 않음)
+    """
+    global _chat_turn_writer
+    if _chat_turn_writer is None:
+        with _chat_turn_writer_lock:
+            if _chat_turn_writer is None:
+                _chat_turn_writer = ChatTurnWriter(
+                    get_message_store(),
+                    TitleBatcher(
+                        get_mongodb(),
+                        batch_window_ms=config.chat_title_batch_window_ms,
+                        max_batch_size=config.chat_title_batch_max_size,
+                        max_concurrent_batches=config.chat_title_batch_max_concurrency,
+                        timeout=config.chat_title_batch_timeout
+                    ),
+                    queue_size=config.chat_write_queue_size,
+                    max_retries=config.chat_write_max_retries,
+                    retry_backoff=config.chat_write_retry_backoff,
+                    enqueue_timeout=config.chat_write_enqueue_timeout
+                )
+                atexit.register(shutdown_chat_turn_writer)
+    return _chat_turn_writer
+
+
+def shutdown_chat_turn_writer():
+    """남은 대화 턴 저장 후 종료 (프로세스 종료 / ASGI lifespan shutdown)"""
+    if _chat_turn_writer is None:
+        return
+    pending = _chat_turn_writer.stats()["pending"]
+    if not _chat_turn_writer.close(timeout=config.chat_write_flush_timeout):
+        print(f"⚠ 대화 저장 대기 시간 초과: {_chat_turn_writer.stats()['pending']}/{pending}개 턴 미저장")
+
+
+def get_chat_turn_write_stats() -> Optional[Dict[str, Any]]:
+    """write-behind 저장 통계 (아직 사용 전이면 None)"""
+    return _chat_turn_writer.stats() if _chat_turn_writer else None
+
+
+def get_title_batch_stats() -> Optional[Dict[str, Any]]:
+    """제목 일괄 생성 통계 (아직 사용 전이면 None)"""
+    return _chat_turn_writer.title_batcher.stats() if _chat_turn_writer else None
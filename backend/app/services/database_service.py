@@ -2,27 +2,240 @@
 데이터베이스 서비스
 MongoDB (부품 정보) 및 pgvector (문서 벡터) 연동
 """
-from typing import List, Dict, Any, Optional
-from pymongo import MongoClient
+import asyncio
+import io
+import json
+import math
+import re
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, MongoClient, ReturnDocument, UpdateOne
+from motor.motor_asyncio import AsyncIOMotorClient
 import psycopg2
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2 import extensions
+from psycopg2.extras import execute_values, Json, RealDictCursor
+import asyncpg
+from pgvector.asyncpg import register_vector
+from pgvector.utils import to_db_binary
+import numpy as np
 from app.config import config
 
 
+# 부품명 검색 토큰 필드 (ngram 모드, 적재 시 part_search_tokens로 계산)
+PART_SEARCH_TOKEN_FIELD = "search_tokens"
+_PART_SEARCH_INDEXES = {
+    # 문자 bigram 토큰 (공백/조사와 무관한 한국어 부분 일치)
+    "ngram": ([(PART_SEARCH_TOKEN_FIELD, ASCENDING)], {}),
+    # MongoDB 텍스트 인덱스 (공백 단위 토큰, 형태소 분석 없음)
+    "text": ([("part_name", TEXT)], {"default_language": "none"})
+}
+_PART_SEARCH_NORMALIZE_PATTERN = re.compile(r"[\W_]+")
+
+
+def part_search_tokens(text: str) -> List[str]:
+    """
+    부품명 검색 토큰 (소문자, 공백/기호 제거 후 문자 bigram)
+    "반도체 칩 A" → ["반도", "도체", "체칩", "칩a"] → "반도체칩", "도체 칩" 등 띄어쓰기가 달라도 일치
+    """
+    compact = _PART_SEARCH_NORMALIZE_PATTERN.sub("", (text or "").lower())
+    if len(compact) < 2:
+        return [compact] if compact else []
+    return list(dict.fromkeys(compact[i:i + 2] for i in range(len(compact) - 1)))
+
+
+def part_search_terms(keywords: List[str]) -> List[Tuple[List[str], int]]:
+    """
+    키워드별 (검색 토큰, 최소 일치 토큰 수) - ngram 검색에서 bigram 하나만 겹치는 부품 제외
+    최소 일치 수 = ceil(토큰 수 × MONGODB_PART_SEARCH_MIN_OVERLAP), 최소 1
+    """
+    terms = []
+    for keyword in keywords:
+        tokens = part_search_tokens(keyword)
+        if tokens:
+            terms.append((tokens, max(1, math.ceil(len(tokens) * config.database.mongodb_part_search_min_overlap))))
+    return terms
+
+
+def aggregation_projection(projection: Dict[str, Any]) -> Dict[str, Any]:
+    """find 프로젝션 → aggregation $project ({"$slice": n} → {"$slice": ["$필드", n]})"""
+    converted = {}
+    for field_name, value in projection.items():
+        if isinstance(value, dict) and "$slice" in value:
+            arguments = value["$slice"] if isinstance(value["$slice"], list) else [value["$slice"]]
+            value = {"$slice": [f"${field_name}", *arguments]}
+        converted[field_name] = value
+    return converted
+
+
+def _token_overlap(tokens: List[str]) -> Dict[str, Any]:
+    """부품 검색 토큰 중 tokens와 겹치는 수 (aggregation 식)"""
+    return {"$size": {"$setIntersection": [f"${PART_SEARCH_TOKEN_FIELD}", tokens]}}
+
+
+def build_part_search_pipeline(keywords: List[str], limit: int,
+                               projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    부품명 검색 aggregation (키워드 전체를 한 번의 인덱스 조회로 처리, 관련도순)
+    - ngram: 토큰 $in 조회 → 키워드 하나라도 최소 일치 수 이상인 부품만 → 일치 토큰 수로 정렬
+    - text: $text 조회 → textScore로 정렬
+    사용자 입력은 정규식/검색 문법으로 해석되지 않도록 값으로만 전달 (text 모드는 부정(-)·구문(") 기호 제거)
+    projection: 결과 필드 (find 프로젝션 형식, 없으면 검색용 필드만 제외)
+    """
+    if config.database.mongodb_part_search_mode == "text":
+        terms = [keyword.replace('"', " ").replace("\\", " ").strip().lstrip("-") for keyword in keywords]
+        match = {"$text": {"$search": " ".join(term for term in terms if term)}}
+        scoring = [{"$addFields": {"_search_score": {"$meta": "textScore"}}}]
+    else:
+        terms = part_search_terms(keywords)
+        tokens = list(dict.fromkeys(token for keyword_tokens, _ in terms for token in keyword_tokens))
+        match = {PART_SEARCH_TOKEN_FIELD: {"$in": tokens}}
+        scoring = [
+            {"$addFields": {
+                "_search_score": _token_overlap(tokens),
+                "_search_hit": {"$or": [
+                    {"$gte": [_token_overlap(keyword_tokens), min_overlap]} for keyword_tokens, min_overlap in terms
+                ]}
+            }},
+            {"$match": {"_search_hit": True}}
+        ]
+
+    return [
+        {"$match": match},
+        *scoring,
+        {"$sort": {"_search_score": -1, "part_number": 1}},
+        {"$limit": limit},
+        {"$project": aggregation_projection(projection) if projection else
+            {"_search_score": 0, "_search_hit": 0, PART_SEARCH_TOKEN_FIELD: 0}}
+    ]
+
+
+# MongoDB 인덱스 정의 (컬렉션 → [(키, 옵션)])
+# MongoDBService 생성 시 ensure_indexes()로 생성 (이미 있으면 그대로)
+MONGODB_INDEXES: Dict[str, List[Tuple[List[Tuple[str, int]], Dict[str, Any]]]] = {
+    # 엔티티별 부품 조회
+    "parts": [
+        ([("part_number", ASCENDING)], {}),
+        # 부품명 검색 (MONGODB_PART_SEARCH_MODE)
+        _PART_SEARCH_INDEXES[config.database.mongodb_part_search_mode],
+    ],
+    # 대화 턴 저장(message_count 증가) / 조회, 사용자별 대화 목록 (updated_at 최신순 키셋 페이지)
+    "conversations": [
+        ([("conversation_id", ASCENDING)], {}),
+        ([("user_id", ASCENDING), ("updated_at", DESCENDING), ("conversation_id", DESCENDING)], {}),
+    ],
+    # 대화 메시지 버킷 (메시지 추가 upsert, 페이지 조회는 bucket 범위)
+    "conversation_messages": [
+        ([("conversation_id", ASCENDING), ("bucket", ASCENDING)], {"unique": True}),
+    ],
+    # 메모리 upsert (user_id, category, key), 사용자별 조회는 앞부분(user_id[, category]) 사용
+    "user_memories": [
+        ([("user_id", ASCENDING), ("category", ASCENDING), ("key", ASCENDING)], {}),
+    ],
+    "feedback": [
+        ([("feedback_type", ASCENDING)], {}),
+    ],
+    "document_metadata": [
+        ([("document_id", ASCENDING)], {}),
+    ],
+}
+
+
+def query_shape(query: Dict[str, Any]) -> str:
+    """쿼리 형태 (필드와 연산자만, 값 제외) - COLLSCAN 집계 키"""
+    parts = []
+    for key, value in query.items():
+        if key in ("$or", "$and", "$nor") and isinstance(value, list):
+            parts.append(f"{key}[{' | '.join(query_shape(branch) for branch in value)}]")
+        elif isinstance(value, dict) and value and all(k.startswith("$") for k in value):
+            parts.append(f"{key}:{','.join(sorted(value))}")
+        else:
+            parts.append(key)
+    return "{" + ", ".join(parts) + "}"
+
+
+def summarize_plan(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """explain 결과 요약 (실행 단계, 사용 인덱스, COLLSCAN 여부, 검사 문서 수)"""
+    winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    # MongoDB 7 (SBE 엔진)은 queryPlan 아래에 단계 트리가 있음
+    winning_plan = winning_plan.get("queryPlan", winning_plan)
+
+    stages, indexes = [], []
+    pending = [winning_plan]
+    while pending:
+        node = pending.pop()
+        if "stage" in node:
+            stages.append(node["stage"])
+        if node.get("indexName"):
+            indexes.append(node["indexName"])
+        if "inputStage" in node:
+            pending.append(node["inputStage"])
+        pending.extend(node.get("inputStages", []))
+
+    execution = explain.get("executionStats", {})
+    return {
+        "stages": stages,
+        "indexes": indexes,
+        "collscan": "COLLSCAN" in stages,
+        "docs_examined": execution.get("totalDocsExamined"),
+        "keys_examined": execution.get("totalKeysExamined"),
+        "returned": execution.get("nReturned")
+    }
+
+
 class MongoDBService:
     """실제 MongoDB 서비스"""
 
     def __init__(self):
         self.client = MongoClient(config.database.mongodb_uri)
         self.db = self.client[config.database.mongodb_database]
+        if config.database.mongodb_ensure_indexes:
+            self.ensure_indexes()
+
+    def ensure_indexes(self, indexes: Optional[Dict[str, List[Tuple[List[Tuple[str, int]], Dict[str, Any]]]]] = None):
+        """인덱스 생성 (없을 경우, 기본값 MONGODB_INDEXES)"""
+        for collection, specs in (indexes or MONGODB_INDEXES).items():
+            self.db[collection].create_indexes([IndexModel(keys, **options) for keys, options in specs])
+        self.check_part_search_tokens()
 
-    def find(self, collection: str, query: Dict[str, Any], limit: int = 100) -> List[Dict[str, Any]]:
-        """문서 검색"""
-        return list(self.db[collection].find(query).limit(limit))
+    def check_part_search_tokens(self) -> bool:
+        """ngram 모드인데 search_tokens가 없는 부품이 있으면 경고 (검색에서 빠짐, 백필 필요)"""
+        if config.database.mongodb_part_search_mode != "ngram":
+            return True
+        if self.db["parts"].find_one({PART_SEARCH_TOKEN_FIELD: {"$exists": False}}, {"_id": 1}) is None:
+            return True
+        print(f"⚠️  MONGODB_PART_SEARCH_MODE=ngram 이지만 {PART_SEARCH_TOKEN_FIELD}가 없는 부품이 있습니다 "
+              "(부품명 검색 결과에서 빠짐). 백필 필요: python scripts/backfill_part_search_tokens.py")
+        return False
 
-    def find_one(self, collection: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def explain(self, collection: str, query: Dict[str, Any]) -> Dict[str, Any]:
+        """쿼리 실행 계획 요약 (summarize_plan 형식)"""
+        return summarize_plan(self.db[collection].find(query).explain())
+
+    def explain_write(self, collection: str, query: Dict[str, Any],
+                      update: Optional[Dict[str, Any]] = None, upsert: bool = False) -> Dict[str, Any]:
+        """쓰기 쿼리 실행 계획 요약 (update가 있으면 update, 없으면 delete 명령, 문서는 변경되지 않음)"""
+        if update is not None:
+            command = {"update": collection, "updates": [{"q": query, "u": update, "upsert": upsert}]}
+        else:
+            command = {"delete": collection, "deletes": [{"q": query, "limit": 0}]}
+        return summarize_plan(self.db.command("explain", command, verbosity="executionStats"))
+
+    def find(self, collection: str, query: Dict[str, Any], limit: int = 100,
+             projection: Optional[Dict[str, Any]] = None,
+             sort: Optional[List[Tuple[str, int]]] = None) -> List[Dict[str, Any]]:
+        """문서 검색 (projection: 가져올 필드, 배열은 {"$slice": n}으로 일부만, sort: [(필드, 1 | -1)])"""
+        cursor = self.db[collection].find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return list(cursor.limit(limit))
+
+    def find_one(self, collection: str, query: Dict[str, Any],
+                 projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """단일 문서 검색"""
-        return self.db[collection].find_one(query)
+        return self.db[collection].find_one(query, projection)
 
     def insert_one(self, collection: str, document: Dict[str, Any]) -> str:
         """문서 추가"""
@@ -34,111 +247,1078 @@ class MongoDBService:
         result = self.db[collection].insert_many(documents)
         return [str(id) for id in result.inserted_ids]
 
-    def update_one(self, collection: str, query: Dict[str, Any], update: Dict[str, Any]) -> bool:
-        """문서 업데이트"""
-        result = self.db[collection].update_one(query, update)
-        return result.modified_count > 0
+    def update_one(self, collection: str, query: Dict[str, Any], update: Dict[str, Any],
+                   upsert: bool = False) -> bool:
+        """문서 업데이트 (upsert: 없으면 생성)"""
+        result = self.db[collection].update_one(query, update, upsert=upsert)
+        return result.modified_count > 0 or result.upserted_id is not None
+
+    def find_one_and_update(self, collection: str, query: Dict[str, Any], update: Dict[str, Any],
+                            projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """문서 업데이트 후 갱신된 문서 반환 (없으면 None) - 카운터 증가와 조회를 한 번에"""
+        return self.db[collection].find_one_and_update(
+            query, update, projection=projection, return_document=ReturnDocument.AFTER
+        )
+
+    def bulk_update(self, collection: str, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """여러 문서 업데이트를 bulk_write 한 번으로 실행 ([(조회 조건, 업데이트)], 수정된 문서 수 반환)"""
+        if not updates:
+            return 0
+        requests = [UpdateOne(query, update) for query, update in updates]
+        return self.db[collection].bulk_write(requests, ordered=False).modified_count
 
     def delete_one(self, collection: str, query: Dict[str, Any]) -> bool:
         """문서 삭제"""
         result = self.db[collection].delete_one(query)
         return result.deleted_count > 0
 
+    def delete_many(self, collection: str, query: Dict[str, Any]) -> int:
+        """조건에 맞는 문서 모두 삭제 (삭제 수 반환)"""
+        return self.db[collection].delete_many(query).deleted_count
+
     def aggregate(self, collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Aggregation 쿼리"""
         return list(self.db[collection].aggregate(pipeline))
 
+    def search_parts(self, keywords: List[str], limit: int = 10,
+                     projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """부품명 키워드 검색 (인덱스 사용, 관련도순)"""
+        if not keywords:
+            return []
+        return self.aggregate("parts", build_part_search_pipeline(keywords, limit, projection))
+
+    def backfill_part_search_tokens(self, batch_size: int = 1000) -> int:
+        """기존 부품 문서에 검색 토큰 추가 (ngram 모드 전환용, 재실행해도 안전)"""
+        updated = 0
+        batch = []
+        for part in self.db["parts"].find({}, {"part_name": 1}):
+            batch.append(UpdateOne(
+                {"_id": part["_id"]},
+                {"$set": {PART_SEARCH_TOKEN_FIELD: part_search_tokens(part.get("part_name", ""))}}
+            ))
+            if len(batch) >= batch_size:
+                updated += self.db["parts"].bulk_write(batch, ordered=False).modified_count
+                batch = []
+        if batch:
+            updated += self.db["parts"].bulk_write(batch, ordered=False).modified_count
+        return updated
+
+
+class QueryPlanChecker:
+    """
+    MongoDB 쿼리 실행 계획 검사 래퍼 (개발/테스트용, MONGODB_EXPLAIN_QUERIES=True)
+    조회(find/find_one)와 쓰기(update/upsert/find_one_and_update/bulk_update/delete) 실행 전에
+    explain으로 계획을 확인하고 COLLSCAN이면 쿼리 형태별로 경고/집계
+    """
+
+    def __init__(self, mongodb: Any):
+        self.mongodb = mongodb
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.collscans: Dict[str, int] = {}
+
+    def check(self, collection: str, query: Dict[str, Any], update: Optional[Dict[str, Any]] = None,
+              upsert: bool = False, write: bool = False) -> Dict[str, Any]:
+        """실행 계획 확인 (write면 쓰기 명령으로 explain, COLLSCAN이면 쿼리 형태별 첫 발생 시 경고 출력)"""
+        if write:
+            plan = self.mongodb.explain_write(collection, query, update, upsert=upsert)
+            key = f"{collection} {'update' if update is not None else 'delete'} {query_shape(query)}"
+        else:
+            plan = self.mongodb.explain(collection, query)
+            key = f"{collection} {query_shape(query)}"
+        with self._lock:
+            self.checked += 1
+            if plan["collscan"]:
+                first = key not in self.collscans
+                self.collscans[key] = self.collscans.get(key, 0) + 1
+        if plan["collscan"] and first:
+            print(f"⚠ COLLSCAN: {key} (검사 문서 {plan['docs_examined']}개)")
+        return plan
+
+    def find(self, collection: str, query: Dict[str, Any], *args, **kwargs) -> List[Dict[str, Any]]:
+        self.check(collection, query)
+        return self.mongodb.find(collection, query, *args, **kwargs)
+
+    def find_one(self, collection: str, query: Dict[str, Any], *args, **kwargs) -> Optional[Dict[str, Any]]:
+        self.check(collection, query)
+        return self.mongodb.find_one(collection, query, *args, **kwargs)
+
+    def update_one(self, collection: str, query: Dict[str, Any], update: Dict[str, Any],
+                   upsert: bool = False) -> bool:
+        self.check(collection, query, update, upsert=upsert, write=True)
+        return self.mongodb.update_one(collection, query, update, upsert=upsert)
+
+    def find_one_and_update(self, collection: str, query: Dict[str, Any], update: Dict[str, Any],
+                            *args, **kwargs) -> Optional[Dict[str, Any]]:
+        self.check(collection, query, update, write=True)
+        return self.mongodb.find_one_and_update(collection, query, update, *args, **kwargs)
+
+    def bulk_update(self, collection: str, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        # 같은 형태의 쿼리는 한 번만 검사
+        shapes = {}
+        for query, update in updates:
+            shapes.setdefault(query_shape(query), (query, update))
+        for query, update in shapes.values():
+            self.check(collection, query, update, write=True)
+        return self.mongodb.bulk_update(collection, updates)
+
+    def delete_one(self, collection: str, query: Dict[str, Any]) -> bool:
+        self.check(collection, query, write=True)
+        return self.mongodb.delete_one(collection, query)
+
+    def delete_many(self, collection: str, query: Dict[str, Any]) -> int:
+        self.check(collection, query, write=True)
+        return self.mongodb.delete_many(collection, query)
+
+    def stats(self) -> Dict[str, Any]:
+        """검사 통계 반환"""
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "collscans": dict(self.collscans)
+            }
+
+    def __getattr__(self, name: str):
+        # 그 외 메서드는 원래 MongoDB 서비스로 위임
+        return getattr(self.mongodb, name)
+
+
+# document_chunks.embedding HNSW 인덱스 이름 (저장 모드별)
+EMBEDDING_INDEX_NAME = "idx_document_chunks_embedding"
+EMBEDDING_INDEX_NAMES = {
+    "full": EMBEDDING_INDEX_NAME,
+    "halfvec": f"{EMBEDDING_INDEX_NAME}_halfvec",
+    "binary": f"{EMBEDDING_INDEX_NAME}_bit"
+}
+
+
+def embedding_index_name(mode: Optional[str] = None) -> str:
+    """저장 모드의 임베딩 인덱스 이름 (내적 인덱스면 _ip, 앞부분 차원 인덱스면 _p{차원} 접미사)"""
+    mode = mode or config.database.vector_storage_mode
+    name = EMBEDDING_INDEX_NAMES[mode]
+    if config.database.vector_normalized and mode != "binary":
+        name += "_ip"
+    prefix = _prefix_dimension()
+    return f"{name}_p{prefix}" if prefix else name
+
+
+def _prefix_dimension() -> int:
+    """인덱스에 사용할 임베딩 앞부분 차원 (전체 차원을 쓰면 0)"""
+    dimension = config.database.vector_index_dimension
+    if dimension < 0 or dimension > config.llm.embedding_dimension:
+        raise ValueError(
+            f"VECTOR_INDEX_DIMENSION({dimension})은 0 ~ LLM_EMBEDDING_DIMENSION({config.llm.embedding_dimension}) 범위여야 합니다."
+        )
+    return dimension if dimension < config.llm.embedding_dimension else 0
+
+
+def normalize_embedding(embedding: Any) -> List[float]:
+    """L2 정규화 (vector_normalized 모드에서 적재/검색 임베딩에 적용)"""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return (vector / norm).tolist() if norm else vector.tolist()
+
+
+def _distance_operator() -> str:
+    """
+    float 벡터 거리 연산자
+    정규화 모드면 음의 내적(<#>, 노름 계산 없음), 아니면 코사인 거리(<=>). 단위 벡터에서는 순위가 같음
+    """
+    return "<#>" if config.database.vector_normalized else "<=>"
+
+
+def _similarity(column_sql: str, query_sql: str) -> str:
+    """유사도 점수 식 (코사인 유사도, 정규화 모드면 내적 = 코사인 유사도)"""
+    if config.database.vector_normalized:
+        return f"-({column_sql} <#> {query_sql})"
+    return f"1 - ({column_sql} <=> {query_sql})"
+
+
+# COPY BINARY 포맷 헤더 (시그니처 + flags + 헤더 확장 길이)
+_COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_BINARY_TRAILER = struct.pack(">h", -1)
+
+
+def _encode_copy_binary(rows: Iterable[tuple]) -> io.BytesIO:
+    """
+    document_chunks 행을 COPY BINARY 스트림으로 인코딩
+    컬럼 순서: id, document_id, chunk_index, content, chunk_type, embedding, metadata
+    """
+    buffer = io.BytesIO()
+    buffer.write(_COPY_BINARY_HEADER)
+
+    for row_id, document_id, chunk_index, content, chunk_type, embedding, metadata in rows:
+        fields = [
+            struct.pack(">i", row_id),                    # integer (serial)
+            document_id.encode("utf-8"),
+            struct.pack(">i", chunk_index),
+            content.encode("utf-8"),
+            chunk_type.encode("utf-8") if chunk_type is not None else None,
+            to_db_binary(embedding),                      # vector: dim(int16) + unused(int16) + float32[]
+            # jsonb: version(1) + JSON 텍스트
+            b"\x01" + json.dumps(metadata, ensure_ascii=False, default=str).encode("utf-8")
+            if metadata is not None else None
+        ]
+
+        buffer.write(struct.pack(">h", len(fields)))
+        for value in fields:
+            if value is None:
+                buffer.write(struct.pack(">i", -1))
+            else:
+                buffer.write(struct.pack(">i", len(value)))
+                buffer.write(value)
+
+    buffer.write(_COPY_BINARY_TRAILER)
+    buffer.seek(0)
+    return buffer
+
+
+# 메타데이터 필터 연산자 (MongoDB 쿼리 문법과 동일)
+_RANGE_OPERATORS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+_FILTER_KEY_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def build_metadata_filter(filter_metadata: Dict[str, Any], placeholder: Callable[[Any], str]) -> str:
+    """
+    메타데이터 필터 → SQL WHERE 조건 (키/값은 모두 파라미터로 전달)
+
+    지원 형식:
+        {"category": "IC"}                          → 같음 (metadata @> '{"category": "IC"}', GIN 인덱스 사용)
+        {"part_numbers": {"$in": ["A", "B"]}}        → IN (@> 조건의 OR, 배열 값이면 원소 중 하나라도 일치)
+        {"page_number": {"$gte": 1, "$lte": 10}}     → 범위 (숫자 비교)
+
+    Args:
+        filter_metadata: 필터 (키는 config.database.vector_filter_keys에 있어야 함)
+        placeholder: 값을 파라미터 목록에 추가하고 자리표시자(%s / $n)를 반환하는 함수
+
+    Raises:
+        ValueError: 허용되지 않은 키 / 연산자 또는 연산자에 맞지 않는 값
+    """
+    conditions = []
+    for key, condition in filter_metadata.items():
+        if key not in config.database.vector_filter_keys or not _FILTER_KEY_PATTERN.match(key):
+            raise ValueError(f"허용되지 않은 메타데이터 필터 키: {key!r}")
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for operator, value in condition.items():
+            if operator == "$eq":
+                conditions.append(f"metadata @> {placeholder(json.dumps({key: value}, ensure_ascii=False))}::text::jsonb")
+            elif operator == "$in":
+                if not isinstance(value, (list, tuple)):
+                    raise ValueError(f"$in 값은 리스트여야 합니다: {key!r}")
+                if not value:
+                    conditions.append("FALSE")
+                    continue
+                # 스칼라 값 {key: v}와 배열 값 {key: [v]} 모두 매칭 (MongoDB $in과 같은 의미)
+                options = [
+                    f"metadata @> {placeholder(json.dumps(candidate, ensure_ascii=False))}::text::jsonb"
+                    for v in value
+                    for candidate in ({key: v}, {key: [v]})
+                ]
+                conditions.append("(" + " OR ".join(options) + ")")
+            elif operator in _RANGE_OPERATORS:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"범위 연산자 {operator} 값은 숫자여야 합니다: {key!r}")
+                conditions.append(
+                    f"(metadata ->> {placeholder(key)}::text)::numeric {_RANGE_OPERATORS[operator]} {placeholder(value)}::numeric"
+                )
+            else:
+                raise ValueError(f"지원하지 않는 메타데이터 필터 연산자: {operator!r}")
+
+    return " AND ".join(conditions)
+
+
+def _indexed_vector(vector_sql: str, mode: str) -> str:
+    """
+    인덱스에 들어가는 벡터 식 (인덱스 생성과 검색 정렬식에 같은 식을 사용해야 인덱스를 탐)
+    - 앞부분 차원 모드: subvector로 자른 뒤 l2_normalize (잘린 벡터는 단위 길이가 아님)
+    - halfvec: float16 변환 (인덱스 크기 1/2)
+    - binary: 부호 비트 양자화 (인덱스 크기 1/32)
+    """
+    prefix = _prefix_dimension()
+    dimension = prefix or config.llm.embedding_dimension
+    if prefix:
+        vector_sql = f"l2_normalize(subvector({vector_sql}, 1, {prefix}))"
+
+    if mode == "halfvec":
+        return f"{vector_sql}::halfvec({dimension})"
+    if mode == "binary":
+        return f"binary_quantize({vector_sql})::bit({dimension})"
+    return f"{vector_sql}::vector({dimension})" if prefix else vector_sql
+
+
+def _index_distance(query_embedding: Any, placeholder: Callable[[Any], str], mode: Optional[str] = None) -> str:
+    """저장 모드별 인덱스 정렬식 (1차 후보 검색용, binary는 해밍 거리 / 그 외 코사인 거리 또는 음의 내적)"""
+    mode = mode or config.database.vector_storage_mode
+    operator = "<~>" if mode == "binary" else _distance_operator()
+    # 파라미터는 vector로 받아 변환 (드라이버에 halfvec 코덱 등록 불필요)
+    query_vector = _indexed_vector(f"{placeholder(query_embedding)}::vector", mode)
+    return f"{_indexed_vector('embedding', mode)} {operator} {query_vector}"
+
+
+def _reranked() -> bool:
+    """인덱스가 원본 float32 벡터와 다르면(양자화 / 앞부분 차원) 후보를 원본 벡터로 재정렬"""
+    return config.database.vector_storage_mode != "full" or bool(_prefix_dimension())
+
+
+def _candidate_count(k: int) -> int:
+    """재정렬 전 인덱스에서 가져올 후보 수"""
+    if not _reranked():
+        return k
+    return k * config.database.vector_rerank_factor
+
+
+def build_vector_query(
+    query_embedding: Any,
+    k: int,
+    filter_metadata: Optional[Dict[str, Any]],
+    placeholder: Callable[[Any], str]
+) -> str:
+    """
+    벡터 유사도 검색 SQL (코사인 거리 또는 정규화 모드의 내적, HNSW 인덱스 사용)
+    양자화 / 앞부분 차원 인덱스면 후보를 k × vector_rerank_factor개 가져온 뒤 전체 float32 벡터로 정확히 재정렬
+    """
+    operator = _distance_operator()
+
+    if not _reranked():
+        query = f"""
+            SELECT
+                id, document_id, chunk_index, content, chunk_type, metadata,
+                {_similarity("embedding", f"{placeholder(query_embedding)}::vector")} as similarity_score
+            FROM document_chunks
+        """
+
+        if filter_metadata:
+            query += " WHERE " + build_metadata_filter(filter_metadata, placeholder)
+
+        query += f" ORDER BY embedding {operator} {placeholder(query_embedding)}::vector LIMIT {placeholder(k)}"
+        return query
+
+    # 자리표시자는 SQL에 나타나는 순서대로 추가 (%s 방식은 위치 기반)
+    query = f"""
+        SELECT
+            id, document_id, chunk_index, content, chunk_type, metadata,
+            {_similarity("embedding", f"{placeholder(query_embedding)}::vector")} as similarity_score
+        FROM (
+            SELECT * FROM document_chunks
+    """
+    if filter_metadata:
+        query += " WHERE " + build_metadata_filter(filter_metadata, placeholder)
+    query += f"""
+            ORDER BY {_index_distance(query_embedding, placeholder)}
+            LIMIT {placeholder(_candidate_count(k))}
+        ) candidates
+        ORDER BY embedding {operator} {placeholder(query_embedding)}::vector
+        LIMIT {placeholder(k)}
+    """
+    return query
+
+
+def _scan_settings(k: int, ef_search: Optional[int] = None, filtered: bool = False, candidates: int = 0,
+                   statement_timeout: Optional[float] = None) -> List[str]:
+    """
+    검색 트랜잭션 설정 (SET LOCAL → 트랜잭션 종료 시 원복)
+    - ef_search: 호출별 지정값 또는 config 기본값 (클수록 recall↑, 지연↑). 가져올 후보 수보다 작을 수 없음
+    - 필터 검색: iterative scan 지원 버전(pgvector 0.8+)이면 필터 통과 결과가 k개가 될 때까지 인덱스 계속 탐색,
+      아니면 ef_search를 늘려 후보를 더 많이 가져옴 (over-fetch)
+    - statement_timeout: 초 단위, 초과 시 서버에서 쿼리 취소 (호출 측이 타임아웃으로 포기한 검색이 DB에 남지 않도록)
+    """
+    ef = max(int(ef_search or config.database.hnsw_ef_search), k, candidates)
+    settings = []
+    if statement_timeout is not None:
+        settings.append(f"SET LOCAL statement_timeout = {max(int(statement_timeout * 1000), 1)}")
+    if filtered:
+        if config.database.pgvector_iterative_scan != "off":
+            settings.append(f"SET LOCAL hnsw.iterative_scan = {config.database.pgvector_iterative_scan}")
+        ef = max(ef, k * config.database.vector_filter_overfetch)
+    settings.append(f"SET LOCAL hnsw.ef_search = {min(ef, 1000)}")
+    return settings
+
+
+def _embedding_index_sql(name: str, concurrently: bool = False, m: Optional[int] = None,
+                         ef_construction: Optional[int] = None, mode: Optional[str] = None) -> str:
+    """document_chunks.embedding HNSW 인덱스 생성 SQL (저장 모드 / 인덱스 차원별 식 인덱스, 빌드 파라미터는 config 기본값)"""
+    mode = mode or config.database.vector_storage_mode
+    m = int(m or config.database.hnsw_m)
+    ef_construction = int(ef_construction or config.database.hnsw_ef_construction)
+
+    if mode == "binary":
+        operator_class = "bit_hamming_ops"
+    else:
+        distance = "ip" if config.database.vector_normalized else "cosine"
+        operator_class = f"{'halfvec' if mode == 'halfvec' else 'vector'}_{distance}_ops"
+    expression = _indexed_vector("embedding", mode)
+    target = f"{expression} {operator_class}" if expression == "embedding" else f"({expression}) {operator_class}"
+
+    return f"""
+        CREATE INDEX {"CONCURRENTLY " if concurrently else ""}IF NOT EXISTS {name}
+        ON document_chunks USING hnsw ({target})
+        WITH (m = {m}, ef_construction = {ef_construction});
+    """
+
+
+def build_hybrid_query(
+    query_text: str,
+    query_embedding: Any,
+    k: int,
+    filter_metadata: Optional[Dict[str, Any]],
+    placeholder: Callable[[Any], str],
+    escape_percent: bool = False
+) -> str:
+    """
+    하이브리드 검색 SQL (벡터 + 텍스트, Reciprocal Rank Fusion)
+    두 검색의 상위 후보와 RRF 점수 계산을 모두 DB에서 처리하여 한 번의 왕복으로 상위 k개만 반환
+
+    텍스트 검색 모드 (config.database.hybrid_text_mode):
+        - trigram: pg_trgm 단어 유사도 (형태소 분석 없이 부분 일치 → 한국어 조사/어미, 부품 코드에 강함)
+        - fts: to_tsvector 전문 검색 (hybrid_fts_config 사전 사용)
+
+    escape_percent: psycopg2처럼 %를 자리표시자로 쓰는 드라이버면 True (연산자 <% → <%%)
+    """
+    db_config = config.database
+
+    # 자리표시자는 사용할 때마다 새로 추가 (%s 방식은 위치 기반)
+    def candidates() -> str:
+        return placeholder(max(db_config.hybrid_candidates, k))
+
+    def where(extra: Optional[str] = None) -> str:
+        conditions = [extra] if extra else []
+        if filter_metadata:
+            conditions.append(build_metadata_filter(filter_metadata, placeholder))
+        return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    # 벡터 후보: 인덱스 정렬식으로 가져온 뒤 전체 float32 거리로 순위 (재정렬하지 않는 설정이면 동일)
+    vector_hits = f"""
+        SELECT id, row_number() OVER (ORDER BY embedding {_distance_operator()} {placeholder(query_embedding)}::vector) AS rank
+        FROM (
+            SELECT id, embedding
+            FROM document_chunks{where()}
+            ORDER BY {_index_distance(query_embedding, placeholder)}
+            LIMIT {candidates()}
+        ) v
+    """
+
+    if db_config.hybrid_text_mode == "trigram":
+        def text() -> str:
+            return placeholder(query_text)
+
+        similar = "<%%" if escape_percent else "<%"
+        text_hits = f"""
+            SELECT id, row_number() OVER (ORDER BY score DESC) AS rank
+            FROM (
+                SELECT id, word_similarity({text()}, content) AS score
+                FROM document_chunks{where(f"{text()} {similar} content")}
+                ORDER BY score DESC
+                LIMIT {candidates()}
+            ) t
+        """
+    else:
+        fts_config = _fts_config()
+
+        def tsquery() -> str:
+            return f"websearch_to_tsquery('{fts_config}', {placeholder(query_text)})"
+
+        text_hits = f"""
+            SELECT id, row_number() OVER (ORDER BY score DESC) AS rank
+            FROM (
+                SELECT id, ts_rank_cd(to_tsvector('{fts_config}', content), {tsquery()}) AS score
+                FROM document_chunks{where(f"to_tsvector('{fts_config}', content) @@ {tsquery()}")}
+                ORDER BY score DESC
+                LIMIT {candidates()}
+            ) t
+        """
+
+    rrf_k = placeholder(db_config.hybrid_rrf_k)
+    return f"""
+        WITH vector_hits AS ({vector_hits}),
+        text_hits AS ({text_hits}),
+        fused AS (
+            SELECT id, SUM(1.0 / ({rrf_k} + rank))::float8 AS rrf_score
+            FROM (
+                SELECT id, rank FROM vector_hits
+                UNION ALL
+                SELECT id, rank FROM text_hits
+            ) hits
+            GROUP BY id
+        )
+        SELECT
+            c.id, c.document_id, c.chunk_index, c.content, c.chunk_type, c.metadata,
+            {_similarity("c.embedding", f"{placeholder(query_embedding)}::vector")} AS similarity_score,
+            f.rrf_score,
+            (SELECT rank FROM vector_hits v WHERE v.id = c.id) AS vector_rank,
+            (SELECT rank FROM text_hits t WHERE t.id = c.id) AS text_rank
+        FROM fused f
+        JOIN document_chunks c ON c.id = f.id
+        ORDER BY f.rrf_score DESC
+        LIMIT {placeholder(k)}
+    """
+
+
+def _fts_config() -> str:
+    """전문 검색 사전 이름 (SQL에 직접 들어가므로 형식 검증)"""
+    fts_config = config.database.hybrid_fts_config
+    if not _FILTER_KEY_PATTERN.match(fts_config):
+        raise ValueError(f"잘못된 전문 검색 사전 이름: {fts_config!r}")
+    return fts_config
+
+
+class PoolTimeoutError(Exception):
+    """연결 풀에서 제한 시간 내에 연결을 얻지 못함"""
+
+
+class PgConnectionPool:
+    """
+    psycopg2 연결 풀 (스레드 안전, 최대 연결 수 제한)
+    - 연결이 모두 사용 중이면 timeout초까지 대기
+    - 오래 유휴 상태였던 연결은 꺼내기 전에 SELECT 1로 상태 확인
+    - 끊어진 연결은 폐기하고 새로 연결
+    """
+
+    def __init__(self, dsn: str, min_size: int, max_size: int, timeout: float, health_check_interval: float):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: List[tuple] = []  # (connection, 반환 시각)
+        self._size = 0
+        self._waiters = 0
+        self._cond = threading.Condition()
+
+        # 통계
+        self.acquired = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.discarded = 0
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self):
+        """새 연결 생성"""
+        conn = psycopg2.connect(self.dsn)
+        with self._cond:
+            self.created += 1
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        """연결 상태 확인"""
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        """연결 폐기 (풀 크기 감소)"""
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self.discarded += 1
+            self._cond.notify()
+
+    def getconn(self):
+        """연결 획득 (없으면 생성, 최대 개수면 대기)"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            conn, idle_since, create = None, None, False
+            with self._cond:
+                self._waiters += 1
+                try:
+                    while not self._idle and self._size >= self.max_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            raise PoolTimeoutError(
+                                f"PostgreSQL 연결 풀 대기 시간 초과 ({self.timeout}초, 최대 {self.max_size}개)"
+                            )
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif conn.closed or (
+                time.monotonic() - idle_since > self.health_check_interval and not self._is_healthy(conn)
+            ):
+                # 끊어진 연결은 버리고 다시 시도
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self.acquired += 1
+                self.wait_time_total += waited
+                self.wait_time_max = max(self.wait_time_max, waited)
+            return conn
+
+    def putconn(self, conn, broken: bool = False):
+        """연결 반환 (진행 중인 트랜잭션은 롤백)"""
+        if not broken and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                broken = True
+
+        if broken or conn.closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """with 블록 동안 연결 사용 (연결 오류 발생 시 연결 폐기)"""
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+        except extensions.QueryCanceledError:
+            # statement_timeout 초과: 연결은 정상 (putconn에서 롤백)
+            raise
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, broken=broken)
+
+    def close(self):
+        """유휴 연결 모두 종료"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for conn, _ in idle:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 통계 반환"""
+        with self._cond:
+            return {
+                "size": self._size,
+                "max_size": self.max_size,
+                "in_use": self._size - len(self._idle),
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "acquired": self.acquired,
+                "avg_wait_ms": round(self.wait_time_total / self.acquired * 1000, 2) if self.acquired else 0.0,
+                "max_wait_ms": round(self.wait_time_max * 1000, 2),
+                "timeouts": self.timeouts,
+                "created": self.created,
+                "discarded": self.discarded
+            }
+
 
 class PgVectorService:
     """실제 pgvector 서비스"""
 
     def __init__(self):
-        self.conn = psycopg2.connect(config.database.postgres_uri)
+        self.pool = PgConnectionPool(
+            config.database.postgres_uri,
+            min_size=config.database.postgres_pool_min_size,
+            max_size=config.database.postgres_pool_size,
+            timeout=config.database.postgres_pool_timeout,
+            health_check_interval=config.database.postgres_pool_health_check_interval
+        )
         self._ensure_tables()
 
+    def _run_read(self, operation):
+        """
+        읽기 쿼리 실행
+        연결이 끊어져 실패하면 새 연결로 1회 재시도 (DB 재시작 후 자동 복구, statement_timeout 초과는 재시도 없음)
+        """
+        try:
+            with self.pool.connection() as conn:
+                return operation(conn)
+        except extensions.QueryCanceledError:
+            raise
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            with self.pool.connection() as conn:
+                return operation(conn)
+
     def _ensure_tables(self):
         """테이블 생성 (없을 경우)"""
-        with self.conn.cursor() as cur:
+        dimension = config.llm.embedding_dimension
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
             # pgvector extension 활성화
             cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
 
             # document_chunks 테이블
-            cur.execute("""
+            cur.execute(f"""
                 CREATE TABLE IF NOT EXISTS document_chunks (
                     id SERIAL PRIMARY KEY,
                     document_id VARCHAR(255) NOT NULL,
                     chunk_index INTEGER NOT NULL,
                     content TEXT NOT NULL,
                     chunk_type VARCHAR(50),
-                    embedding vector(1536),
+                    embedding vector({dimension}),
                     metadata JSONB,
                     created_at TIMESTAMP DEFAULT NOW()
                 );
             """)
 
-            # 인덱스 생성
-            cur.execute("""
-                CREATE INDEX IF NOT EXISTS idx_document_chunks_embedding
-                ON document_chunks USING hnsw (embedding vector_cosine_ops);
-            """)
+            # 기존 테이블의 벡터 차원이 설정과 다르면 검색/적재가 모두 실패하므로 시작 시 확인
+            self._check_embedding_dimension(cur, "document_chunks", dimension)
+
+            # 임베딩 HNSW 인덱스: 빈 테이블에서만 바로 생성 (행이 있으면 빌드 동안 쓰기가 막히므로 관리 스크립트로 CONCURRENTLY 생성)
+            index_name = embedding_index_name()
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", (index_name,))
+            if not cur.fetchone()[0]:
+                cur.execute("SELECT EXISTS (SELECT 1 FROM document_chunks)")
+                if not cur.fetchone()[0]:
+                    cur.execute(_embedding_index_sql(index_name))
+                else:
+                    print(f"⚠️  임베딩 인덱스 {index_name}가 없습니다 (저장 모드/인덱스 차원 변경). 그동안 벡터 검색은 전체 스캔으로 동작합니다.\n"
+                          f"   python scripts/manage_pgvector.py migrate-storage --mode {config.database.vector_storage_mode} "
+                          "실행 필요 (CONCURRENTLY, 쓰기 차단 없음, VECTOR_NORMALIZED 전환이면 normalize)")
 
             cur.execute("""
                 CREATE INDEX IF NOT EXISTS idx_document_chunks_document_id
                 ON document_chunks (document_id);
             """)
 
+            if config.enable_hybrid_search and config.database.hybrid_text_mode == "trigram":
+                cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
             # image_embeddings 테이블
-            cur.execute("""
+            cur.execute(f"""
                 CREATE TABLE IF NOT EXISTS image_embeddings (
                     id SERIAL PRIMARY KEY,
                     document_id VARCHAR(255) NOT NULL,
                     chunk_id INTEGER REFERENCES document_chunks(id),
                     image_path TEXT,
                     image_description TEXT,
-                    embedding vector(1536),
+                    embedding vector({dimension}),
                     metadata JSONB,
                     created_at TIMESTAMP DEFAULT NOW()
                 );
             """)
 
-            self.conn.commit()
+            conn.commit()
+
+        # 보조 인덱스는 기존 테이블에 쓰기 잠금을 걸지 않도록 트랜잭션 밖에서 CONCURRENTLY 생성
+        with self._autocommit_cursor() as cur:
+            # 메타데이터 필터용 GIN 인덱스 (@> 조건)
+            self._create_index_concurrently(cur, "idx_document_chunks_metadata", """
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_metadata
+                ON document_chunks USING gin (metadata jsonb_path_ops);
+            """)
+
+            # 하이브리드 검색용 텍스트 인덱스 (사용할 때만, FTS는 사전별 이름이라 사전을 바꾸면 새로 생성)
+            if config.enable_hybrid_search:
+                self._ensure_text_index(cur)
+
+    def _ensure_text_index(self, cur):
+        """하이브리드 검색 텍스트 인덱스 생성 (HYBRID_TEXT_MODE별, autocommit 커서)"""
+        if config.database.hybrid_text_mode == "trigram":
+            self._create_index_concurrently(cur, "idx_document_chunks_content_trgm", """
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_content_trgm
+                ON document_chunks USING gin (content gin_trgm_ops);
+            """)
+        else:
+            fts_config = _fts_config()
+            self._create_index_concurrently(cur, f"idx_document_chunks_content_fts_{fts_config}", f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_content_fts_{fts_config}
+                ON document_chunks USING gin (to_tsvector('{fts_config}', content));
+            """)
+
+    @staticmethod
+    def _create_index_concurrently(cur, name: str, sql: str):
+        """
+        인덱스 CONCURRENTLY 생성 (autocommit 커서, 이미 유효한 인덱스가 있으면 그대로)
+        이전 빌드가 중단되어 남은 INVALID 인덱스는 IF NOT EXISTS에 걸려 계속 남으므로 먼저 삭제
+        """
+        cur.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (name,))
+        row = cur.fetchone()
+        if row and row[0]:
+            return
+        if row:
+            print(f"⚠️  INVALID 인덱스 {name} 삭제 후 다시 생성합니다.")
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        print(f"인덱스 {name} 생성 중 (CONCURRENTLY)...")
+        cur.execute(sql)
+
+    @staticmethod
+    def _check_embedding_dimension(cur, table: str, dimension: int):
+        """테이블 embedding 컬럼 차원 확인 (LLM_EMBEDDING_DIMENSION과 다르면 ValueError)"""
+        cur.execute("""
+            SELECT format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attname = 'embedding'
+        """, (table,))
+        column_type = cur.fetchone()[0]
+        if column_type != f"vector({dimension})":
+            raise ValueError(
+                f"{table}.embedding 타입({column_type})이 LLM_EMBEDDING_DIMENSION({dimension})과 다릅니다. "
+                "임베딩 모델을 바꿨다면 테이블을 다시 만들고 문서를 재임베딩해야 합니다."
+            )
 
     def similarity_search(
         self,
         query_embedding: List[float],
         k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None
     ) -> List[Dict[str, Any]]:
-        """벡터 유사도 검색"""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = """
-                SELECT
-                    id, document_id, chunk_index, content, chunk_type, metadata,
-                    1 - (embedding <=> %s::vector) as similarity_score
-                FROM document_chunks
-            """
+        """
+        벡터 유사도 검색
+        - ef_search: 이번 검색의 HNSW 탐색 폭 (None이면 config 기본값)
+        - statement_timeout: 쿼리 최대 실행 시간 (초, None이면 서버 기본값)
+        - 필터가 있으면 HNSW 후보를 늘려 검색하고, 그래도 k개가 안 되면 필터 인덱스 기반 정확 검색으로 재시도
+        """
+        params: List[Any] = []
+
+        def placeholder(value: Any) -> str:
+            params.append(value)
+            return "%s"
+
+        query = build_vector_query(query_embedding, k, filter_metadata, placeholder)
+
+        def search(conn):
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                for setting in _scan_settings(_candidate_count(k), ef_search, filtered=bool(filter_metadata),
+                                              statement_timeout=statement_timeout):
+                    cur.execute(setting)
+                cur.execute(query, params)
+                rows = cur.fetchall()
+
+                if filter_metadata and len(rows) < k:
+                    # 선택도가 높은 필터: 인덱스 스캔을 끄고 필터 → 정확 거리 정렬
+                    cur.execute("SET LOCAL enable_indexscan = off")
+                    cur.execute(query, params)
+                    rows = cur.fetchall()
+                return [dict(row) for row in rows]
+
+        return self._run_read(search)
+
+    def hybrid_search(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """하이브리드 검색 (텍스트 + 벡터, RRF 결합)"""
+        params: List[Any] = []
+
+        def placeholder(value: Any) -> str:
+            params.append(value)
+            return "%s"
+
+        query = build_hybrid_query(
+            query_text, query_embedding, k, filter_metadata, placeholder, escape_percent=True
+        )
+
+        def search(conn):
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                for setting in _scan_settings(k, ef_search, candidates=max(config.database.hybrid_candidates, _candidate_count(k)),
+                                              statement_timeout=statement_timeout):
+                    cur.execute(setting)
+                if config.database.hybrid_text_mode == "trigram":
+                    # 트랜잭션 범위 설정 (is_local = true)
+                    cur.execute(
+                        "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                        (str(config.database.hybrid_trigram_threshold),)
+                    )
+                cur.execute(query, params)
+                return [dict(row) for row in cur.fetchall()]
+
+        return self._run_read(search)
+
+    def embedding_index_info(self) -> List[Dict[str, Any]]:
+        """임베딩 HNSW 인덱스 정보 (빌드 파라미터, 크기, 유효 여부)"""
+        def fetch(conn):
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        c.relname AS name,
+                        c.reloptions AS options,
+                        pg_relation_size(c.oid) AS size_bytes,
+                        i.indisvalid AS is_valid
+                    FROM pg_class c
+                    JOIN pg_index i ON i.indexrelid = c.oid
+                    WHERE i.indrelid = 'document_chunks'::regclass
+                      AND c.relname LIKE %s
+                    ORDER BY c.relname
+                """, (f"{EMBEDDING_INDEX_NAME}%",))
+                return [dict(row) for row in cur.fetchall()]
+
+        return self._run_read(fetch)
+
+    def rebuild_embedding_index(self, m: Optional[int] = None, ef_construction: Optional[int] = None,
+                                mode: Optional[str] = None):
+        """
+        임베딩 HNSW 인덱스를 새 빌드 파라미터로 재생성 (읽기 차단 없음)
+        CREATE INDEX CONCURRENTLY로 새 인덱스를 만든 뒤 기존 인덱스와 교체
+        교체는 이름 변경 두 번을 한 트랜잭션으로 (그 이름의 인덱스가 없는 순간이 없음), 기존 인덱스는 그 뒤 CONCURRENTLY 삭제
+        """
+        name = embedding_index_name(mode)
+        new_name = f"{name}_new"
+        old_name = f"{name}_old"
 
-            params = [query_embedding]
+        with self._autocommit_cursor() as cur:
+            # 이전에 실패한 빌드/교체가 남긴 인덱스 정리
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}")
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
+            cur.execute(_embedding_index_sql(new_name, concurrently=True, m=m, ef_construction=ef_construction, mode=mode))
 
-            if filter_metadata:
-                # metadata 필터 추가
-                conditions = []
-                for key, value in filter_metadata.items():
-                    conditions.append(f"metadata->>'{key}' = %s")
-                    params.append(str(value))
+            cur.execute("BEGIN")
+            cur.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {old_name}")
+            cur.execute(f"ALTER INDEX {new_name} RENAME TO {name}")
+            cur.execute("COMMIT")
 
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
 
-            query += " ORDER BY embedding <=> %s::vector LIMIT %s"
-            params.extend([query_embedding, k])
+    def migrate_storage_mode(self, mode: str, drop_other_indexes: bool = False):
+        """
+        저장 모드 전환 (기존 행 재작성 없음)
+        float32 embedding 컬럼은 재정렬용으로 유지하고, 해당 모드(현재 VECTOR_INDEX_DIMENSION 기준)의 식 인덱스만 CONCURRENTLY 생성
+        drop_other_indexes=True면 나머지 임베딩 인덱스 삭제 (인덱스 메모리 회수)
+        """
+        if mode not in EMBEDDING_INDEX_NAMES:
+            raise ValueError(f"지원하지 않는 저장 모드: {mode!r} ({', '.join(EMBEDDING_INDEX_NAMES)})")
 
-            cur.execute(query, params)
-            return [dict(row) for row in cur.fetchall()]
+        name = embedding_index_name(mode)
+        existing = [index["name"] for index in self.embedding_index_info()]
+
+        with self._autocommit_cursor() as cur:
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}_new")
+            cur.execute(_embedding_index_sql(name, concurrently=True, mode=mode))
+
+            if drop_other_indexes:
+                for other_name in existing:
+                    if other_name != name:
+                        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {other_name}")
+
+    def normalize_embeddings(self, batch_size: int = 5000,
+                             progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """
+        기존 행의 임베딩을 L2 정규화 (vector_normalized 모드 전환용, 재실행해도 안전)
+        id 구간별로 나누어 커밋하므로 긴 행 잠금 없이 서비스 중에 실행 가능
+        이미 단위 벡터인 행(노름 오차 1e-6 이하)은 건너뜀
+
+        Returns:
+            테이블별 갱신 행 수
+        """
+        updated = {}
+
+        for table in ("document_chunks", "image_embeddings"):
+            updated[table] = 0
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                cur.execute(f"SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), 0) FROM {table}")
+                start, end = cur.fetchone()
+
+                for lower in range(start, end + 1, batch_size):
+                    cur.execute(f"""
+                        UPDATE {table}
+                        SET embedding = l2_normalize(embedding)
+                        WHERE id >= %s AND id < %s
+                          AND embedding IS NOT NULL
+                          AND abs(vector_norm(embedding) - 1) > 1e-6
+                    """, (lower, lower + batch_size))
+                    updated[table] += cur.rowcount
+                    conn.commit()
+                    if progress:
+                        progress(table, updated[table])
+
+        return updated
+
+    def backfill_part_numbers(self, extract: Callable[[str], List[str]], batch_size: int = 5000,
+                              progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        기존 청크의 metadata.part_numbers 채우기 (메타데이터 필터 도입 전 적재분, 재실행해도 안전)
+        id 구간별로 커밋하며 part_numbers 키가 이미 있는 행은 건너뜀
+
+        Args:
+            extract: 청크 본문 → 부품번호 목록
+
+        Returns:
+            갱신 행 수
+        """
+        updated = 0
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), 0) FROM document_chunks")
+            start, end = cur.fetchone()
+
+            for lower in range(start, end + 1, batch_size):
+                cur.execute("""
+                    SELECT id, content FROM document_chunks
+                    WHERE id >= %s AND id < %s AND NOT (COALESCE(metadata, '{}'::jsonb) ? 'part_numbers')
+                """, (lower, lower + batch_size))
+                rows = [(json.dumps({"part_numbers": extract(content)}), chunk_id) for chunk_id, content in cur.fetchall()]
+                if rows:
+                    cur.executemany(
+                        "UPDATE document_chunks SET metadata = COALESCE(metadata, '{}'::jsonb) || %s::jsonb WHERE id = %s",
+                        rows
+                    )
+                    updated += len(rows)
+                conn.commit()
+                if progress:
+                    progress(updated)
+
+        return updated
+
+    @contextmanager
+    def _autocommit_cursor(self) -> Iterator[Any]:
+        """
+        autocommit 커서 (CREATE/DROP INDEX CONCURRENTLY는 트랜잭션 밖에서만 실행 가능)
+        """
+        with self.pool.connection() as conn:
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cur:
+                    if config.database.hnsw_maintenance_work_mem:
+                        cur.execute("SET maintenance_work_mem = %s", (config.database.hnsw_maintenance_work_mem,))
+                    yield cur
+                    cur.execute("RESET maintenance_work_mem")
+            finally:
+                conn.autocommit = False
 
     def add_documents(self, documents: List[Dict[str, Any]]) -> List[int]:
-        """문서 추가"""
-        with self.conn.cursor() as cur:
+        """문서 추가 (binary COPY 일괄 적재, 설정으로 INSERT 방식 선택 가능)"""
+        if not documents:
+            return []
+        if config.database.postgres_bulk_copy:
+            return self.add_documents_copy(documents)
+        return self.add_documents_values(documents)
+
+    def add_documents_values(self, documents: List[Dict[str, Any]]) -> List[int]:
+        """문서 추가 (INSERT ... VALUES, 임베딩을 텍스트 리터럴로 전송)"""
+        with self.pool.connection() as conn, conn.cursor() as cur:
             query = """
                 INSERT INTO document_chunks
                 (document_id, chunk_index, content, chunk_type, embedding, metadata)
@@ -153,26 +1333,214 @@ class PgVectorService:
                     doc["content"],
                     doc.get("chunk_type", "text"),
                     doc["embedding"],
-                    doc.get("metadata")
+                    Json(doc.get("metadata"))
                 )
                 for doc in documents
             ]
 
             ids = execute_values(cur, query, values, fetch=True)
-            self.conn.commit()
+            conn.commit()
             return [row[0] for row in ids]
 
+    def add_documents_copy(self, documents: List[Dict[str, Any]], batch_size: Optional[int] = None) -> List[int]:
+        """
+        문서 추가 (COPY ... FROM STDIN BINARY)
+        - id는 시퀀스에서 미리 할당 → 입력 순서대로 반환
+        - 임베딩은 float32 바이너리로 전송 (텍스트 변환/파싱 없음)
+        - batch_size 단위로 나누어 COPY, 전체를 하나의 트랜잭션으로 커밋
+        """
+        batch_size = batch_size or config.database.postgres_copy_batch_size
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT nextval(pg_get_serial_sequence('document_chunks', 'id')) "
+                "FROM generate_series(1, %s)",
+                (len(documents),)
+            )
+            ids = [row[0] for row in cur.fetchall()]
+
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+                payload = _encode_copy_binary(
+                    (
+                        ids[start + i],
+                        doc["document_id"],
+                        doc["chunk_index"],
+                        doc["content"],
+                        doc.get("chunk_type", "text"),
+                        doc["embedding"],
+                        doc.get("metadata")
+                    )
+                    for i, doc in enumerate(batch)
+                )
+                cur.copy_expert(
+                    "COPY document_chunks "
+                    "(id, document_id, chunk_index, content, chunk_type, embedding, metadata) "
+                    "FROM STDIN WITH (FORMAT BINARY)",
+                    payload
+                )
+
+            conn.commit()
+            return ids
+
     def delete_document(self, document_id: str) -> bool:
         """문서 삭제"""
-        with self.conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             cur.execute(
                 "DELETE FROM document_chunks WHERE document_id = %s",
                 (document_id,)
             )
-            self.conn.commit()
+            conn.commit()
             return cur.rowcount > 0
 
 
+class AsyncMongoDBService:
+    """
+    비동기 MongoDB 서비스 (motor)
+    인덱스 생성은 동기 MongoDBService에서 담당
+    """
+
+    def __init__(self):
+        self.client = AsyncIOMotorClient(config.database.mongodb_uri)
+        self.db = self.client[config.database.mongodb_database]
+
+    async def find(self, collection: str, query: Dict[str, Any], limit: int = 100,
+                   projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """문서 검색 (projection: 가져올 필드, 배열은 {"$slice": n}으로 일부만)"""
+        return await self.db[collection].find(query, projection).limit(limit).to_list(length=limit)
+
+    async def find_one(self, collection: str, query: Dict[str, Any],
+                       projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """단일 문서 검색"""
+        return await self.db[collection].find_one(query, projection)
+
+    async def insert_one(self, collection: str, document: Dict[str, Any]) -> str:
+        """문서 추가"""
+        result = await self.db[collection].insert_one(document)
+        return str(result.inserted_id)
+
+    async def update_one(self, collection: str, query: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        """문서 업데이트"""
+        result = await self.db[collection].update_one(query, update)
+        return result.modified_count > 0
+
+    async def delete_one(self, collection: str, query: Dict[str, Any]) -> bool:
+        """문서 삭제"""
+        result = await self.db[collection].delete_one(query)
+        return result.deleted_count > 0
+
+    async def aggregate(self, collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Aggregation 쿼리"""
+        return await self.db[collection].aggregate(pipeline).to_list(length=None)
+
+    async def search_parts(self, keywords: List[str], limit: int = 10,
+                           projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """부품명 키워드 검색 (MongoDBService.search_parts와 동일)"""
+        if not keywords:
+            return []
+        return await self.aggregate("parts", build_part_search_pipeline(keywords, limit, projection))
+
+
+class AsyncPgVectorService:
+    """
+    비동기 pgvector 서비스 (asyncpg 연결 풀)
+    테이블 생성은 동기 PgVectorService에서 담당
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """연결 풀 반환 (첫 호출 시 생성)"""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        config.database.postgres_uri,
+                        min_size=1,
+                        max_size=config.database.postgres_async_pool_size,
+                        init=self._init_connection
+                    )
+        return self._pool
+
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection):
+        """연결 초기화: vector 타입 및 JSONB 코덱 등록"""
+        await register_vector(conn)
+        await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+    async def similarity_search(
+        self,
+        query_embedding: List[float],
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """벡터 유사도 검색 (PgVectorService.similarity_search와 동일)"""
+        params: List[Any] = []
+
+        def placeholder(value: Any) -> str:
+            params.append(value)
+            return f"${len(params)}"
+
+        query = build_vector_query(np.asarray(query_embedding, dtype=np.float32), k, filter_metadata, placeholder)
+
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                for setting in _scan_settings(_candidate_count(k), ef_search, filtered=bool(filter_metadata),
+                                              statement_timeout=statement_timeout):
+                    await conn.execute(setting)
+                rows = await conn.fetch(query, *params)
+
+                if filter_metadata and len(rows) < k:
+                    await conn.execute("SET LOCAL enable_indexscan = off")
+                    rows = await conn.fetch(query, *params)
+        return [dict(row) for row in rows]
+
+    async def hybrid_search(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """하이브리드 검색 (텍스트 + 벡터, RRF 결합)"""
+        params: List[Any] = []
+
+        def placeholder(value: Any) -> str:
+            params.append(value)
+            return f"${len(params)}"
+
+        query = build_hybrid_query(
+            query_text, np.asarray(query_embedding, dtype=np.float32), k, filter_metadata, placeholder
+        )
+
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                for setting in _scan_settings(k, ef_search, candidates=max(config.database.hybrid_candidates, _candidate_count(k)),
+                                              statement_timeout=statement_timeout):
+                    await conn.execute(setting)
+                if config.database.hybrid_text_mode == "trigram":
+                    await conn.execute(
+                        "SELECT set_config('pg_trgm.word_similarity_threshold', $1, true)",
+                        str(config.database.hybrid_trigram_threshold)
+                    )
+                rows = await conn.fetch(query, *params)
+        return [dict(row) for row in rows]
+
+    async def close(self):
+        """연결 풀 종료"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
 class DatabaseFactory:
     """
     Database 팩토리
@@ -181,14 +1549,18 @@ class DatabaseFactory:
 
     @staticmethod
     def get_mongodb():
-        """MongoDB 인스턴스 반환"""
+        """MongoDB 인스턴스 반환 (MONGODB_EXPLAIN_QUERIES면 실행 계획 검사 래퍼 적용)"""
         if config.test_mode:
-            # 테스트 모드: Mock DB 사용
+            # 테스트 모드: Mock DB 사용 (인덱스 정의는 실행 계획 시뮬레이션에 사용)
             from tests.mocks import MockDatabaseFactory
-            return MockDatabaseFactory.get_mongodb()
+            mongodb = MockDatabaseFactory.get_mongodb(indexes=MONGODB_INDEXES)
+        else:
+            # 실제 모드: MongoDB 사용
+            mongodb = MongoDBService()
 
-        # 실제 모드: MongoDB 사용
-        return MongoDBService()
+        if config.database.mongodb_explain_queries:
+            return QueryPlanChecker(mongodb)
+        return mongodb
 
     @staticmethod
     def get_pgvector():
@@ -196,15 +1568,36 @@ class DatabaseFactory:
         if config.test_mode:
             # 테스트 모드: Mock DB 사용
             from tests.mocks import MockDatabaseFactory
-            return MockDatabaseFactory.get_pgvector()
+            return MockDatabaseFactory.get_pgvector(dimension=config.llm.embedding_dimension)
 
         # 실제 모드: pgvector 사용
         return PgVectorService()
 
+    @staticmethod
+    def get_async_mongodb():
+        """비동기 MongoDB 인스턴스 반환"""
+        if config.test_mode:
+            from tests.mocks import MockDatabaseFactory
+            return MockDatabaseFactory.get_async_mongodb()
+
+        return AsyncMongoDBService()
+
+    @staticmethod
+    def get_async_pgvector():
+        """비동기 pgvector 인스턴스 반환"""
+        if config.test_mode:
+            from tests.mocks import MockDatabaseFactory
+            return MockDatabaseFactory.get_async_pgvector(dimension=config.llm.embedding_dimension)
+
+        return AsyncPgVectorService()
+
 
 # 전역 DB 인스턴스
 _mongodb = None
 _pgvector = None
+_pgvector_lock = threading.Lock()
+_async_mongodb = None
+_async_pgvector = None
 
 
 def get_mongodb():
@@ -219,5 +1612,35 @@ def get_pgvector():
     """pgvector 인스턴스 반환"""
     global _pgvector
     if _pgvector is None:
-        _pgvector = DatabaseFactory.get_pgvector()
+        # 동시 첫 요청에서 연결 풀이 중복 생성되지 않도록 잠금
+        with _pgvector_lock:
+            if _pgvector is None:
+                _pgvector = DatabaseFactory.get_pgvector()
     return _pgvector
+
+
+def get_async_mongodb():
+    """비동기 MongoDB 인스턴스 반환"""
+    global _async_mongodb
+    if _async_mongodb is None:
+        _async_mongodb = DatabaseFactory.get_async_mongodb()
+    return _async_mongodb
+
+
+def get_async_pgvector():
+    """비동기 pgvector 인스턴스 반환"""
+    global _async_pgvector
+    if _async_pgvector is None:
+        _async_pgvector = DatabaseFactory.get_async_pgvector()
+    return _async_pgvector
+
+
+def get_pgvector_pool_stats() -> Optional[Dict[str, Any]]:
+    """pgvector 연결 풀 통계 (테스트 모드이거나 아직 연결 전이면 None)"""
+    pool = getattr(_pgvector, "pool", None)
+    return pool.stats() if pool else None
+
+
+def get_mongodb_query_plan_stats() -> Optional[Dict[str, Any]]:
+    """MongoDB 실행 계획 검사 통계 (MONGODB_EXPLAIN_QUERIES가 꺼져 있거나 아직 연결 전이면 None)"""
+    return _mongodb.stats() if isinstance(_mongodb, QueryPlanChecker) else None
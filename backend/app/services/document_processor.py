@@ -16,6 +16,8 @@ from openpyxl import load_workbook
 from PIL import Image
 
 from app.services.llm_service import get_embedding_llm, get_vision_llm
+from app.services.database_service import normalize_embedding
+from app.agents.rule_classifier import extract_part_numbers
 from app.config import config
 
 
@@ -260,7 +262,9 @@ class DocumentChunker:
                 "file_name": parsed_doc.file_name,
                 "document_id": parsed_doc.document_id,
                 "chunk_index": i,
-                "total_chunks": len(parsed_doc.chunks)
+                "total_chunks": len(parsed_doc.chunks),
+                # 벡터 검색 메타데이터 필터용 (부품번호 질문 시 해당 청크 우선 검색)
+                "part_numbers": extract_part_numbers(chunk.content)
             })
 
         return parsed_doc
@@ -279,6 +283,8 @@ class DocumentEmbedder:
 
         # 임베딩 생성
         embeddings = embedding_llm.embed_documents(texts)
+        if config.database.vector_normalized:
+            embeddings = [normalize_embedding(embedding) for embedding in embeddings]
 
         # 청크에 임베딩 추가
         for chunk, embedding in zip(parsed_doc.chunks, embeddings):
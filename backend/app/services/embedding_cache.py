@@ -0,0 +1,271 @@
+"""
+임베딩 캐시
+- (model, dimension, sha256(text)) 키로 임베딩 벡터를 로컬 디스크(SQLite)에 저장
+- 서버 재시작 후에도 유지, 같은 호스트의 워커 프로세스끼리 공유 (WAL 모드)
+- 용량 기반 LRU 제거
+"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+from app.config import config
+
+
+class EmbeddingCache:
+    """SQLite 기반 영구 임베딩 캐시 (float32 BLOB 저장)"""
+
+    # 용량 확인 주기 (쓰기 건수 기준)
+    EVICTION_CHECK_INTERVAL = 256
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._ensure_tables()
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 SQLite 연결 반환"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_tables(self):
+        """테이블 생성 (없을 경우)"""
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            );
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_embeddings_last_access
+            ON embeddings (last_access);
+        """)
+
+    @staticmethod
+    def make_key(model: str, dimension: int, text: str) -> str:
+        """캐시 키 생성: model:dimension:sha256(text) (같은 모델이라도 요청 차원이 다르면 다른 항목)"""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{dimension}:{digest}"
+
+    def get_many(self, model: str, dimension: int, texts: List[str]) -> List[Optional[List[float]]]:
+        """여러 텍스트의 캐시된 임베딩 조회 (없거나 저장된 벡터 차원이 다르면 None)"""
+        keys = [self.make_key(model, dimension, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+
+        conn = self._conn()
+        # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+        for i in range(0, len(unique_keys), 500):
+            batch = unique_keys[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders}) AND dimension = ?",
+                [*batch, dimension]
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+        if found:
+            now = time.time()
+            conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+
+        results = [found.get(key) for key in keys]
+        hit_count = sum(1 for r in results if r is not None)
+        with self._lock:
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, model: str, dimension: int, texts: List[str], embeddings: List[List[float]]):
+        """임베딩 저장"""
+        if not texts:
+            return
+
+        now = time.time()
+        rows = []
+        for text, embedding in zip(texts, embeddings):
+            vector = np.asarray(embedding, dtype=np.float32)
+            if vector.shape[0] != dimension:
+                # 응답 차원이 설정과 다르면 저장하지 않음 (잘못된 벡터가 캐시에 남지 않도록)
+                continue
+            rows.append((self.make_key(model, dimension, text), model, dimension, vector.tobytes(), now))
+
+        if not rows:
+            return
+
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, model, dimension, vector, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+        with self._lock:
+            self.writes += len(rows)
+            self._writes_since_check += len(rows)
+            check = self._writes_since_check >= self.EVICTION_CHECK_INTERVAL
+            if check:
+                self._writes_since_check = 0
+
+        if check:
+            self._evict()
+
+    def _evict(self):
+        """최대 용량 초과 시 오래 사용되지 않은 항목부터 제거 (90%까지)"""
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        rows = conn.execute(
+            "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_access ASC"
+        )
+        to_delete = []
+        for key, size in rows:
+            if total <= target:
+                break
+            to_delete.append((key,))
+            total -= size
+            removed += 1
+
+        conn.executemany("DELETE FROM embeddings WHERE key = ?", to_delete)
+        with self._lock:
+            self.evictions += removed
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        entries, size_bytes = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "size_bytes": size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+class CachedEmbeddingLLM:
+    """
+    임베딩 LLM 캐시 래퍼
+    캐시에 없는 텍스트만 실제 임베딩 엔드포인트로 전송
+    """
+
+    def __init__(self, embedding_llm: Any, model: str, dimension: int, cache: EmbeddingCache):
+        self.embedding_llm = embedding_llm
+        self.model = model
+        self.dimension = dimension
+        self.cache = cache
+
+    def embed_query(self, text: str) -> List[float]:
+        """텍스트를 벡터로 변환 (캐시 우선)"""
+        cached = self.cache.get_many(self.model, self.dimension, [text])[0]
+        if cached is not None:
+            return cached
+
+        embedding = self.embedding_llm.embed_query(text)
+        self.cache.put_many(self.model, self.dimension, [text], [embedding])
+        return embedding
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트를 벡터로 변환 (캐시에 없는 텍스트만 요청)"""
+        results = self.cache.get_many(self.model, self.dimension, texts)
+
+        # 캐시 미스 텍스트 (중복 제거)
+        missing = list(dict.fromkeys(
+            text for text, result in zip(texts, results) if result is None
+        ))
+        if missing:
+            embeddings = self.embedding_llm.embed_documents(missing)
+            self.cache.put_many(self.model, self.dimension, missing, embeddings)
+            computed = dict(zip(missing, embeddings))
+            results = [
+                result if result is not None else computed[text]
+                for text, result in zip(texts, results)
+            ]
+
+        return results
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """텍스트를 벡터로 변환 (비동기, 캐시 우선) - SQLite 조회/저장은 스레드에서 실행해 이벤트 루프를 막지 않음"""
+        cached = (await asyncio.to_thread(self.cache.get_many, self.model, self.dimension, [text]))[0]
+        if cached is not None:
+            return cached
+
+        embedding = await self.embedding_llm.aembed_query(text)
+        await asyncio.to_thread(self.cache.put_many, self.model, self.dimension, [text], [embedding])
+        return embedding
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트를 벡터로 변환 (비동기, 캐시에 없는 텍스트만 요청, SQLite 작업은 스레드에서)"""
+        results = await asyncio.to_thread(self.cache.get_many, self.model, self.dimension, texts)
+
+        missing = list(dict.fromkeys(
+            text for text, result in zip(texts, results) if result is None
+        ))
+        if missing:
+            embeddings = await self.embedding_llm.aembed_documents(missing)
+            await asyncio.to_thread(self.cache.put_many, self.model, self.dimension, missing, embeddings)
+            computed = dict(zip(missing, embeddings))
+            results = [
+                result if result is not None else computed[text]
+                for text, result in zip(texts, results)
+            ]
+
+        return results
+
+    def __getattr__(self, name: str):
+        # 그 외 속성은 원래 임베딩 LLM으로 위임
+        return getattr(self.embedding_llm, name)
+
+
+# 전역 캐시 인스턴스
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """임베딩 캐시 반환 (싱글톤)"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    path=config.embedding_cache_path,
+                    max_bytes=config.embedding_cache_max_mb * 1024 * 1024
+                )
+    return _embedding_cache
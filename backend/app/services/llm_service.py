@@ -2,11 +2,43 @@
 LLM 서비스
 사내 LLM 연동 및 Mock LLM 제공
 """
-from typing import Optional, List, Dict, Any
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Optional, List, Dict, Any, Iterator, AsyncIterator, Tuple
+import httpx
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from openai import APITimeoutError
 from app.config import config
 
 
+# 공유 HTTP 클라이언트 (keep-alive 연결 재사용)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    LLM 게이트웨이용 공유 HTTP 클라이언트 반환
+    모든 LLM 클라이언트가 하나의 연결 풀을 사용하므로 TLS 핸드셰이크를 반복하지 않음
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=config.llm.http_max_connections,
+                        max_keepalive_connections=config.llm.http_max_keepalive
+                    ),
+                    timeout=config.llm.http_timeout
+                )
+    return _http_client
+
+
 class RealChatLLM:
     """실제 사내 Chat LLM"""
 
@@ -16,22 +48,45 @@ class RealChatLLM:
             api_key=config.llm.api_key,
             model=model,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            http_client=get_http_client()
         )
 
-    def invoke(self, prompt: str):
-        """LLM 호출"""
-        return self.llm.invoke(prompt)
+    def invoke(self, prompt: str, timeout: Optional[float] = None):
+        """LLM 호출 (timeout: 이 호출의 HTTP 요청 제한 시간, 없으면 LLM_HTTP_TIMEOUT)"""
+        if timeout is None:
+            return self.llm.invoke(prompt)
+        return self.llm.invoke(prompt, timeout=timeout)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """LLM 스트리밍 호출 (생성되는 토큰을 순서대로 반환)"""
+        for chunk in self.llm.stream(prompt):
+            if chunk.content:
+                yield chunk.content
+
+    async def ainvoke(self, prompt: str):
+        """LLM 비동기 호출"""
+        return await self.llm.ainvoke(prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """LLM 비동기 스트리밍 호출"""
+        async for chunk in self.llm.astream(prompt):
+            if chunk.content:
+                yield chunk.content
 
 
 class RealEmbeddingLLM:
     """실제 사내 Embedding LLM"""
 
     def __init__(self, model: str):
+        self.dimension = config.llm.embedding_dimension
         self.embeddings = OpenAIEmbeddings(
             base_url=config.llm.embedding_url,
             api_key=config.llm.api_key,
-            model=model
+            model=model,
+            # 단축 출력 지원 모델이면 API에서 바로 지정 차원으로 받음
+            dimensions=self.dimension if config.llm.embedding_request_dimension else None,
+            http_client=get_http_client()
         )
 
     def embed_query(self, text: str) -> List[float]:
@@ -42,6 +97,139 @@ class RealEmbeddingLLM:
         """여러 텍스트를 벡터로 변환"""
         return self.embeddings.embed_documents(texts)
 
+    async def aembed_query(self, text: str) -> List[float]:
+        """텍스트를 벡터로 변환 (비동기)"""
+        return await self.embeddings.aembed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트를 벡터로 변환 (비동기)"""
+        return await self.embeddings.aembed_documents(texts)
+
+
+class EmbeddingBatcher:
+    """
+    embed_query 요청 마이크로 배칭
+    - 짧은 시간(batch_window_ms) 동안 모인 쿼리를 embed_documents 한 번으로 처리
+    - 처리 중인 동일 텍스트는 하나의 요청으로 병합 (single-flight)
+    """
+
+    def __init__(
+        self,
+        embedding_llm: Any,
+        batch_window_ms: float,
+        max_batch_size: int,
+        max_concurrent_batches: int,
+        timeout: float
+    ):
+        self.embedding_llm = embedding_llm
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        # 요청자가 배치 결과를 기다리는 최대 시간 (수집 스레드 이상 시 무한 대기 방지)
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._pending: List[str] = []
+        self._inflight: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches,
+            thread_name_prefix="embedding-batch"
+        )
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.failed_batches = 0
+
+        threading.Thread(target=self._collect_loop, name="embedding-batcher", daemon=True).start()
+
+    def embed_query(self, text: str) -> List[float]:
+        """텍스트를 벡터로 변환 (배치 처리 후 결과 반환, timeout 초과 시 TimeoutError)"""
+        return self._enqueue(text).result(timeout=self.timeout)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """텍스트를 벡터로 변환 (비동기, 동기 요청과 같은 배치에 합류)"""
+        return await asyncio.wait_for(asyncio.wrap_future(self._enqueue(text)), timeout=self.timeout)
+
+    def _enqueue(self, text: str) -> Future:
+        """배치 대기열에 추가 (처리 중인 동일 텍스트가 있으면 그 Future 공유)"""
+        with self._cond:
+            self.requests += 1
+            future = self._inflight.get(text)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = Future()
+                self._inflight[text] = future
+                self._pending.append(text)
+                self._cond.notify()
+            return future
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트를 벡터로 변환 (이미 배치이므로 그대로 전달)"""
+        return self.embedding_llm.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트를 벡터로 변환 (비동기)"""
+        return await self.embedding_llm.aembed_documents(texts)
+
+    def _collect_loop(self):
+        """대기 중인 쿼리를 모아서 배치 실행"""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+
+                # 배치 윈도우 동안 추가 요청 대기 (최대 크기에 도달하면 즉시 실행)
+                deadline = time.monotonic() + self.batch_window
+                while len(self._pending) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._pending[:self.max_batch_size]
+                self._pending = self._pending[self.max_batch_size:]
+                futures = [self._inflight[text] for text in batch]
+                self.batches += 1
+                self.batched_texts += len(batch)
+
+            self._executor.submit(self._run_batch, batch, futures)
+
+    def _run_batch(self, batch: List[str], futures: List[Future]):
+        """배치 임베딩 실행 후 각 요청자에게 결과 전달"""
+        try:
+            embeddings = self.embedding_llm.embed_documents(batch)
+            # 개수가 다르면 어느 벡터가 어느 텍스트의 것인지 알 수 없으므로 배치 전체 실패
+            if len(embeddings) != len(batch):
+                raise ValueError(f"임베딩 개수 불일치: 요청 {len(batch)}개, 응답 {len(embeddings)}개")
+            for future, embedding in zip(futures, embeddings):
+                future.set_result(embedding)
+        except Exception as e:
+            with self._cond:
+                self.failed_batches += 1
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            with self._cond:
+                for text in batch:
+                    self._inflight.pop(text, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """배칭 통계 반환"""
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "avg_batch_size": self.batched_texts / self.batches if self.batches else 0.0,
+                "pending": len(self._pending)
+            }
+
+    def __getattr__(self, name: str):
+        # 그 외 속성은 원래 임베딩 LLM으로 위임 (예: dimension)
+        return getattr(self.embedding_llm, name)
+
 
 class RealVisionLLM:
     """실제 사내 Vision LLM"""
@@ -50,7 +238,8 @@ class RealVisionLLM:
         self.llm = ChatOpenAI(
             base_url=config.llm.vision_url,
             api_key=config.llm.api_key,
-            model=model
+            model=model,
+            http_client=get_http_client()
         )
 
     def analyze_image(self, image_path: str, prompt: str = "") -> Dict[str, Any]:
@@ -92,9 +281,15 @@ class LLMFactory:
             from tests.mocks import MockLLMFactory
             return MockLLMFactory.create_embedding_llm(config)
 
-        return RealEmbeddingLLM(
-            model=model or config.llm.embedding_model
-        )
+        model = model or config.llm.embedding_model
+        embedding_llm = RealEmbeddingLLM(model=model)
+
+        # 임베딩 캐시 (Mock 벡터가 섞이지 않도록 실제 모드에서만 사용)
+        if config.enable_embedding_cache:
+            from app.services.embedding_cache import CachedEmbeddingLLM, get_embedding_cache
+            return CachedEmbeddingLLM(embedding_llm, model, embedding_llm.dimension, get_embedding_cache())
+
+        return embedding_llm
 
     @staticmethod
     def create_vision_llm(model: Optional[str] = None):
@@ -108,9 +303,68 @@ class LLMFactory:
         )
 
 
+class ChatLLMPool:
+    """
+    Chat LLM 클라이언트 풀 (LRU)
+    (endpoint, model, temperature, max_tokens) 조합별로 클라이언트를 재사용
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._clients: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ):
+        """설정에 맞는 클라이언트 반환 (없으면 생성)"""
+        model = model or config.llm.chat_model
+        temperature = float(temperature) if temperature is not None else config.llm.temperature
+        max_tokens = int(max_tokens) if max_tokens else config.llm.max_tokens
+        key = (config.llm.chat_url, model, temperature, max_tokens)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+
+            self.misses += 1
+            client = LLMFactory.create_chat_llm(model, temperature, max_tokens)
+            self._clients[key] = client
+
+            # 최대 크기 초과 시 가장 오래 사용되지 않은 클라이언트 제거
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
 # 전역 LLM 인스턴스 (싱글톤처럼 사용)
-_chat_llm = None
+_chat_llm_pool = ChatLLMPool(max_size=config.llm.client_pool_size)
 _embedding_llm = None
+_embedding_llm_lock = threading.Lock()
 _vision_llm = None
 
 
@@ -119,21 +373,46 @@ def get_chat_llm(
     temperature: Optional[float] = None,
     max_tokens: Optional[int] = None
 ):
-    """Chat LLM 인스턴스 반환"""
-    global _chat_llm
-    if _chat_llm is None or model or temperature or max_tokens:
-        _chat_llm = LLMFactory.create_chat_llm(model, temperature, max_tokens)
-    return _chat_llm
+    """Chat LLM 인스턴스 반환 (설정 조합별로 풀에서 재사용)"""
+    return _chat_llm_pool.get(model, temperature, max_tokens)
+
+
+def get_chat_llm_pool_stats() -> Dict[str, Any]:
+    """Chat LLM 클라이언트 풀 통계"""
+    return _chat_llm_pool.stats()
 
 
 def get_embedding_llm(model: Optional[str] = None):
     """Embedding LLM 인스턴스 반환"""
     global _embedding_llm
-    if _embedding_llm is None or model:
-        _embedding_llm = LLMFactory.create_embedding_llm(model)
+    if model:
+        return LLMFactory.create_embedding_llm(model)
+
+    if _embedding_llm is None:
+        with _embedding_llm_lock:
+            if _embedding_llm is None:
+                embedding_llm = LLMFactory.create_embedding_llm()
+
+                # 동시 embed_query 요청을 배치로 묶음
+                if config.llm.embedding_batch_enabled:
+                    embedding_llm = EmbeddingBatcher(
+                        embedding_llm,
+                        batch_window_ms=config.llm.embedding_batch_window_ms,
+                        max_batch_size=config.llm.embedding_batch_max_size,
+                        max_concurrent_batches=config.llm.embedding_batch_max_concurrency,
+                        timeout=config.llm.http_timeout
+                    )
+                _embedding_llm = embedding_llm
     return _embedding_llm
 
 
+def get_embedding_batch_stats() -> Optional[Dict[str, Any]]:
+    """임베딩 배칭 통계 (배칭 미사용 시 None)"""
+    if isinstance(_embedding_llm, EmbeddingBatcher):
+        return _embedding_llm.stats()
+    return None
+
+
 def get_vision_llm(model: Optional[str] = None):
     """Vision LLM 인스턴스 반환"""
     global _vision_llm
@@ -142,6 +421,60 @@ def get_vision_llm(model: Optional[str] = None):
     return _vision_llm
 
 
+# 제목 최대 길이 / 제목 생성에 사용하는 처음 메시지 수 (user+assistant 3턴)
+TITLE_MAX_LENGTH = 30
+TITLE_CONTEXT_MESSAGES = 6
+
+_TITLE_RULES = """
+제목 생성 규칙:
+- 30자 이내로 간결하게
+- 핵심 키워드 포함 (부품 번호, 작업 내용 등)
+- 의문형이 아닌 명사형으로
+- 특수문자 사용 안함
+
+예시:
+- "부품 ABC-12345 재고 조회"
+- "라인 1 검사 이력 확인"
+- "출고 현황 분석"
+""".strip()
+
+# 여러 대화 제목 생성용 LLM 호출 (시간 초과 시 기다리지 않고 대체 제목 사용)
+_title_executor = None
+_title_executor_lock = threading.Lock()
+
+
+def _first_user_message(messages: List[Dict[str, Any]]) -> Optional[str]:
+    """첫 번째 사용자 메시지"""
+    for msg in messages:
+        if msg.get("role") == "user":
+            return msg.get("content", "")
+    return None
+
+
+def _title_context(messages: List[Dict[str, Any]]) -> str:
+    """제목 생성용 대화 내용 (처음 최대 3턴, 메시지당 200자)"""
+    return "\n".join([
+        f"{'사용자' if msg.get('role') == 'user' else '봇'}: {msg.get('content', '')[:200]}"
+        for msg in messages[:TITLE_CONTEXT_MESSAGES]
+    ])
+
+
+def _clean_title(title: str) -> str:
+    """제목 정제 (따옴표 제거, 30자 제한)"""
+    title = title.replace('"', '').replace("'", '').strip()
+    if len(title) > TITLE_MAX_LENGTH:
+        title = title[:TITLE_MAX_LENGTH - 3] + "..."
+    return title
+
+
+def fallback_title(messages: List[Dict[str, Any]]) -> str:
+    """LLM 없이 만드는 제목 (첫 사용자 메시지 앞부분, 없으면 "새 대화")"""
+    first_user_message = _first_user_message(messages)
+    if not first_user_message:
+        return "새 대화"
+    return _clean_title(first_user_message) if len(first_user_message) > TITLE_MAX_LENGTH else first_user_message
+
+
 def generate_title(messages: List[Dict[str, Any]]) -> str:
     """
     대화 내용을 기반으로 제목 자동 생성
@@ -157,65 +490,119 @@ def generate_title(messages: List[Dict[str, Any]]) -> str:
     Returns:
         생성된 제목 (예: "부품 ABC-12345 재고 조회")
     """
-    if not messages:
-        return "새 대화"
-
-    # 첫 번째 사용자 메시지 추출
-    first_user_message = None
-    for msg in messages:
-        if msg.get("role") == "user":
-            first_user_message = msg.get("content", "")
-            break
-
+    first_user_message = _first_user_message(messages)
     if not first_user_message:
         return "새 대화"
 
     # 간단한 경우: 첫 메시지가 짧으면 그대로 사용
-    if len(first_user_message) <= 30:
+    if len(first_user_message) <= TITLE_MAX_LENGTH:
         return first_user_message
 
     # LLM을 사용하여 제목 생성
     llm = get_chat_llm(temperature=0.3)  # 창의성 약간 높임
 
-    # 처음 최대 3개 메시지 사용
-    context_messages = messages[:min(6, len(messages))]  # user+assistant 3턴
-    context = "\n".join([
-        f"{'사용자' if msg.get('role') == 'user' else '봇'}: {msg.get('content', '')[:200]}"
-        for msg in context_messages
-    ])
-
     prompt = f"""다음 대화의 핵심 주제를 30자 이내의 간결한 제목으로 만들어주세요.
 
 대화 내용:
-{context}
-
-제목 생성 규칙:
-- 30자 이내로 간결하게
-- 핵심 키워드 포함 (부품 번호, 작업 내용 등)
-- 의문형이 아닌 명사형으로
-- 특수문자 사용 안함
+{_title_context(messages)}
 
-예시:
-- "부품 ABC-12345 재고 조회"
-- "라인 1 검사 이력 확인"
-- "출고 현황 분석"
+{_TITLE_RULES}
 
 제목:"""
 
     try:
         response = llm.invoke(prompt)
-        title = response.content.strip()
-
-        # 제목 정제
-        title = title.replace('"', '').replace("'", '').strip()
-
-        # 30자 제한
-        if len(title) > 30:
-            title = title[:27] + "..."
-
+        title = _clean_title(response.content)
         return title if title else "새 대화"
 
     except Exception as e:
         print(f"제목 생성 오류: {e}")
         # 실패 시 첫 메시지의 앞부분 사용
-        return first_user_message[:27] + "..." if len(first_user_message) > 30 else first_user_message
+        return fallback_title(messages)
+
+
+def _get_title_executor() -> ThreadPoolExecutor:
+    """
+    제목 일괄 생성 LLM 호출용 스레드 풀
+    호출마다 요청 제한 시간을 두므로 시간 초과된 호출도 제한 시간(클라이언트 재시도 포함) 안에 스레드를 반환 (풀이 계속 막히지 않음)
+    """
+    global _title_executor
+    if _title_executor is None:
+        with _title_executor_lock:
+            if _title_executor is None:
+                _title_executor = ThreadPoolExecutor(
+                    max_workers=config.chat_title_batch_max_concurrency,
+                    thread_name_prefix="title-llm"
+                )
+    return _title_executor
+
+
+def _parse_titles(content: str) -> Dict[str, str]:
+    """LLM 응답에서 {대화 ID: 제목} JSON 객체 추출"""
+    start, end = content.find("{"), content.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError(f"JSON 객체가 없는 응답: {content[:100]}")
+    titles = json.loads(content[start:end + 1])
+    if not isinstance(titles, dict):
+        raise ValueError("제목 응답이 JSON 객체가 아님")
+    return {str(key): _clean_title(str(value)) for key, value in titles.items() if value}
+
+
+def generate_titles(conversations: Dict[str, List[Dict[str, Any]]], timeout: float) -> Tuple[Dict[str, str], str]:
+    """
+    여러 대화의 제목을 한 번의 LLM 호출로 생성
+
+    - 첫 사용자 메시지가 짧은 대화는 LLM 없이 그대로 사용 (generate_title과 동일)
+    - 나머지는 하나의 구조화 프롬프트로 요청하고 JSON 객체({대화 ID: 제목})로 받음
+    - 시간 초과 / 오류 / 응답에 빠진 대화는 첫 메시지 앞부분으로 대체 (fallback_title)
+
+    Args:
+        conversations: {대화 ID: 메시지 목록}
+        timeout: LLM 응답 대기 시간 (초)
+
+    Returns:
+        ({대화 ID: 제목}, LLM 호출 결과: "skipped" | "completed" | "timeout" | "error")
+    """
+    titles = {}
+    pending = {}
+    for conversation_id, messages in conversations.items():
+        first_user_message = _first_user_message(messages)
+        if first_user_message and len(first_user_message) > TITLE_MAX_LENGTH:
+            pending[conversation_id] = messages
+        else:
+            titles[conversation_id] = fallback_title(messages)
+
+    if not pending:
+        return titles, "skipped"
+
+    sections = "\n\n".join(
+        f"### {conversation_id}\n{_title_context(messages)}"
+        for conversation_id, messages in pending.items()
+    )
+    prompt = f"""다음 {len(pending)}개 대화 각각의 핵심 주제를 30자 이내의 간결한 제목으로 만들어주세요.
+각 대화는 "### 대화 ID" 줄로 시작합니다.
+
+{sections}
+
+{_TITLE_RULES}
+
+응답 형식: 다른 설명 없이 대화 ID를 키로 하는 JSON 객체만 출력
+{{"대화 ID": "제목", ...}}"""
+
+    llm = get_chat_llm(temperature=0.3)
+    # HTTP 요청에도 같은 제한 시간을 걸어 시간 초과 후 호출이 스레드를 계속 점유하지 않도록 함
+    future = _get_title_executor().submit(llm.invoke, prompt, timeout=timeout)
+    try:
+        generated = _parse_titles(future.result(timeout=timeout).content)
+        outcome = "completed"
+    except (FuturesTimeoutError, TimeoutError, APITimeoutError) as e:
+        # 대기 시간 초과: 호출은 요청 제한 시간에 끝나므로 결과만 버림
+        print(f"제목 일괄 생성 시간 초과 ({timeout}초, {len(pending)}개 대화): {type(e).__name__}")
+        generated, outcome = {}, "timeout"
+    except Exception as e:
+        print(f"제목 일괄 생성 오류: {e}")
+        generated, outcome = {}, "error"
+
+    for conversation_id, messages in pending.items():
+        titles[conversation_id] = generated.get(conversation_id) or fallback_title(messages)
+    return titles, outcome
@@ -0,0 +1,163 @@
+"""
+ASGI 서버 진입점
+- POST /api/chat, /api/chat/stream 은 비동기 Agent(ainvoke/astream)로 처리
+  → LLM/DB 응답을 기다리는 동안 워커 스레드를 점유하지 않음
+- 그 외 경로는 기존 Flask 앱으로 위임 (WsgiToAsgi)
+
+실행:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+"""
+import asyncio
+import json
+from asgiref.wsgi import WsgiToAsgi
+from app import create_app
+from app.agents.chatbot_agent import get_chatbot_agent
+from app.config import config
+from app.routes.chat import save_chat_turn, title_event
+from app.services.conversation_service import shutdown_chat_turn_writer
+from app.services.database_service import get_async_pgvector
+
+flask_app = WsgiToAsgi(create_app())
+
+# CORS (Flask 앱의 flask-cors 설정과 동일)
+CORS_HEADERS = [(b"access-control-allow-origin", b"*")]
+
+
+async def _read_json(receive) -> dict:
+    """요청 본문을 JSON으로 읽기"""
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    try:
+        return json.loads(body or b"{}")
+    except ValueError:
+        return {}
+
+
+async def _send_json(send, payload: dict, status: int = 200):
+    """JSON 응답 전송"""
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(body)).encode())
+        ] + CORS_HEADERS
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _parse_chat_request(data: dict) -> dict:
+    """채팅 요청 파라미터 추출 (routes/chat.py와 동일)"""
+    return {
+        "query": data.get("message"),
+        "user_id": data.get("user_id"),
+        "conversation_id": data.get("conversation_id"),
+        "custom_prompt": data.get("custom_prompt"),
+        "llm_config": data.get("llm_config")
+    }
+
+
+async def chat(receive, send):
+    """채팅 메시지 처리 (비동기) - /api/chat 과 동일한 요청/응답"""
+    params = _parse_chat_request(await _read_json(receive))
+    if not params["query"]:
+        await _send_json(send, {"success": False, "error": "메시지가 필요합니다."}, status=400)
+        return
+
+    result = await get_chatbot_agent().ainvoke(**params)
+
+    # 대화 저장 (write-behind면 큐에 넣고 바로 반환, 아니면 동기 클라이언트 → 스레드에서 실행)
+    if result.get("success") and params["conversation_id"]:
+        await asyncio.to_thread(save_chat_turn, params["conversation_id"], params["query"], result)
+
+    await _send_json(send, result)
+
+
+async def chat_stream(receive, send):
+    """채팅 메시지 처리 (비동기 SSE) - /api/chat/stream 과 동일한 이벤트"""
+    params = _parse_chat_request(await _read_json(receive))
+    if not params["query"]:
+        await _send_json(send, {"success": False, "error": "메시지가 필요합니다."}, status=400)
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no")
+        ] + CORS_HEADERS
+    })
+
+    final = None
+    async for event in get_chatbot_agent().astream(**params):
+        if event["type"] == "final":
+            final = event["data"]
+        await _send_event(send, event)
+
+    # 답변 전송 후 대화 저장, 첫 턴이면 생성된 제목을 title 이벤트로 전달
+    if final and params["conversation_id"]:
+        title = await _wait_for_title(params["conversation_id"], params["query"], final)
+        if title:
+            await _send_event(send, title_event(params["conversation_id"], title))
+
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _send_event(send, event: dict):
+    """SSE 이벤트 전송"""
+    data = f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+    await send({"type": "http.response.body", "body": data.encode("utf-8"), "more_body": True})
+
+
+async def _wait_for_title(conversation_id: str, message: str, result: dict):
+    """대화 턴 저장 후 첫 턴 제목 대기 (routes/chat.py wait_for_title과 동일)"""
+    future = await asyncio.to_thread(save_chat_turn, conversation_id, message, result)
+    if future is None:
+        return result.get("conversation_title")
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=config.chat_title_event_timeout)
+    except Exception:
+        return None
+
+
+async def lifespan(receive, send):
+    """서버 시작/종료 처리"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            # 저장 대기 중인 대화 턴 flush
+            await asyncio.to_thread(shutdown_chat_turn_writer)
+            # 비동기 PostgreSQL 커넥션 풀 정리
+            if not config.test_mode:
+                await get_async_pgvector().close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+ASYNC_ROUTES = {
+    "/api/chat": chat,
+    "/api/chat/stream": chat_stream
+}
+
+
+async def app(scope, receive, send):
+    """ASGI 애플리케이션"""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+
+    handler = ASYNC_ROUTES.get(scope.get("path"))
+    if scope["type"] == "http" and scope.get("method") == "POST" and handler:
+        await handler(receive, send)
+        return
+
+    await flask_app(scope, receive, send)
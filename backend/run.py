@@ -1,5 +1,6 @@
 """
-Flask 서버 실행
+Flask 서버 실행 (개발용)
+운영 환경에서는 python serve.py (gunicorn 멀티 워커) 사용
 """
 from app import create_app
 from app.config import config
@@ -0,0 +1,34 @@
+"""
+기존 부품 문서에 부품명 검색 토큰 추가 (MONGODB_PART_SEARCH_MODE=ngram 전환용)
+재실행해도 안전 (토큰을 다시 계산해 덮어씀)
+
+사용법:
+    python scripts/backfill_part_search_tokens.py --batch-size 1000
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from app.services.database_service import MongoDBService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부품명 검색 토큰 백필")
+    parser.add_argument("--batch-size", type=int, default=1000, help="bulk_write 1회당 문서 수")
+    args = parser.parse_args()
+
+    # 생성 시 검색 토큰 인덱스도 함께 생성
+    mongodb = MongoDBService()
+
+    print("부품명 검색 토큰 계산 중...")
+    started = time.perf_counter()
+    updated = mongodb.backfill_part_search_tokens(batch_size=args.batch_size)
+    print(f"✓ {updated}개 부품 갱신 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
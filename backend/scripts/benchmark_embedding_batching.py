@@ -0,0 +1,120 @@
+"""
+임베딩 마이크로 배칭 벤치마크 (테스트 모드)
+동시 사용자 50/100/200명이 embed_query를 호출할 때 배칭 유무에 따른 처리량 비교
+임베딩 서비스는 Mock (요청당 / 텍스트당 지연을 인자로 지정) → 결과는 지연 모델에 따른 추정치이며 실측이 아님
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Mock LLM 사용
+os.environ["TEST_MODE"] = "True"
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.config import config
+from app.services.llm_service import EmbeddingBatcher
+from tests.mocks import MockEmbeddingLLM
+
+
+class LimitedEmbeddingService:
+    """
+    동시 요청 수가 제한된 임베딩 서비스 시뮬레이션
+    (실제 게이트웨이의 연결/처리 용량 제한을 흉내냄)
+    """
+
+    def __init__(self, max_concurrency: int, call_latency: float, text_latency: float):
+        self.llm = MockEmbeddingLLM(call_latency=call_latency, text_latency=text_latency)
+        self.semaphore = threading.Semaphore(max_concurrency)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _count(self):
+        with self._lock:
+            self.calls += 1
+
+    def embed_query(self, text):
+        with self.semaphore:
+            self._count()
+            return self.llm.embed_query(text)
+
+    def embed_documents(self, texts):
+        with self.semaphore:
+            self._count()
+            return self.llm.embed_documents(texts)
+
+
+def run(embedder, users: int, requests_per_user: int, repeat_ratio: float):
+    """동시 사용자 부하 실행 → (총 소요 시간, 요청별 지연 목록)"""
+    latencies = []
+    lock = threading.Lock()
+    # 일부 질문은 여러 사용자가 동시에 같은 내용을 보냄 (single-flight 대상)
+    repeated = max(int(users * repeat_ratio), 1)
+
+    def user(user_index: int):
+        for i in range(requests_per_user):
+            if user_index < repeated:
+                text = f"공통 질문 {i}"
+            else:
+                text = f"사용자 {user_index} 질문 {i}"
+            started = time.perf_counter()
+            embedder.embed_query(text)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        list(executor.map(user, range(users)))
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 마이크로 배칭 벤치마크")
+    parser.add_argument("--users", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--requests-per-user", type=int, default=3)
+    parser.add_argument("--server-concurrency", type=int, default=8, help="임베딩 서비스 동시 처리 한도")
+    parser.add_argument("--repeat-ratio", type=float, default=0.2, help="같은 질문을 보내는 사용자 비율")
+    parser.add_argument("--call-latency-ms", type=float, default=200, help="Mock 임베딩 요청당 지연 (네트워크/고정 비용)")
+    parser.add_argument("--text-latency-ms", type=float, default=5, help="Mock 임베딩 텍스트당 추가 지연")
+    args = parser.parse_args()
+    call_latency = args.call_latency_ms / 1000
+    text_latency = args.text_latency_ms / 1000
+
+    print("=" * 72)
+    print("임베딩 마이크로 배칭 벤치마크")
+    print(f"※ Mock 임베딩 서비스 결과 (실측 아님): 요청당 {args.call_latency_ms:g}ms + 텍스트당 {args.text_latency_ms:g}ms")
+    print(f"배치 윈도우: {config.llm.embedding_batch_window_ms}ms, 최대 배치: {config.llm.embedding_batch_max_size}, "
+          f"서비스 동시 처리: {args.server_concurrency}")
+    print("=" * 72)
+    print(f"{'users':>6} | {'mode':>8} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'HTTP calls':>10}")
+    print("-" * 72)
+
+    for users in args.users:
+        for mode in ("direct", "batched"):
+            service = LimitedEmbeddingService(args.server_concurrency, call_latency, text_latency)
+            if mode == "batched":
+                embedder = EmbeddingBatcher(
+                    service,
+                    batch_window_ms=config.llm.embedding_batch_window_ms,
+                    max_batch_size=config.llm.embedding_batch_max_size,
+                    max_concurrent_batches=config.llm.embedding_batch_max_concurrency,
+                    timeout=config.llm.http_timeout
+                )
+            else:
+                embedder = service
+
+            elapsed, latencies = run(embedder, users, args.requests_per_user, args.repeat_ratio)
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f"{users:>6} | {mode:>8} | {len(latencies) / elapsed:>8.1f} | "
+                  f"{statistics.median(latencies) * 1000:>8.0f} | {p95 * 1000:>8.0f} | {service.calls:>10}")
+        print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
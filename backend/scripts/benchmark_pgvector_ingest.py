@@ -0,0 +1,81 @@
+"""
+pgvector 문서 적재 벤치마크 (실제 PostgreSQL 필요)
+INSERT ... VALUES (execute_values) 방식과 COPY BINARY 방식의 초당 적재 행 수 비교
+벤치마크용 행은 실행 후 삭제
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import uuid
+import numpy as np
+from app.config import config
+from app.services.database_service import PgVectorService
+
+
+def make_documents(count: int, dimension: int, chunks_per_document: int):
+    """랜덤 임베딩을 가진 벤치마크용 청크 생성 (여러 문서에 걸쳐 분배)"""
+    run_id = uuid.uuid4().hex[:8]
+    rng = np.random.default_rng(42)
+    embeddings = rng.random((count, dimension), dtype=np.float32)
+    return [
+        {
+            "document_id": f"bench_{run_id}_{i // chunks_per_document}",
+            "chunk_index": i % chunks_per_document,
+            "content": f"벤치마크 청크 {i} " + "반도체 부품 사양 " * 20,
+            "chunk_type": "text",
+            "embedding": embeddings[i],
+            "metadata": {"source": "benchmark", "page_number": i % 50}
+        }
+        for i in range(count)
+    ]
+
+
+def cleanup(pgvector: PgVectorService, documents):
+    """벤치마크용 행 삭제"""
+    for document_id in {doc["document_id"] for doc in documents}:
+        pgvector.delete_document(document_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pgvector 적재 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--dimension", type=int, default=config.llm.embedding_dimension)
+    parser.add_argument("--chunks-per-document", type=int, default=500)
+    args = parser.parse_args()
+
+    pgvector = PgVectorService()
+
+    print("=" * 60)
+    print(f"pgvector 적재 벤치마크 (차원: {args.dimension})")
+    print("=" * 60)
+    print(f"{'rows':>8} | {'mode':>8} | {'seconds':>8} | {'rows/s':>10}")
+    print("-" * 60)
+
+    for rows in args.rows:
+        for mode in ("values", "copy"):
+            documents = make_documents(rows, args.dimension, args.chunks_per_document)
+            if mode == "values":
+                # 기존 방식은 임베딩을 파이썬 리스트로 전달
+                for doc in documents:
+                    doc["embedding"] = doc["embedding"].tolist()
+                insert = pgvector.add_documents_values
+            else:
+                insert = pgvector.add_documents_copy
+
+            started = time.perf_counter()
+            ids = insert(documents)
+            elapsed = time.perf_counter() - started
+            assert len(ids) == rows
+
+            print(f"{rows:>8} | {mode:>8} | {elapsed:>8.2f} | {rows / elapsed:>10.0f}")
+            cleanup(pgvector, documents)
+        print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
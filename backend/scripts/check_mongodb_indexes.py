@@ -0,0 +1,79 @@
+"""
+MongoDB 인덱스 점검
+주요 조회 쿼리의 실행 계획을 확인하고 COLLSCAN이 있으면 종료 코드 1 반환 (CI / 테스트 실행용)
+
+사용법:
+    python scripts/check_mongodb_indexes.py
+    TEST_MODE=True python scripts/check_mongodb_indexes.py   # Mock DB (인덱스 정의 기준 시뮬레이션)
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.conversation_service import build_conversation_list_query
+from app.services.database_service import DatabaseFactory, build_part_search_pipeline, query_shape
+
+
+# (컬렉션, 쿼리, 설명) - 요청마다 실행되는 조회
+HOT_QUERIES = [
+    ("parts", {"part_number": {"$in": ["ABC-12345", "ABC-12346"]}}, "엔티티 부품 조회"),
+    ("parts", build_part_search_pipeline(["반도체"], 10)[0]["$match"], "부품명 키워드 검색"),
+    ("conversations", {"conversation_id": "conv_check", "messages": {"$exists": False}}, "대화 조회"),
+    ("conversations", build_conversation_list_query("user_check", cursor="2026-01-01T00:00:00|conv_check"), "대화 목록"),
+    ("conversation_messages", {"conversation_id": "conv_check", "bucket": {"$gte": 0, "$lte": 1}}, "메시지 페이지 조회"),
+    ("user_memories", {"user_id": "user_check"}, "메모리 조회"),
+    ("feedback", {"feedback_type": "negative"}, "부정 피드백 조회"),
+    ("document_metadata", {"document_id": "doc_check"}, "문서 메타데이터 조회"),
+]
+
+# (컬렉션, 쿼리, 업데이트 (None이면 delete), upsert, 설명) - 요청마다 실행되는 쓰기
+HOT_WRITES = [
+    ("conversations", {"conversation_id": "conv_check", "messages": {"$exists": False}},
+     {"$inc": {"message_count": 2}, "$set": {"updated_at": "2026-01-01T00:00:00"}}, False, "대화 턴 순번 확보"),
+    ("conversation_messages", {"conversation_id": "conv_check", "bucket": 0, "messages.seq": {"$ne": 0}},
+     {"$push": {"messages": {"$each": []}}, "$inc": {"count": 0}}, True, "메시지 버킷 추가"),
+    ("conversations", {"conversation_id": "conv_check", "title": "새 대화"},
+     {"$set": {"title": "check"}}, False, "자동 제목 저장"),
+    ("user_memories", {"user_id": "user_check", "category": "선호도", "key": "check"},
+     {"$set": {"value": "check"}}, True, "메모리 upsert"),
+    ("conversations", {"conversation_id": "conv_check"}, None, False, "대화 삭제"),
+    ("conversation_messages", {"conversation_id": "conv_check"}, None, False, "메시지 버킷 삭제"),
+    ("document_metadata", {"document_id": "doc_check"}, None, False, "문서 삭제"),
+]
+
+
+def print_plan(collection: str, query, plan, description: str):
+    """실행 계획 한 줄 출력"""
+    marker = "⚠ " if plan["collscan"] else ""
+    print(f"{collection:<22} | {marker + ' > '.join(plan['stages']):<24} | "
+          f"{', '.join(plan['indexes']) or '-':<32} | {query_shape(query)} ({description})")
+
+
+def main():
+    mongodb = DatabaseFactory.get_mongodb()
+
+    print(f"{'collection':<22} | {'plan':<24} | {'index':<32} | 쿼리")
+    print("-" * 108)
+
+    collscans = 0
+    for collection, query, description in HOT_QUERIES:
+        plan = mongodb.explain(collection, query)
+        collscans += plan["collscan"]
+        print_plan(collection, query, plan, description)
+
+    for collection, query, update, upsert, description in HOT_WRITES:
+        plan = mongodb.explain_write(collection, query, update, upsert=upsert)
+        collscans += plan["collscan"]
+        print_plan(collection, query, plan, description)
+
+    print("-" * 108)
+    if collscans:
+        print(f"COLLSCAN {collscans}건")
+        sys.exit(1)
+    print("✓ 모든 쿼리가 인덱스를 사용합니다.")
+
+
+if __name__ == "__main__":
+    main()
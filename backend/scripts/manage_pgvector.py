@@ -0,0 +1,222 @@
+"""
+pgvector 관리 명령 (실제 PostgreSQL 필요)
+
+사용법:
+    python scripts/manage_pgvector.py status
+    python scripts/manage_pgvector.py reindex --m 32 --ef-construction 128
+    python scripts/manage_pgvector.py migrate-storage --mode halfvec --drop-other-indexes
+    python scripts/manage_pgvector.py recall --queries 100 --k 5 --modes full halfvec binary
+    python scripts/manage_pgvector.py normalize
+    python scripts/manage_pgvector.py backfill-part-numbers
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from pgvector.utils import from_db
+from app.config import config
+from app.agents.rule_classifier import extract_part_numbers
+from app.services.database_service import EMBEDDING_INDEX_NAMES, PgVectorService, embedding_index_name
+
+
+def print_index_status(pgvector: PgVectorService):
+    """임베딩 인덱스 상태 출력"""
+    indexes = pgvector.embedding_index_info()
+    if not indexes:
+        print("임베딩 인덱스가 없습니다.")
+        return
+
+    for index in indexes:
+        options = ", ".join(index["options"] or []) or "기본값"
+        status = "사용 가능" if index["is_valid"] else "INVALID (빌드 실패 또는 진행 중)"
+        print(f"- {index['name']}: {options} | {index['size_bytes'] / 1024 / 1024:.1f} MB | {status}")
+
+
+def status(args):
+    """현재 인덱스 빌드 파라미터 / 크기 출력"""
+    pgvector = PgVectorService()
+    print_index_status(pgvector)
+    index_dimension = config.database.vector_index_dimension or config.llm.embedding_dimension
+    print(f"\n설정: 차원={config.llm.embedding_dimension} (인덱스 {index_dimension}), "
+          f"저장 모드={config.database.vector_storage_mode} "
+          f"(재정렬 후보 ×{config.database.vector_rerank_factor}), "
+          f"m={config.database.hnsw_m}, ef_construction={config.database.hnsw_ef_construction}, "
+          f"ef_search(기본)={config.database.hnsw_ef_search}")
+
+
+def reindex(args):
+    """임베딩 인덱스 재생성 (CONCURRENTLY, 검색 중단 없음)"""
+    pgvector = PgVectorService()
+    m = args.m or config.database.hnsw_m
+    ef_construction = args.ef_construction or config.database.hnsw_ef_construction
+
+    print(f"HNSW 인덱스 재생성 시작: m={m}, ef_construction={ef_construction}")
+    print("(기존 인덱스는 새 인덱스가 완성될 때까지 검색에 계속 사용됩니다)")
+    started = time.perf_counter()
+    pgvector.rebuild_embedding_index(m=m, ef_construction=ef_construction)
+    print(f"✓ 완료 ({time.perf_counter() - started:.1f}초)\n")
+    print_index_status(pgvector)
+
+
+def migrate_storage(args):
+    """저장 모드 / 인덱스 차원 전환: 해당 인덱스 생성 (기존 행은 그대로, CONCURRENTLY)"""
+    pgvector = PgVectorService()
+
+    print(f"저장 모드 인덱스 생성 시작: {args.mode} ({embedding_index_name(args.mode)})")
+    started = time.perf_counter()
+    pgvector.migrate_storage_mode(args.mode, drop_other_indexes=args.drop_other_indexes)
+    print(f"✓ 완료 ({time.perf_counter() - started:.1f}초)\n")
+    print_index_status(pgvector)
+    print(f"\n적용하려면 VECTOR_STORAGE_MODE={args.mode}, "
+          f"VECTOR_INDEX_DIMENSION={config.database.vector_index_dimension} 설정 후 서버 재시작")
+
+
+def normalize(args):
+    """
+    정규화 모드 전환: 기존 임베딩 L2 정규화 → 현재 저장 모드의 내적(_ip) 인덱스 생성
+    행 갱신 중에도 기존 코사인 인덱스로 검색 가능 (단위 벡터로 바뀌어도 코사인 순위는 같음)
+    """
+    pgvector = PgVectorService()
+
+    print("임베딩 정규화 시작")
+    started = time.perf_counter()
+    updated = pgvector.normalize_embeddings(
+        batch_size=args.batch_size,
+        progress=lambda table, count: print(f"  {table}: {count}행 갱신", end="\r")
+    )
+    print()
+    for table, count in updated.items():
+        print(f"- {table}: {count}행 정규화")
+    print(f"✓ 완료 ({time.perf_counter() - started:.1f}초)\n")
+
+    if args.skip_index:
+        return
+
+    config.database.vector_normalized = True
+    mode = config.database.vector_storage_mode
+    print(f"내적 인덱스 생성 시작: {embedding_index_name(mode)}")
+    pgvector.migrate_storage_mode(mode)
+    print_index_status(pgvector)
+    print("\n적용하려면 VECTOR_NORMALIZED=True 설정 후 서버 재시작 "
+          "(이후 migrate-storage --drop-other-indexes로 코사인 인덱스 삭제)")
+
+
+def backfill_part_numbers(args):
+    """기존 청크에 metadata.part_numbers 채우기 (부품번호 메타데이터 필터 대상)"""
+    pgvector = PgVectorService()
+
+    print(f"부품번호 메타데이터 백필 시작 (패턴: {config.rule_part_number_pattern})")
+    started = time.perf_counter()
+    updated = pgvector.backfill_part_numbers(
+        extract_part_numbers,
+        batch_size=args.batch_size,
+        progress=lambda count: print(f"  document_chunks: {count}행 갱신", end="\r")
+    )
+    print()
+    print(f"✓ 완료: {updated}행 ({time.perf_counter() - started:.1f}초)")
+
+
+def sample_queries(pgvector: PgVectorService, count: int):
+    """저장된 청크 임베딩을 검색 쿼리로 샘플링"""
+    def fetch(conn):
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT embedding::text FROM document_chunks "
+                "WHERE embedding IS NOT NULL ORDER BY random() LIMIT %s",
+                (count,)
+            )
+            return [from_db(row[0]).tolist() for row in cur.fetchall()]
+
+    return pgvector._run_read(fetch)
+
+
+def exact_top_k(pgvector: PgVectorService, query_embedding, k: int):
+    """인덱스 없이 float32 코사인 거리로 계산한 정답 top-k id"""
+    def fetch(conn):
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL enable_indexscan = off")
+            cur.execute(
+                "SELECT id FROM document_chunks ORDER BY embedding <=> %s::vector LIMIT %s",
+                (query_embedding, k)
+            )
+            ids = [row[0] for row in cur.fetchall()]
+            conn.rollback()
+            return ids
+
+    return pgvector._run_read(fetch)
+
+
+def recall(args):
+    """저장 모드별 recall@k / 평균 검색 지연 측정 (정답: float32 정확 검색)"""
+    pgvector = PgVectorService()
+    queries = sample_queries(pgvector, args.queries)
+    if not queries:
+        print("document_chunks에 임베딩이 없습니다.")
+        return
+
+    truth = [set(exact_top_k(pgvector, query, args.k)) for query in queries]
+    available = {index["name"] for index in pgvector.embedding_index_info() if index["is_valid"]}
+    original_mode = config.database.vector_storage_mode
+
+    print(f"{'mode':>8} | {f'recall@{args.k}':>9} | {'avg ms':>8} | 인덱스")
+    print("-" * 50)
+    try:
+        for mode in args.modes:
+            config.database.vector_storage_mode = mode
+            hits = 0
+            started = time.perf_counter()
+            for query, expected in zip(queries, truth):
+                results = pgvector.similarity_search(query, k=args.k, ef_search=args.ef_search)
+                hits += len(expected & {row["id"] for row in results})
+            elapsed_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+            total = sum(len(expected) for expected in truth)
+            index_status = "있음" if embedding_index_name(mode) in available else "없음 (순차 스캔)"
+            print(f"{mode:>8} | {hits / total:>9.3f} | {elapsed_ms:>8.1f} | {index_status}")
+    finally:
+        config.database.vector_storage_mode = original_mode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pgvector 관리 명령")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="임베딩 인덱스 상태").set_defaults(func=status)
+
+    reindex_parser = subparsers.add_parser("reindex", help="HNSW 인덱스 재생성 (읽기 차단 없음)")
+    reindex_parser.add_argument("--m", type=int, help="노드당 연결 수 (기본: HNSW_M)")
+    reindex_parser.add_argument("--ef-construction", type=int, help="빌드 시 후보 수 (기본: HNSW_EF_CONSTRUCTION)")
+    reindex_parser.set_defaults(func=reindex)
+
+    migrate_parser = subparsers.add_parser("migrate-storage", help="임베딩 저장 모드 인덱스 생성 (VECTOR_INDEX_DIMENSION 반영, 읽기 차단 없음)")
+    migrate_parser.add_argument("--mode", choices=list(EMBEDDING_INDEX_NAMES), required=True)
+    migrate_parser.add_argument("--drop-other-indexes", action="store_true", help="다른 모드의 임베딩 인덱스 삭제")
+    migrate_parser.set_defaults(func=migrate_storage)
+
+    recall_parser = subparsers.add_parser("recall", help="저장 모드별 recall@k 측정")
+    recall_parser.add_argument("--queries", type=int, default=100, help="샘플 쿼리 수")
+    recall_parser.add_argument("--k", type=int, default=5)
+    recall_parser.add_argument("--ef-search", type=int, help="HNSW 탐색 폭 (기본: HNSW_EF_SEARCH)")
+    recall_parser.add_argument("--modes", nargs="+", choices=list(EMBEDDING_INDEX_NAMES),
+                               default=list(EMBEDDING_INDEX_NAMES))
+    recall_parser.set_defaults(func=recall)
+
+    normalize_parser = subparsers.add_parser("normalize", help="기존 임베딩 L2 정규화 + 내적 인덱스 생성")
+    normalize_parser.add_argument("--batch-size", type=int, default=5000, help="커밋 단위 id 구간 크기")
+    normalize_parser.add_argument("--skip-index", action="store_true", help="행 정규화만 실행")
+    normalize_parser.set_defaults(func=normalize)
+
+    backfill_parser = subparsers.add_parser("backfill-part-numbers", help="기존 청크 본문에서 부품번호 추출 → metadata.part_numbers")
+    backfill_parser.add_argument("--batch-size", type=int, default=5000, help="커밋 단위 id 구간 크기")
+    backfill_parser.set_defaults(func=backfill_part_numbers)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+기존 대화의 내장 messages 배열을 conversation_messages 버킷으로 이전
+대화 문서에 message_count / bucket_size를 기록하고 messages 필드는 제거
+재실행 / 서비스 중 실행해도 안전 (대화별 선점 후 이전, 이전 안 된 대화는 처음 조회/저장할 때도 이전됨)
+bucket_size가 기록되지 않은 버킷 방식 대화에는 현재 MONGODB_MESSAGE_BUCKET_SIZE를 기록
+(버킷 크기를 바꾸기 전에 실행해야 기존 대화의 버킷 계산이 유지됨)
+
+사용법:
+    python scripts/migrate_conversation_messages.py --batch-size 100
+"""
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from app.services.conversation_service import CONVERSATIONS_COLLECTION, get_message_store
+
+
+def pin_bucket_sizes(store, batch_size: int) -> int:
+    """bucket_size가 없는 버킷 방식 대화에 현재 버킷 크기 기록 (기록한 대화 수)"""
+    pinned = 0
+    while True:
+        batch = store.mongodb.find(
+            CONVERSATIONS_COLLECTION,
+            {"messages": {"$exists": False}, "bucket_size": {"$exists": False}},
+            limit=batch_size,
+            projection={"conversation_id": 1}
+        )
+        if not batch:
+            return pinned
+        store.mongodb.bulk_update(CONVERSATIONS_COLLECTION, [
+            (
+                {"conversation_id": conversation["conversation_id"], "bucket_size": {"$exists": False}},
+                {"$set": {"bucket_size": store.bucket_size}}
+            )
+            for conversation in batch
+        ])
+        pinned += len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대화 메시지 버킷 이전")
+    parser.add_argument("--batch-size", type=int, default=100, help="한 번에 읽는 대화 수")
+    args = parser.parse_args()
+
+    store = get_message_store()
+    print(f"대화 메시지 이전 시작 (버킷 크기: {store.bucket_size})")
+    started = time.perf_counter()
+    conversations = messages = 0
+    skipped = set()
+    while True:
+        # 이전된 대화는 messages가 제거되므로 조건에서 빠짐 (다른 프로세스가 이전 중인 대화는 한 번만 시도)
+        batch = [
+            conversation for conversation in store.mongodb.find(
+                CONVERSATIONS_COLLECTION,
+                {"messages": {"$exists": True}},
+                limit=args.batch_size + len(skipped),
+                projection={"conversation_id": 1}
+            )
+            if conversation["conversation_id"] not in skipped
+        ]
+        if not batch:
+            break
+        for conversation in batch:
+            migrated = store.migrate_embedded(conversation)
+            if migrated is None:
+                skipped.add(conversation["conversation_id"])
+                continue
+            messages += migrated
+            conversations += 1
+        print(f"  {conversations}개 대화 / {messages}개 메시지", end="\r")
+
+    print()
+    print(f"✓ {conversations}개 대화, {messages}개 메시지 이전 ({time.perf_counter() - started:.1f}초)")
+    if skipped:
+        print(f"  다른 프로세스가 이전 중이던 {len(skipped)}개 대화는 건너뜀 (다시 실행하면 확인)")
+    print(f"✓ 버킷 크기 기록: {pin_bucket_sizes(store, args.batch_size)}개 대화")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from datetime import datetime, timedelta
 import random
-from app.services.database_service import get_mongodb
+from app.services.database_service import get_mongodb, part_search_tokens, PART_SEARCH_TOKEN_FIELD
 from app.config import config
 
 def seed_parts_data():
@@ -97,6 +97,9 @@ def seed_parts_data():
             "updated_at": datetime.now()
         }
 
+        # 부품명 검색 토큰 (ngram 모드 인덱스 필드)
+        part[PART_SEARCH_TOKEN_FIELD] = part_search_tokens(part["part_name"])
+
         parts.append(part)
         print(f"  [{i+1}/20] {part_number}: {part['part_name']}")
 
@@ -31,6 +31,7 @@ def seed_documents():
             - 보증기간: 5년""",
             "metadata": {
                 "part_number": "ABC-12345",
+                "part_numbers": ["ABC-12345"],
                 "type": "specification",
                 "category": "메모리",
                 "language": "ko"
@@ -120,6 +121,7 @@ def seed_documents():
             - 정기 재고 확인 (월 1회)""",
             "metadata": {
                 "part_number": "DEF-12346",
+                "part_numbers": ["DEF-12346"],
                 "type": "storage",
                 "category": "보관",
                 "language": "ko"
@@ -0,0 +1,113 @@
+"""
+운영 서버 실행 (gunicorn)
+- 멀티 워커: SERVER_WORKERS 개 프로세스 × 워커 클래스(sync / gthread / gevent / uvicorn)
+- preload: fork 전에 앱, 컴파일된 LangGraph, LLM 클라이언트를 미리 로드 → 워커 간 copy-on-write 공유
+- graceful shutdown: SIGTERM 수신 시 새 연결은 받지 않고 진행 중인 요청(SSE 스트림 포함)을
+  SERVER_GRACEFUL_TIMEOUT 초까지 기다린 후 종료
+
+실행:
+    python serve.py
+    SERVER_WORKERS=8 SERVER_WORKER_CLASS=uvicorn python serve.py   # asgi.py (비동기 경로) 사용
+
+개발 중에는 기존처럼 python run.py (Flask 개발 서버) 사용
+"""
+from gunicorn.app.base import BaseApplication
+from app.config import config
+
+
+# 지원 워커 클래스 (uvicorn은 asgi.py 비동기 경로 사용)
+WORKER_CLASSES = ("sync", "gthread", "gevent", "uvicorn")
+
+
+def _load_uvicorn_worker():
+    """uvicorn 워커 클래스 (SIGTERM 시 graceful_timeout 동안 진행 중인 연결 대기)"""
+    from uvicorn.workers import UvicornWorker
+
+    class DrainingUvicornWorker(UvicornWorker):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # 기본 UvicornWorker는 진행 중인 연결을 무기한 기다리므로 gunicorn 설정에 맞춤
+            self.config.timeout_graceful_shutdown = self.cfg.graceful_timeout
+
+    return DrainingUvicornWorker
+
+
+def preload():
+    """
+    fork 전 공유 객체 로드
+    네트워크 연결/스레드를 가진 객체(MongoClient, 커넥션 풀, 임베딩 배처)는 fork-safe하지 않으므로
+    워커에서 처음 사용할 때 생성되도록 남겨둠
+    """
+    from app.agents.chatbot_agent import get_chatbot_agent
+    from app.agents.rule_classifier import get_rule_classifier
+    from app.services.llm_service import get_chat_llm
+
+    get_chatbot_agent()     # LangGraph 컴파일
+    get_rule_classifier()   # 정규식 컴파일
+    get_chat_llm()          # 기본 Chat LLM 클라이언트 (연결은 요청 시 생성)
+
+
+def on_starting(server):
+    server.log.info(
+        "반도체 부품 챗봇 서버 시작: workers=%s, worker_class=%s, 모드=%s",
+        config.server_workers,
+        config.server_worker_class,
+        "테스트 모드 (Mock DB/LLM)" if config.test_mode else "운영 모드"
+    )
+
+
+def worker_int(worker):
+    worker.log.info("워커 %s 종료 요청 (진행 중 요청 최대 %s초 대기)", worker.pid, config.server_graceful_timeout)
+
+
+def worker_exit(server, worker):
+    # 저장 대기 중인 대화 턴 flush (write-behind 큐, 최대 CHAT_WRITE_FLUSH_TIMEOUT초)
+    from app.services.conversation_service import shutdown_chat_turn_writer
+
+    shutdown_chat_turn_writer()
+    server.log.info("워커 %s 종료", worker.pid)
+
+
+class ChatbotServer(BaseApplication):
+    """gunicorn 애플리케이션 (설정은 AppConfig에서 읽음)"""
+
+    def __init__(self):
+        self.worker_class = config.server_worker_class
+        if self.worker_class not in WORKER_CLASSES:
+            raise ValueError(f"지원하지 않는 워커 클래스: {self.worker_class} ({', '.join(WORKER_CLASSES)})")
+        super().__init__()
+
+    def load_config(self):
+        settings = {
+            "bind": f"{config.server_host}:{config.flask_port}",
+            "workers": config.server_workers,
+            "worker_class": _load_uvicorn_worker() if self.worker_class == "uvicorn" else self.worker_class,
+            "threads": config.server_threads,
+            "worker_connections": config.server_worker_connections,
+            "preload_app": config.server_preload,
+            "timeout": config.server_timeout,
+            "graceful_timeout": config.server_graceful_timeout,
+            "keepalive": config.server_keepalive,
+            "max_requests": config.server_max_requests,
+            "max_requests_jitter": config.server_max_requests // 10,
+            "on_starting": on_starting,
+            "worker_int": worker_int,
+            "worker_exit": worker_exit
+        }
+        for key, value in settings.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        """앱 로드 (preload_app이면 master 프로세스에서 fork 전에 1회 실행)"""
+        if self.worker_class == "uvicorn":
+            from asgi import app
+        else:
+            from app import create_app
+            app = create_app()
+
+        preload()
+        return app
+
+
+if __name__ == "__main__":
+    ChatbotServer().run()
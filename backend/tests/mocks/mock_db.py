@@ -3,9 +3,11 @@
 실제 MongoDB, pgvector 없이도 개발 및 테스트 가능
 """
 import json
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
+from pymongo.errors import DuplicateKeyError
 
 
 class MockMongoDB:
@@ -15,9 +17,14 @@ class MockMongoDB:
         self.data = {
             "parts": self._init_parts_data(),
             "conversations": [],
+            "conversation_messages": [],
             "feedback": [],
             "document_metadata": []
         }
+        # 컬렉션 → 인덱스 키 목록 (실행 계획 시뮬레이션용)
+        self.indexes: Dict[str, List[List[Tuple[str, Any]]]] = {}
+        # unique 인덱스 필드 (upsert로 같은 키 문서를 만들면 DuplicateKeyError)
+        self.unique_keys: Dict[str, List[List[str]]] = {}
 
     def _init_parts_data(self) -> List[Dict[str, Any]]:
         """초기 부품 데이터"""
@@ -160,23 +167,53 @@ class MockMongoDB:
             }
         ]
 
-    def find(self, collection: str, query: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """문서 검색"""
+    def find(self, collection: str, query: Dict[str, Any], limit: int = 100,
+             projection: Optional[Dict[str, Any]] = None,
+             sort: Optional[List[Tuple[str, int]]] = None) -> List[Dict[str, Any]]:
+        """문서 검색 (projection: 포함/제외 필드, 배열 {"$slice": n | [skip, n]}, sort: [(필드, 1 | -1)])"""
         if collection not in self.data:
             return []
 
-        results = []
-        for doc in self.data[collection]:
-            if self._match_query(doc, query):
-                results.append(doc)
+        matched = [doc for doc in self.data[collection] if self._match_query(doc, query)]
+        # 뒤쪽 키부터 안정 정렬 (None은 가장 작은 값)
+        for field, direction in reversed(sort or []):
+            matched.sort(key=lambda doc: (doc.get(field) is not None, doc.get(field)), reverse=direction < 0)
 
-        return results
+        return [self._project(doc, projection) for doc in matched[:limit]]
 
-    def find_one(self, collection: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def find_one(self, collection: str, query: Dict[str, Any],
+                 projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """단일 문서 검색"""
-        results = self.find(collection, query)
+        results = self.find(collection, query, projection=projection)
         return results[0] if results else None
 
+    @staticmethod
+    def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """프로젝션 적용 (최상위 필드만, 저장된 문서가 수정되지 않도록 복사본 반환)"""
+        if not projection:
+            return dict(doc)
+
+        def sliced(values: List[Any], spec: Any) -> List[Any]:
+            if isinstance(spec, list):
+                skip, count = spec
+                return values[skip:skip + count]
+            return values[spec:] if spec < 0 else values[:spec]
+
+        slices = {k: v["$slice"] for k, v in projection.items() if isinstance(v, dict) and "$slice" in v}
+        included = [k for k, v in projection.items() if v in (1, True)]
+        excluded = [k for k, v in projection.items() if v in (0, False)]
+
+        if included:
+            keep = set(included) | set(slices) | ({"_id"} if "_id" not in excluded else set())
+            result = {k: v for k, v in doc.items() if k in keep}
+        else:
+            result = {k: v for k, v in doc.items() if k not in excluded}
+
+        for key, spec in slices.items():
+            if isinstance(result.get(key), list):
+                result[key] = sliced(result[key], spec)
+        return result
+
     def insert_one(self, collection: str, document: Dict[str, Any]) -> str:
         """문서 추가"""
         if collection not in self.data:
@@ -187,33 +224,221 @@ class MockMongoDB:
         self.data[collection].append(document)
         return doc_id
 
-    def update_one(self, collection: str, query: Dict[str, Any], update: Dict[str, Any]) -> bool:
-        """문서 업데이트"""
-        if collection not in self.data:
-            return False
-
-        for doc in self.data[collection]:
+    def update_one(self, collection: str, query: Dict[str, Any], update: Dict[str, Any],
+                   upsert: bool = False) -> bool:
+        """문서 업데이트 ($set / $unset / $inc / $push({"$each": [...]}) / $setOnInsert, upsert)"""
+        return self._update(collection, query, update, upsert) is not None
+
+    def find_one_and_update(self, collection: str, query: Dict[str, Any], update: Dict[str, Any],
+                            projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """문서 업데이트 후 갱신된 문서 반환 (없으면 None)"""
+        doc = self._update(collection, query, update)
+        return self._project(doc, projection) if doc is not None else None
+
+    def _update(self, collection: str, query: Dict[str, Any], update: Dict[str, Any],
+                upsert: bool = False) -> Optional[Dict[str, Any]]:
+        """업데이트 연산자 적용 (갱신/생성된 문서, 없으면 None)"""
+        documents = self.data.setdefault(collection, [])
+        doc = next((doc for doc in documents if self._match_query(doc, query)), None)
+        if doc is None:
+            if not upsert:
+                return None
+            # upsert: 조회 조건의 같음 필드로 새 문서 생성
+            doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+            doc.update(update.get("$setOnInsert", {}))
+            for fields in self.unique_keys.get(collection, []):
+                key = {field: doc.get(field) for field in fields}
+                if any(all(existing.get(f) == v for f, v in key.items()) for existing in documents):
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {collection} dup key: {key}")
+            self.insert_one(collection, doc)
+
+        doc.update(update.get("$set", {}))
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        for key, value in update.get("$push", {}).items():
+            values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+            doc.setdefault(key, []).extend(values)
+        return doc
+
+    def bulk_update(self, collection: str, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """여러 문서 업데이트 (수정된 문서 수 반환)"""
+        return sum(1 for query, update in updates if self._update(collection, query, update) is not None)
+
+    def delete_one(self, collection: str, query: Dict[str, Any]) -> bool:
+        """문서 삭제"""
+        documents = self.data.get(collection, [])
+        for i, doc in enumerate(documents):
             if self._match_query(doc, query):
-                if "$set" in update:
-                    doc.update(update["$set"])
+                del documents[i]
                 return True
-
         return False
 
+    def delete_many(self, collection: str, query: Dict[str, Any]) -> int:
+        """조건에 맞는 문서 모두 삭제 (삭제 수 반환)"""
+        documents = self.data.get(collection, [])
+        remaining = [doc for doc in documents if not self._match_query(doc, query)]
+        self.data[collection] = remaining
+        return len(documents) - len(remaining)
+
+    def search_parts(self, keywords: List[str], limit: int = 10,
+                     projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """부품명 키워드 검색 (Mock): 키워드별 최소 일치 수 이상인 부품을 검색 토큰 일치 수로 정렬 (모드와 관계없이 ngram 방식)"""
+        from app.services.database_service import part_search_terms, part_search_tokens
+
+        terms = [(set(keyword_tokens), min_overlap) for keyword_tokens, min_overlap in part_search_terms(keywords)]
+        tokens = set().union(*(keyword_tokens for keyword_tokens, _ in terms))
+        scored = []
+        for part in self.data["parts"]:
+            part_tokens = set(part_search_tokens(part.get("part_name", "")))
+            if any(len(keyword_tokens & part_tokens) >= min_overlap for keyword_tokens, min_overlap in terms):
+                scored.append((len(tokens & part_tokens), part))
+        scored.sort(key=lambda x: (-x[0], x[1].get("part_number", "")))
+        return [self._project(part, projection) for _, part in scored[:limit]]
+
+    def ensure_indexes(self, indexes: Dict[str, List[Tuple[List[Tuple[str, Any]], Dict[str, Any]]]]):
+        """인덱스 등록 (MongoDBService.ensure_indexes와 같은 정의 형식)"""
+        for collection, specs in indexes.items():
+            registered = self.indexes.setdefault(collection, [])
+            unique = self.unique_keys.setdefault(collection, [])
+            for keys, options in specs:
+                if list(keys) not in registered:
+                    registered.append(list(keys))
+                if options.get("unique") and [k for k, _ in keys] not in unique:
+                    unique.append([k for k, _ in keys])
+
+    def explain(self, collection: str, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        실행 계획 시뮬레이션 (MongoDBService.explain과 같은 요약 형식)
+        등록된 인덱스의 첫 키가 조회 조건에 있으면 IXSCAN, $or는 모든 분기가 인덱스를 쓸 때만 IXSCAN
+        $regex / $not 조건과 $where는 인덱스를 쓰지 않는 것으로 취급 (COLLSCAN)
+        $text는 등록된 텍스트 인덱스 필드에 검색어가 하나라도 포함되면 일치로 취급
+        """
+        documents = self.data.get(collection, [])
+        if "$where" in query:
+            # JavaScript 조건은 Mock에서 평가하지 않음 (항상 전체 스캔)
+            return {"stages": ["COLLSCAN"], "indexes": [], "collscan": True,
+                    "docs_examined": len(documents), "keys_examined": 0, "returned": None}
+        text_fields = [field for keys in self.indexes.get(collection, []) for field, direction in keys if direction == "text"]
+        text_terms = query["$text"]["$search"].lower().split() if "$text" in query else []
+        rest = {key: value for key, value in query.items() if key != "$text"}
+        returned = sum(
+            1 for doc in documents
+            if self._match_query(doc, rest) and (
+                not text_terms or any(term in str(doc.get(field, "")).lower() for field in text_fields for term in text_terms)
+            )
+        )
+        indexes = self._plan_indexes(collection, query)
+
+        if indexes is None:
+            return {"stages": ["COLLSCAN"], "indexes": [], "collscan": True,
+                    "docs_examined": len(documents), "keys_examined": 0, "returned": returned}
+        stages = ["FETCH", "OR", "IXSCAN"] if len(indexes) > 1 else ["FETCH", "IXSCAN"]
+        return {"stages": stages, "indexes": indexes, "collscan": False,
+                "docs_examined": returned, "keys_examined": returned, "returned": returned}
+
+    def explain_write(self, collection: str, query: Dict[str, Any],
+                      update: Optional[Dict[str, Any]] = None, upsert: bool = False) -> Dict[str, Any]:
+        """쓰기 쿼리 실행 계획 시뮬레이션 (조회 조건 기준으로 explain과 같은 인덱스 선택)"""
+        plan = self.explain(collection, query)
+        stage = "UPDATE" if update is not None else "DELETE"
+        return {**plan, "stages": [stage] + plan["stages"]}
+
+    # 인덱스 범위 조회로 바꿀 수 없는 조건 (인덱스 첫 키에 걸려도 COLLSCAN)
+    _UNINDEXABLE_OPERATORS = ("$regex", "$where", "$not")
+
+    def _plan_indexes(self, collection: str, query: Dict[str, Any]) -> Optional[List[str]]:
+        """쿼리에 사용할 인덱스 이름 (사용할 수 없으면 None)"""
+        for keys in self.indexes.get(collection, []):
+            field, direction = keys[0]
+            if direction == "text" and "$text" in query:
+                return ["_".join(f"{k}_{d}" for k, d in keys)]
+            if field in query and not self._unindexable(query[field]):
+                return ["_".join(f"{k}_{d}" for k, d in keys)]
+
+        if query.get("$or"):
+            names = []
+            for branch in query["$or"]:
+                branch_indexes = self._plan_indexes(collection, branch)
+                if branch_indexes is None:
+                    return None
+                names.extend(branch_indexes)
+            return names
+        return None
+
+    @classmethod
+    def _unindexable(cls, condition: Any) -> bool:
+        """조건이 인덱스를 쓸 수 없는 형태인지 ($regex / $where / $not, 정규식 값)"""
+        if isinstance(condition, re.Pattern):
+            return True
+        return isinstance(condition, dict) and any(op in condition for op in cls._UNINDEXABLE_OPERATORS)
+
     def _match_query(self, doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
-        """쿼리 매칭"""
+        """쿼리 매칭 (같음, $in / $nin / $ne / 범위 연산자, $or, "배열.필드" 경로)"""
         for key, value in query.items():
+            if key == "$or":
+                if not any(self._match_query(doc, branch) for branch in value):
+                    return False
+                continue
+            if isinstance(value, dict) and value and all(k.startswith("$") for k in value):
+                if not all(self._match_operator(self._field(doc, key), op, expected) for op, expected in value.items()):
+                    return False
+                continue
             if key not in doc:
                 return False
             if doc[key] != value:
                 return False
         return True
 
+    @staticmethod
+    def _field(doc: Dict[str, Any], path: str) -> Any:
+        """필드 값 ("messages.seq"처럼 배열 안 문서의 필드면 값 목록)"""
+        value: Any = doc
+        for part in path.split("."):
+            if isinstance(value, list):
+                value = [item.get(part) for item in value if isinstance(item, dict)]
+            elif isinstance(value, dict):
+                value = value.get(part)
+            else:
+                return None
+        return value
+
+    @staticmethod
+    def _match_operator(value: Any, operator: str, expected: Any) -> bool:
+        """연산자 조건 매칭 (배열 필드는 원소 중 하나라도 일치하면 참, $ne / $nin은 모든 원소가 불일치해야 참)"""
+        values = value if isinstance(value, list) else [value]
+        if operator == "$ne":
+            return value != expected and expected not in values
+        if operator == "$nin":
+            return not any(v in expected for v in values)
+        if operator == "$eq":
+            return expected in values
+        if operator == "$in":
+            return any(v in expected for v in values)
+        if operator == "$exists":
+            return (value is not None) == bool(expected)
+        if operator == "$regex":
+            return any(isinstance(v, str) and re.search(expected, v) is not None for v in values)
+        if operator == "$not":
+            conditions = expected if isinstance(expected, dict) else {"$regex": expected}
+            return not all(MockMongoDB._match_operator(value, op, exp) for op, exp in conditions.items())
+        comparisons = {
+            "$gt": lambda v: v > expected,
+            "$gte": lambda v: v >= expected,
+            "$lt": lambda v: v < expected,
+            "$lte": lambda v: v <= expected
+        }
+        if operator in comparisons:
+            return any(v is not None and comparisons[operator](v) for v in values)
+        raise ValueError(f"Mock에서 지원하지 않는 연산자: {operator}")
+
 
 class MockPgVector:
     """Mock pgvector - 문서 벡터 저장"""
 
-    def __init__(self):
+    def __init__(self, dimension: int = 1536):
+        self.dimension = dimension
         self.documents = self._init_document_chunks()
         self.images = []
 
@@ -239,9 +464,11 @@ class MockPgVector:
 - I/O: 2-11, 14-23, 26-35, 38-47
 """,
                 "chunk_type": "text",
-                "embedding": np.random.rand(1536).tolist(),
+                "embedding": np.random.rand(self.dimension).tolist(),
                 "metadata": {
                     "file_name": "부품_매뉴얼_ABC12345.pdf",
+                    "part_number": "ABC-12345",
+                    "part_numbers": ["ABC-12345"],
                     "page_number": 1,
                     "section": "사양",
                     "category": "반도체",
@@ -265,9 +492,11 @@ class MockPgVector:
 - 정전기 주의: ESD 민감 부품
 """,
                 "chunk_type": "text",
-                "embedding": np.random.rand(1536).tolist(),
+                "embedding": np.random.rand(self.dimension).tolist(),
                 "metadata": {
                     "file_name": "부품_매뉴얼_ABC12345.pdf",
+                    "part_number": "ABC-12345",
+                    "part_numbers": ["ABC-12345"],
                     "page_number": 2,
                     "section": "전기적 특성",
                     "category": "반도체",
@@ -295,7 +524,7 @@ class MockPgVector:
 - 가용 재고가 최소 재고의 50% 이하로 떨어지면 자동 발주
 """,
                 "chunk_type": "text",
-                "embedding": np.random.rand(1536).tolist(),
+                "embedding": np.random.rand(self.dimension).tolist(),
                 "metadata": {
                     "file_name": "재고_관리_지침.docx",
                     "page_number": 1,
@@ -328,7 +557,7 @@ class MockPgVector:
 검사 결과는 시스템에 즉시 등록해야 합니다.
 """,
                 "chunk_type": "text",
-                "embedding": np.random.rand(1536).tolist(),
+                "embedding": np.random.rand(self.dimension).tolist(),
                 "metadata": {
                     "file_name": "검사_절차.pdf",
                     "page_number": 1,
@@ -343,7 +572,9 @@ class MockPgVector:
         self,
         query_embedding: List[float],
         k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """벡터 유사도 검색 (Mock)"""
 
@@ -352,10 +583,7 @@ class MockPgVector:
         if filter_metadata:
             candidates = [
                 doc for doc in self.documents
-                if all(
-                    doc["metadata"].get(key) == value
-                    for key, value in filter_metadata.items()
-                )
+                if self._match_metadata(doc["metadata"], filter_metadata)
             ]
 
         # 유사도 계산 (코사인 유사도)
@@ -378,6 +606,72 @@ class MockPgVector:
 
         return results
 
+    def hybrid_search(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None,
+        rrf_k: int = 60
+    ) -> List[Dict[str, Any]]:
+        """하이브리드 검색 (Mock): 벡터 순위 + 키워드 일치 순위를 RRF로 결합"""
+        candidates = [
+            doc for doc in self.documents
+            if not filter_metadata or self._match_metadata(doc["metadata"], filter_metadata)
+        ]
+        vector_hits = self.similarity_search(query_embedding, k=len(candidates), filter_metadata=filter_metadata)
+
+        # 키워드 일치 개수로 텍스트 순위 계산
+        terms = [term.lower() for term in query_text.split() if term]
+        text_scores = [
+            (doc, sum(1 for term in terms if term in doc["content"].lower()))
+            for doc in candidates
+        ]
+        text_hits = [doc for doc, score in sorted(text_scores, key=lambda x: x[1], reverse=True) if score > 0]
+
+        fused: Dict[int, float] = {}
+        for hits in (vector_hits, text_hits):
+            for rank, doc in enumerate(hits, 1):
+                fused[doc["id"]] = fused.get(doc["id"], 0.0) + 1.0 / (rrf_k + rank)
+
+        similarity = {doc["id"]: doc["similarity_score"] for doc in vector_hits}
+        by_id = {doc["id"]: doc for doc in candidates}
+        ranked = sorted(fused.items(), key=lambda x: x[1], reverse=True)[:k]
+        return [
+            {**by_id[doc_id], "similarity_score": similarity.get(doc_id), "rrf_score": score}
+            for doc_id, score in ranked
+        ]
+
+    @staticmethod
+    def _match_metadata(metadata: Dict[str, Any], filter_metadata: Dict[str, Any]) -> bool:
+        """메타데이터 필터 매칭 (같음 / $in / 범위)"""
+        for key, condition in filter_metadata.items():
+            value = metadata.get(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for operator, expected in condition.items():
+                if operator == "$eq" and value != expected:
+                    return False
+                if operator == "$in":
+                    # 배열 값이면 원소 중 하나라도 일치 (MongoDB / pgvector 필터와 같은 의미)
+                    candidates = value if isinstance(value, list) else [value]
+                    if not any(candidate in expected for candidate in candidates):
+                        return False
+                if operator in ("$gt", "$gte", "$lt", "$lte"):
+                    if value is None:
+                        return False
+                    if operator == "$gt" and not value > expected:
+                        return False
+                    if operator == "$gte" and not value >= expected:
+                        return False
+                    if operator == "$lt" and not value < expected:
+                        return False
+                    if operator == "$lte" and not value <= expected:
+                        return False
+        return True
+
     def add_documents(self, documents: List[Dict[str, Any]]) -> List[int]:
         """문서 추가"""
         ids = []
@@ -397,6 +691,59 @@ class MockPgVector:
         return True
 
 
+class MockAsyncMongoDB:
+    """Mock 비동기 MongoDB - MockMongoDB 데이터를 공유"""
+
+    def __init__(self, mongodb: MockMongoDB):
+        self.mongodb = mongodb
+
+    async def find(self, collection: str, query: Dict[str, Any], limit: int = 100,
+                   projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return self.mongodb.find(collection, query, limit=limit, projection=projection)
+
+    async def find_one(self, collection: str, query: Dict[str, Any],
+                       projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self.mongodb.find_one(collection, query, projection=projection)
+
+    async def insert_one(self, collection: str, document: Dict[str, Any]) -> str:
+        return self.mongodb.insert_one(collection, document)
+
+    async def update_one(self, collection: str, query: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        return self.mongodb.update_one(collection, query, update)
+
+    async def search_parts(self, keywords: List[str], limit: int = 10,
+                           projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return self.mongodb.search_parts(keywords, limit=limit, projection=projection)
+
+
+class MockAsyncPgVector:
+    """Mock 비동기 pgvector - MockPgVector 데이터를 공유"""
+
+    def __init__(self, pgvector: MockPgVector):
+        self.pgvector = pgvector
+
+    async def similarity_search(
+        self,
+        query_embedding: List[float],
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        return self.pgvector.similarity_search(query_embedding, k=k, filter_metadata=filter_metadata)
+
+    async def hybrid_search(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        statement_timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        return self.pgvector.hybrid_search(query_text, query_embedding, k=k, filter_metadata=filter_metadata)
+
+
 class MockDatabaseFactory:
     """Mock Database 팩토리 - 테스트 모드에서 사용"""
 
@@ -404,19 +751,31 @@ class MockDatabaseFactory:
     _pgvector_instance = None
 
     @classmethod
-    def get_mongodb(cls) -> MockMongoDB:
-        """MongoDB 인스턴스 반환 (싱글톤)"""
+    def get_mongodb(cls, indexes: Optional[Dict[str, Any]] = None) -> MockMongoDB:
+        """MongoDB 인스턴스 반환 (싱글톤, indexes가 있으면 실행 계획 시뮬레이션용으로 등록)"""
         if cls._mongodb_instance is None:
             cls._mongodb_instance = MockMongoDB()
+        if indexes:
+            cls._mongodb_instance.ensure_indexes(indexes)
         return cls._mongodb_instance
 
     @classmethod
-    def get_pgvector(cls) -> MockPgVector:
+    def get_pgvector(cls, dimension: int = 1536) -> MockPgVector:
         """pgvector 인스턴스 반환 (싱글톤)"""
         if cls._pgvector_instance is None:
-            cls._pgvector_instance = MockPgVector()
+            cls._pgvector_instance = MockPgVector(dimension=dimension)
         return cls._pgvector_instance
 
+    @classmethod
+    def get_async_mongodb(cls) -> MockAsyncMongoDB:
+        """비동기 MongoDB 인스턴스 반환 (동기 Mock과 데이터 공유)"""
+        return MockAsyncMongoDB(cls.get_mongodb())
+
+    @classmethod
+    def get_async_pgvector(cls, dimension: int = 1536) -> MockAsyncPgVector:
+        """비동기 pgvector 인스턴스 반환 (동기 Mock과 데이터 공유)"""
+        return MockAsyncPgVector(cls.get_pgvector(dimension=dimension))
+
     @classmethod
     def reset(cls):
         """모든 데이터 초기화"""
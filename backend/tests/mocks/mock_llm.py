@@ -2,10 +2,12 @@
 테스트용 Mock LLM
 실제 LLM 없이도 개발 및 테스트 가능
 """
+import asyncio
 import json
 import time
 import random
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 from dataclasses import dataclass
 
 
@@ -31,9 +33,53 @@ class MockChatLLM:
         self.model = model
         self.temperature = temperature
 
-    def invoke(self, prompt: str) -> MockChatResponse:
-        """프롬프트에 따라 적절한 응답 생성"""
-        time.sleep(0.5)  # 실제 API 호출처럼 지연 시뮬레이션
+    # 스트리밍 시뮬레이션 설정
+    stream_chunk_size = 8  # 청크당 글자 수
+    stream_first_token_delay = 0.3  # 첫 토큰까지 지연 (초)
+    stream_chunk_delay = 0.01  # 청크 간 지연 (초)
+
+    # invoke 응답 지연 (초)
+    invoke_delay = 0.5
+
+    def invoke(self, prompt: str, timeout: Optional[float] = None) -> MockChatResponse:
+        """프롬프트에 따라 적절한 응답 생성 (timeout이 응답 지연보다 짧으면 그 시간 후 TimeoutError)"""
+        if timeout is not None and timeout < self.invoke_delay:
+            time.sleep(timeout)
+            raise TimeoutError(f"Mock LLM 요청 시간 초과 ({timeout}초)")
+        time.sleep(self.invoke_delay)  # 실제 API 호출처럼 지연 시뮬레이션
+        return self._respond(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        응답을 청크 단위로 생성 (스트리밍 시뮬레이션)
+        invoke()와 같은 내용을 작은 조각으로 나누어 반환
+        """
+        content = self._respond(prompt).content
+
+        time.sleep(self.stream_first_token_delay)
+        for i in range(0, len(content), self.stream_chunk_size):
+            yield content[i:i + self.stream_chunk_size]
+            time.sleep(self.stream_chunk_delay)
+
+    async def ainvoke(self, prompt: str) -> MockChatResponse:
+        """비동기 호출 (invoke와 같은 응답)"""
+        await asyncio.sleep(0.5)
+        return self._respond(prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """비동기 스트리밍 (stream과 같은 청크)"""
+        content = self._respond(prompt).content
+
+        await asyncio.sleep(self.stream_first_token_delay)
+        for i in range(0, len(content), self.stream_chunk_size):
+            yield content[i:i + self.stream_chunk_size]
+            await asyncio.sleep(self.stream_chunk_delay)
+
+    def _respond(self, prompt: str) -> MockChatResponse:
+        """프롬프트에 맞는 응답 선택"""
+        # 여러 대화 제목 일괄 생성 응답
+        if "대화 ID를 키로 하는 JSON" in prompt:
+            return self._generate_titles(prompt)
 
         # Query Classification 응답
         if "분류하세요" in prompt or "classify" in prompt.lower():
@@ -50,6 +96,14 @@ class MockChatLLM:
             content="Mock LLM 응답입니다. 실제 환경에서는 사내 LLM이 답변합니다."
         )
 
+    def _generate_titles(self, prompt: str) -> MockChatResponse:
+        """제목 일괄 생성 Mock 응답 (각 대화 첫 사용자 메시지 앞부분)"""
+        titles = {
+            conversation_id: f"{first_message[:20]} 문의"
+            for conversation_id, first_message in re.findall(r"^### (\S+)\n사용자: (.*)$", prompt, re.MULTILINE)
+        }
+        return MockChatResponse(content=json.dumps(titles, ensure_ascii=False))
+
     def _classify_query(self, prompt: str) -> MockChatResponse:
         """쿼리 분류 Mock 응답"""
         classification = {
@@ -313,22 +367,47 @@ class MockChatLLM:
 
 
 class MockEmbeddingLLM:
-    """Mock Embedding LLM - 사내 Embedding LLM 대체"""
-
-    def __init__(self, model: str = "mock-embedding"):
+    """
+    Mock Embedding LLM - 사내 Embedding LLM 대체
+    지연 = 요청당 call_latency + 텍스트당 text_latency (초, 기본값은 텍스트당 0.2초)
+    배칭 효과를 재려면 요청당 지연을 따로 지정 (scripts/benchmark_embedding_batching.py)
+    """
+
+    def __init__(self, model: str = "mock-embedding", dimension: int = 1536,
+                 call_latency: float = 0.0, text_latency: float = 0.2):
         self.model = model
-        self.dimension = 1536  # OpenAI embedding 차원
+        self.dimension = dimension  # 기본값: OpenAI embedding 차원
+        self.call_latency = call_latency
+        self.text_latency = text_latency
+
+    def _latency(self, count: int) -> float:
+        """텍스트 count개를 한 번에 요청할 때의 지연 (초)"""
+        return self.call_latency + self.text_latency * count
 
     def embed_query(self, text: str) -> List[float]:
         """텍스트를 벡터로 변환 (Mock)"""
-        time.sleep(0.2)
-        # 실제로는 랜덤이지만 같은 텍스트는 같은 벡터 반환
-        random.seed(hash(text) % (2**32))
-        return [random.random() for _ in range(self.dimension)]
+        time.sleep(self._latency(1))
+        return self._vector(text)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """여러 텍스트를 벡터로 변환"""
-        return [self.embed_query(text) for text in texts]
+        """여러 텍스트를 벡터로 변환 (Mock)"""
+        time.sleep(self._latency(len(texts)))
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """텍스트를 벡터로 변환 (비동기 Mock)"""
+        await asyncio.sleep(self._latency(1))
+        return self._vector(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트를 벡터로 변환 (비동기 Mock)"""
+        await asyncio.sleep(self._latency(len(texts)))
+        return [self._vector(text) for text in texts]
+
+    def _vector(self, text: str) -> List[float]:
+        """실제로는 랜덤이지만 같은 텍스트는 같은 벡터 반환"""
+        rng = random.Random(hash(text) % (2**32))  # 스레드별 독립 난수 생성기
+        return [rng.random() for _ in range(self.dimension)]
 
 
 class MockVisionLLM:
@@ -388,7 +467,7 @@ class MockLLMFactory:
     @staticmethod
     def create_embedding_llm(config: Any) -> MockEmbeddingLLM:
         """Embedding LLM 생성"""
-        return MockEmbeddingLLM(model=config.llm.embedding_model)
+        return MockEmbeddingLLM(model=config.llm.embedding_model, dimension=config.llm.embedding_dimension)
 
     @staticmethod
     def create_vision_llm(config: Any) -> MockVisionLLM:
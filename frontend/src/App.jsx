@@ -35,6 +35,9 @@ import useChatStore from './store/chatStore';
 import { chatAPI } from './services/api';
 
 const DRAWER_WIDTH = 280;
+// 첫 턴 후 백그라운드 제목 생성 확인 (간격 ms, 최대 횟수)
+const TITLE_POLL_INTERVAL = 1000;
+const TITLE_POLL_ATTEMPTS = 10;
 
 function App() {
   const {
@@ -60,6 +63,31 @@ function App() {
   const [editingConvId, setEditingConvId] = useState(null);
   const [editTitle, setEditTitle] = useState('');
 
+  const updateConversationTitle = (conversationId, title) => {
+    setConversationHistory(prev =>
+      prev.map(conv =>
+        conv.id === conversationId ? { ...conv, title } : conv
+      )
+    );
+  };
+
+  // 대화 저장/제목 생성은 응답 후 서버에서 처리되므로 생성될 때까지 제목 확인
+  const pollConversationTitle = async (conversationId) => {
+    for (let attempt = 0; attempt < TITLE_POLL_ATTEMPTS; attempt++) {
+      await new Promise(resolve => setTimeout(resolve, TITLE_POLL_INTERVAL));
+      try {
+        const result = await chatAPI.getConversationTitle(conversationId);
+        if (!result.title_pending) {
+          updateConversationTitle(conversationId, result.title);
+          return;
+        }
+      } catch (error) {
+        console.error('Title poll error:', error);
+        return;
+      }
+    }
+  };
+
   const handleSendMessage = async (messageText) => {
     // 사용자 메시지 추가
     const userMessage = {
@@ -108,15 +136,11 @@ function App() {
         };
         addMessage(assistantMessage);
 
-        // 첫 메시지 후 자동 생성된 제목 업데이트
+        // 첫 메시지 후 자동 생성된 제목 업데이트 (write-behind 저장이면 생성될 때까지 확인)
         if (result.conversation_title) {
-          setConversationHistory(prev =>
-            prev.map(conv =>
-              conv.id === conversationId
-                ? { ...conv, title: result.conversation_title }
-                : conv
-            )
-          );
+          updateConversationTitle(conversationId, result.conversation_title);
+        } else if (!currentConversationId || messages.length === 0) {
+          pollConversationTitle(conversationId);
         }
       } else {
         // 에러 메시지
@@ -19,7 +19,7 @@ export const chatAPI = {
   },
 
   // 메시지 전송 (스트리밍)
-  sendMessageStream: (data, onProgress, onComplete, onError) => {
+  sendMessageStream: (data, onProgress, onComplete, onError, onToken) => {
     const eventSource = new EventSource(
       `${API_BASE_URL}/chat/stream?${new URLSearchParams(data)}`
     );
@@ -30,6 +30,8 @@ export const chatAPI = {
 
         if (eventData.type === 'progress') {
           onProgress && onProgress(eventData.data);
+        } else if (eventData.type === 'token') {
+          onToken && onToken(eventData.data.content);
         } else if (eventData.type === 'final') {
           onComplete && onComplete(eventData.data);
           eventSource.close();
@@ -50,20 +52,28 @@ export const chatAPI = {
     return eventSource;
   },
 
-  // 대화 목록 조회
-  getConversations: async (userId) => {
+  // 대화 목록 조회 (최근 갱신순, cursor: 이전 응답의 next_cursor, since: 이전 응답의 latest_updated_at)
+  getConversations: async (userId, { cursor, since, limit } = {}) => {
     const response = await api.get('/conversations', {
-      params: { user_id: userId }
+      params: { user_id: userId, cursor, since, limit }
     });
     return response.data;
   },
 
-  // 특정 대화 조회
+  // 특정 대화 조회 (최신 메시지 페이지 포함, 이전 메시지는 next_cursor로 getConversationMessages)
   getConversation: async (conversationId) => {
     const response = await api.get(`/conversations/${conversationId}`);
     return response.data;
   },
 
+  // 대화 메시지 페이지 조회 (before: 이전 응답의 next_cursor)
+  getConversationMessages: async (conversationId, before, limit) => {
+    const response = await api.get(`/conversations/${conversationId}/messages`, {
+      params: { before, limit }
+    });
+    return response.data;
+  },
+
   // 새 대화 생성
   createConversation: async (userId) => {
     const response = await api.post('/conversations', { user_id: userId });
@@ -82,6 +92,12 @@ export const chatAPI = {
     return response.data;
   },
 
+  // 대화 제목 조회 (title_pending이면 아직 자동 생성 전)
+  getConversationTitle: async (conversationId) => {
+    const response = await api.get(`/conversations/${conversationId}/title`);
+    return response.data;
+  },
+
   // 대화 제목 자동 생성
   generateConversationTitle: async (conversationId) => {
     const response = await api.post(`/conversations/${conversationId}/generate-title`);
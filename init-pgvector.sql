@@ -1,12 +1,23 @@
 -- pgvector 확장 설치
 CREATE EXTENSION IF NOT EXISTS vector;
 
+-- 트라이그램 확장 (document_chunks 하이브리드 검색, 한국어 부분 일치)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 임베딩 차원 (컨테이너 환경 변수 EMBEDDING_DIMENSION, 없으면 1536)
+-- 백엔드 LLM_EMBEDDING_DIMENSION과 같아야 함
+\getenv embedding_dimension EMBEDDING_DIMENSION
+\if :{?embedding_dimension}
+\else
+    \set embedding_dimension 1536
+\endif
+
 -- 문서 테이블 생성
 CREATE TABLE IF NOT EXISTS documents (
     id SERIAL PRIMARY KEY,
     content TEXT NOT NULL,
     metadata JSONB,
-    embedding vector(1536),
+    embedding vector(:embedding_dimension),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 